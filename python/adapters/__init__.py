@@ -1,8 +1,24 @@
 """Adapters package for standardizing bank data."""
 
-from .base import BankAdapter, Transaction
-from .sbi_adapter import SBIAdapter
-from .std_adapter import StandardAdapter
-from .factory import AdapterFactory
+from lazy_exports import attach
 
-__all__ = ['BankAdapter', 'Transaction', 'SBIAdapter', 'StandardAdapter', 'AdapterFactory']
+# Submodules load on first attribute access; see lazy_exports.
+_LAZY_ATTRS = {
+    'BankAdapter': '.base',
+    'Transaction': '.transaction',
+    'TransactionBatch': '.base',
+    'BalanceReport': '.balance',
+    'check_running_balance': '.balance',
+    'BankLayout': '.layout',
+    'LayoutAdapter': '.layout_adapter',
+    'SBIAdapter': '.sbi_adapter',
+    'StandardAdapter': '.std_adapter',
+    'AdapterFactory': '.factory',
+}
+
+__all__ = [
+    'BankAdapter', 'Transaction', 'TransactionBatch', 'BalanceReport', 'check_running_balance',
+    'BankLayout', 'LayoutAdapter', 'SBIAdapter', 'StandardAdapter', 'AdapterFactory',
+]
+
+__getattr__, __dir__ = attach(__name__, _LAZY_ATTRS, globals())
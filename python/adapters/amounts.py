@@ -0,0 +1,134 @@
+"""Fixed-point amount parsing for bank statement columns.
+
+Amounts are returned as int64 paise (1 rupee = 100 paise) so totals and
+balance checks are exact integer arithmetic.
+
+Sign conventions understood:
+    -500, 500-, (500), 500 Dr   -> negative
+    500, +500, 500 Cr           -> positive
+Indian digit grouping (1,00,000.00), currency markers (₹, Rs., INR) and
+surrounding whitespace are ignored. Blank or unparseable cells become 0.
+Amounts finer than a paisa round half away from zero, from text and floats alike.
+"""
+
+import re
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+
+_INT64_MAX = 2 ** 63 - 1
+
+_FLOAT_EXACT_LIMIT = 1e13
+# Comma-free amount with optional currency prefix and Dr/Cr suffix, at most
+# two decimals: group 1 is the number, group 2 the Dr/Cr initial
+_SIMPLE_RE = re.compile(
+    r'(?:₹|[Rr][Ss]\.?|INR)?\s*([-+]?(?:\d+(?:\.\d{0,2})?|\.\d{1,2}))\s*(?:([CcDd])[Rr]\.?)?'
+)
+
+_AMOUNT_RE = re.compile(
+    r'^(?P<open>\()?\s*(?P<sign>[-+])?\s*(?:₹|rs\.?|inr)?\s*(?P<sign2>[-+])?\s*'
+    r'(?P<int>\d[\d,]*)?(?:\.(?P<frac>\d+))?\s*(?P<trail>-)?\s*(?P<close>\))?\s*'
+    r'(?P<side>cr|dr)?\.?$',
+    re.IGNORECASE
+)
+
+
+def round_paise(scaled: Any) -> np.ndarray:
+    """Round amounts already scaled to paise, halves away from zero, as float64."""
+    scaled = np.asarray(scaled, dtype='float64')
+    return np.sign(scaled) * np.floor(np.abs(scaled) + 0.5)
+
+
+def amount_to_paise(value: Any) -> Optional[int]:
+    """
+    Parse one amount cell into paise.
+
+    Args:
+        value: Cell value (str or number)
+
+    Returns:
+        Signed paise, or None if the cell is blank or not an amount
+    """
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    if isinstance(value, (int, np.integer)) and not isinstance(value, bool):
+        return int(value) * 100
+    if isinstance(value, (float, np.floating)):
+        return int(round_paise(value * 100))
+
+    text = str(value).strip()
+    if not text:
+        return None
+
+    match = _AMOUNT_RE.match(text)
+    if match is None or (match['int'] is None and match['frac'] is None):
+        try:
+            # e.g. scientific notation from spreadsheet exports
+            return int(round_paise(float(text) * 100))
+        except (ValueError, OverflowError):
+            return None
+
+    rupees = int(match['int'].replace(',', '')) if match['int'] else 0
+    frac = match['frac'] or ''
+    paise = rupees * 100 + int((frac + '00')[:2])
+    if len(frac) > 2 and frac[2] >= '5':
+        paise += 1  # round half away from zero on the third decimal
+
+    negative = (
+        match['sign'] == '-' or match['sign2'] == '-' or match['trail'] is not None
+        or (match['open'] is not None and match['close'] is not None)
+        or (match['side'] or '').lower() == 'dr'
+    )
+    if paise > _INT64_MAX:
+        return None
+    return -paise if negative else paise
+
+
+def parse_paise(values: pd.Series) -> np.ndarray:
+    """
+    Parse a whole amount column into int64 paise.
+
+    Numeric columns are scaled in one numpy operation; text columns are
+    dictionary-encoded so each distinct string is parsed once, with plain
+    numbers converted in bulk and only decorated cells parsed one by one.
+
+    Args:
+        values: Raw amount column
+
+    Returns:
+        int64 array aligned with values, 0 where blank or unparseable
+    """
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        scaled = round_paise(values.to_numpy(dtype='float64', na_value=np.nan) * 100)
+        return np.nan_to_num(scaled, nan=0.0).astype('int64')
+
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    parsed = np.zeros(len(uniques) + 1, dtype='int64')  # last slot for NA (-1)
+    
+    # Fast path: common shapes ("1,00,000.00", "₹ 500", "250.00 Dr") are
+    # matched by one compiled regex and the digits converted in bulk by
+    # to_numeric; below _FLOAT_EXACT_LIMIT rupees x * 100 is exact to the paisa
+    text = pd.Series(uniques, dtype=object).str.replace(',', '', regex=False).str.strip()
+    digits = []
+    debit_side = []
+    matched = []
+    for i, value in enumerate(text.tolist()):
+        match = _SIMPLE_RE.fullmatch(value) if isinstance(value, str) else None
+        if match is not None:
+            matched.append(i)
+            digits.append(match[1])
+            debit_side.append(match[2] is not None and match[2] in 'Dd')
+    numbers = pd.to_numeric(pd.Series(digits, dtype=object), errors='coerce')
+    numbers = numbers.to_numpy(dtype='float64')
+    numbers = np.where(np.asarray(debit_side, dtype=bool), -np.abs(numbers), numbers)
+    exact = np.abs(numbers) < _FLOAT_EXACT_LIMIT
+    fast = np.asarray(matched, dtype='int64')[exact]
+    parsed[fast] = round_paise(numbers[exact] * 100).astype('int64')
+    
+    # Everything else (brackets, stray text, huge values) one cell at a time
+    slow = np.ones(len(uniques), dtype=bool)
+    slow[fast] = False
+    for i in np.flatnonzero(slow):
+        parsed[i] = amount_to_paise(uniques[i]) or 0
+    return parsed[codes]
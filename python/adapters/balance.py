@@ -0,0 +1,130 @@
+"""Running-balance continuity checks for transaction batches.
+
+A statement is continuous when every row satisfies
+
+    previous balance + credit - debit == balance
+
+A dropped row shows up as one break (the balance jumps by the missing
+amount); a duplicated row as one break with the duplicate's amount. The
+check runs on the batch's int64 paise columns, so it is exact.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+import numpy as np
+
+from .base import TransactionBatch
+
+
+@dataclass
+class BalanceBreak:
+    """One row whose balance does not follow from the previous row."""
+    index: int
+    expected: float
+    actual: float
+
+    @property
+    def difference(self) -> float:
+        """Unexplained change in rupees (actual - expected)."""
+        return round(self.actual - self.expected, 2)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            'index': self.index,
+            'expected': self.expected,
+            'actual': self.actual,
+            'difference': self.difference,
+        }
+
+
+@dataclass
+class BalanceReport:
+    """Result of a running-balance check."""
+    rows: int
+    checked: bool = True
+    descending: bool = False
+    breaks: List[BalanceBreak] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """True if no row breaks continuity (or there were no balances to check)."""
+        return not self.breaks
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            'ok': self.ok,
+            'rows': self.rows,
+            'checked': self.checked,
+            'descending': self.descending,
+            'breaks': [b.to_dict() for b in self.breaks],
+        }
+
+
+def _break_steps(balance: np.ndarray, delta: np.ndarray) -> np.ndarray:
+    """
+    Per-row unexplained balance change, oldest row first.
+
+    One cumulative sum gives the balance each row should have if the
+    statement were continuous from the first row; differencing the drift
+    from that turns it back into each row's own discrepancy, so a single
+    missing row is one break instead of a wrong tail.
+    """
+    expected = balance[0] + np.cumsum(delta[1:])
+    drift = balance[1:] - expected
+    return np.diff(drift, prepend=0)
+
+
+def check_running_balance(batch: TransactionBatch, order: str = 'auto') -> BalanceReport:
+    """
+    Check that balances follow from debits and credits row to row.
+
+    Args:
+        batch: Transactions in statement order
+        order: 'asc' (oldest first), 'desc' (newest first) or 'auto' to use
+               whichever order has fewer breaks
+
+    Returns:
+        BalanceReport; break indexes are positions in batch
+
+    Raises:
+        ValueError: If order is not one of the above
+    """
+    if order not in ('auto', 'asc', 'desc'):
+        raise ValueError(f"Unknown statement order: {order}")
+
+    rows = len(batch)
+    if rows < 2:
+        return BalanceReport(rows=rows)
+
+    balance = batch.balance_paise
+    if not balance.any():
+        # No balance column was mapped; nothing to check against
+        return BalanceReport(rows=rows, checked=False)
+    delta = batch.credit_paise - batch.debit_paise
+
+    descending = order == 'desc'
+    steps = _break_steps(balance[::-1], delta[::-1]) if descending else _break_steps(balance, delta)
+    if order == 'auto':
+        desc_steps = _break_steps(balance[::-1], delta[::-1])
+        if np.count_nonzero(desc_steps) < np.count_nonzero(steps):
+            steps, descending = desc_steps, True
+
+    # steps[i] belongs to row i + 1 of the (possibly reversed) statement
+    positions = np.flatnonzero(steps) + 1
+    if descending:
+        positions = positions[::-1]
+    indexes = rows - 1 - positions if descending else positions
+    actual = balance[indexes]
+    expected = actual - steps[positions - 1]
+
+    return BalanceReport(
+        rows=rows,
+        descending=descending,
+        breaks=[
+            BalanceBreak(int(i), e / 100, a / 100)
+            for i, e, a in zip(indexes.tolist(), expected.tolist(), actual.tolist())
+        ],
+    )
@@ -1,39 +1,239 @@
 """Base Adapter module defining the interface for bank adapters."""
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Any, Dict, Optional
+from typing import TYPE_CHECKING, List, Any, Dict, Iterable, Iterator, Optional, Sequence, Union
+import json
+import warnings
+import numpy as np
 import pandas as pd
 
+from parsers.column_detector import ColumnDetector, ColumnMapping
+from .amounts import parse_paise, round_paise
+from .transaction import Transaction
 
-@dataclass
-class Transaction:
-    """Standardized transaction entry."""
-    date: datetime
-    description: str
-    debit: float
-    credit: float
-    balance: float
-    reference_no: Optional[str] = None
-    value_date: Optional[datetime] = None
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert transaction to dictionary."""
-        return {
-            'date': self.date.isoformat(),
-            'description': self.description,
-            'debit': self.debit,
-            'credit': self.credit,
-            'balance': self.balance,
-            'reference_no': self.reference_no,
-            'value_date': self.value_date.isoformat() if self.value_date else None
-        }
+if TYPE_CHECKING:
+    from .balance import BalanceReport
+
+
+def _to_paise(values: Any) -> np.ndarray:
+    """Convert rupee amounts to int64 paise, rounding half away from zero."""
+    return round_paise(np.asarray(values, dtype='float64') * 100).astype('int64')
+
+
+def _factorize(values: Any) -> tuple:
+    """Dictionary-encode strings into (int32 codes, categories); None -> -1."""
+    codes, categories = pd.factorize(pd.Series(values, dtype=object), use_na_sentinel=True)
+    return codes.astype('int32'), list(categories)
+
+
+class TransactionBatch:
+    """
+    Columnar container of standardized transactions.
+    
+    Dates are stored as datetime64[us] arrays, amounts as int64 paise and
+    descriptions / reference numbers as dictionary-encoded codes. Integer
+    indexing and iteration yield Transaction objects, so code written
+    against List[Transaction] keeps working; slicing and boolean/integer
+    array indexing return another TransactionBatch.
+    """
+    
+    __slots__ = (
+        'dates', 'value_dates', 'debit_paise', 'credit_paise', 'balance_paise',
+        'description_codes', 'description_categories',
+        'reference_codes', 'reference_categories'
+    )
+    
+    def __init__(self, dates: np.ndarray, value_dates: np.ndarray,
+                 debit_paise: np.ndarray, credit_paise: np.ndarray, balance_paise: np.ndarray,
+                 description_codes: np.ndarray, description_categories: List[str],
+                 reference_codes: np.ndarray, reference_categories: List[str]):
+        """Wrap already-typed column arrays (see from_columns for raw values)."""
+        self.dates = dates
+        self.value_dates = value_dates
+        self.debit_paise = debit_paise
+        self.credit_paise = credit_paise
+        self.balance_paise = balance_paise
+        self.description_codes = description_codes
+        self.description_categories = description_categories
+        self.reference_codes = reference_codes
+        self.reference_categories = reference_categories
+    
+    @classmethod
+    def from_columns(cls, dates: Any, descriptions: Sequence[str],
+                     debits: Any, credits: Any, balances: Any,
+                     reference_nos: Optional[Sequence[Optional[str]]] = None,
+                     value_dates: Any = None, paise: bool = False) -> 'TransactionBatch':
+        """
+        Build a batch from column values.
+        
+        Args:
+            dates: datetime-like values (datetime64 array/Series or datetimes)
+            descriptions: Description strings
+            debits, credits, balances: Rupee amounts (converted to paise)
+            reference_nos: Optional reference strings (None for missing)
+            value_dates: Optional datetime-like values (NaT/None for missing)
+            paise: If True, the amounts are already integer paise
+            
+        Returns:
+            TransactionBatch
+        """
+        date_arr = np.asarray(dates, dtype='datetime64[us]')
+        n = len(date_arr)
+        desc_codes, desc_categories = _factorize(descriptions)
+        if reference_nos is None:
+            ref_codes, ref_categories = np.full(n, -1, dtype='int32'), []
+        else:
+            ref_codes, ref_categories = _factorize(reference_nos)
+        if value_dates is None:
+            value_arr = np.full(n, np.datetime64('NaT'), dtype='datetime64[us]')
+        else:
+            parsed = pd.to_datetime(pd.Series(value_dates, dtype=object))
+            value_arr = np.asarray(parsed, dtype='datetime64[us]')
+        to_paise = (lambda a: np.asarray(a, dtype='int64')) if paise else _to_paise
+        return cls(
+            date_arr, value_arr,
+            to_paise(debits), to_paise(credits), to_paise(balances),
+            desc_codes, desc_categories, ref_codes, ref_categories
+        )
+    
+    @classmethod
+    def from_transactions(cls, transactions: Sequence[Transaction]) -> 'TransactionBatch':
+        """Build a batch from Transaction objects."""
+        return cls.from_columns(
+            [t.date for t in transactions],
+            [t.description for t in transactions],
+            [t.debit for t in transactions],
+            [t.credit for t in transactions],
+            [t.balance for t in transactions],
+            [t.reference_no for t in transactions],
+            [t.value_date for t in transactions]
+        )
+    
+    @classmethod
+    def empty(cls) -> 'TransactionBatch':
+        """Build a batch with no rows."""
+        return cls.from_columns([], [], [], [], [])
+    
+    @classmethod
+    def concat(cls, batches: Sequence['TransactionBatch']) -> 'TransactionBatch':
+        """Concatenate batches in order, re-encoding the string dictionaries."""
+        batches = list(batches)
+        if not batches:
+            return cls.empty()
+        return cls.from_columns(
+            np.concatenate([b.dates for b in batches]),
+            [d for b in batches for d in b.descriptions],
+            np.concatenate([b.debit_paise for b in batches]),
+            np.concatenate([b.credit_paise for b in batches]),
+            np.concatenate([b.balance_paise for b in batches]),
+            [r for b in batches for r in b.reference_nos],
+            np.concatenate([b.value_dates for b in batches]),
+            paise=True
+        )
+    
+    @property
+    def descriptions(self) -> List[str]:
+        """Decoded description strings."""
+        categories = self.description_categories
+        return [categories[c] for c in self.description_codes.tolist()]
+    
+    @property
+    def reference_nos(self) -> List[Optional[str]]:
+        """Decoded reference numbers (None where missing)."""
+        categories = self.reference_categories
+        return [categories[c] if c >= 0 else None for c in self.reference_codes.tolist()]
+    
+    def __len__(self) -> int:
+        return len(self.dates)
+    
+    def __getitem__(self, key: Union[int, slice, Sequence[int], np.ndarray]) -> Any:
+        if isinstance(key, (int, np.integer)):
+            index = range(len(self))[key]
+            return next(iter(self._take(slice(index, index + 1))))
+        return self._take(key)
+    
+    def _take(self, key: Any) -> 'TransactionBatch':
+        """Select rows, sharing the string dictionaries."""
+        if not isinstance(key, slice):
+            key = np.asarray(key)
+        return TransactionBatch(
+            self.dates[key], self.value_dates[key],
+            self.debit_paise[key], self.credit_paise[key], self.balance_paise[key],
+            self.description_codes[key], self.description_categories,
+            self.reference_codes[key], self.reference_categories
+        )
+    
+    def __iter__(self) -> Iterator[Transaction]:
+        """Yield Transaction objects, converting each column in bulk first."""
+        value_dates = self.value_dates.astype(object).tolist()
+        columns = zip(
+            self.dates.astype(object).tolist(),
+            self.descriptions,
+            (self.debit_paise / 100).tolist(),
+            (self.credit_paise / 100).tolist(),
+            (self.balance_paise / 100).tolist(),
+            self.reference_nos,
+            value_dates
+        )
+        for row in columns:
+            yield Transaction(*row)
+    
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (TransactionBatch, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+    
+    def __repr__(self) -> str:
+        return f"TransactionBatch({len(self)} transactions)"
+    
+    def to_records(self) -> List[Dict[str, Any]]:
+        """
+        Convert to a list of dicts in Transaction.to_dict format.
+        
+        Returns:
+            List of transaction dictionaries
+        """
+        def isoformats(values: np.ndarray) -> List[Optional[str]]:
+            # Format each distinct date once
+            uniques, inverse = np.unique(values, return_inverse=True)
+            formatted = [
+                None if d is None else d.isoformat()
+                for d in uniques.astype(object).tolist()
+            ]
+            return [formatted[i] for i in inverse.reshape(-1).tolist()]
+        
+        keys = ('date', 'description', 'debit', 'credit', 'balance', 'reference_no', 'value_date')
+        columns = zip(
+            isoformats(self.dates),
+            self.descriptions,
+            (self.debit_paise / 100).tolist(),
+            (self.credit_paise / 100).tolist(),
+            (self.balance_paise / 100).tolist(),
+            self.reference_nos,
+            isoformats(self.value_dates)
+        )
+        return [dict(zip(keys, row)) for row in columns]
+    
+    def to_json(self, **kwargs: Any) -> str:
+        """Serialize to a JSON array of transaction dicts."""
+        return json.dumps(self.to_records(), **kwargs)
 
 
 class BankAdapter(ABC):
     """Abstract Base Class for all bank adapters."""
     
+    # Candidate date layouts for _infer_date_format, in tie-break order
+    DATE_FORMATS = [
+        '%d-%b-%Y', '%d %b %Y', '%d/%b/%Y', '%d-%b-%y', '%d %b %y',
+        '%d-%B-%Y', '%d %B %Y',
+        '%d/%m/%Y', '%d-%m-%Y', '%d.%m.%Y', '%d/%m/%y', '%d-%m-%y', '%d.%m.%y',
+        '%Y-%m-%d', '%Y/%m/%d', '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S',
+        '%d/%m/%Y %H:%M:%S', '%d-%m-%Y %H:%M:%S', '%d/%m/%Y %H:%M',
+        '%m/%d/%Y', '%m-%d-%Y', '%m/%d/%y', '%b %d, %Y',
+    ]
+    DATE_SAMPLE_SIZE = 200
+    
     def __init__(self, data: pd.DataFrame):
         """
         Initialize adapter with raw data.
@@ -42,50 +242,75 @@ class BankAdapter(ABC):
             data: pandas DataFrame containing raw statement data
         """
         self.df = data
-        self.transactions: List[Transaction] = []
+        self.transactions: TransactionBatch = TransactionBatch.empty()
+        self.date_format: Optional[str] = None
+        self.column_mapping: Optional[ColumnMapping] = None
+        # Set by process_chunks: decisions taken on the first chunk are reused
+        self._streaming = False
+        self._date_formats: Dict[Any, Optional[str]] = {}
         
     @abstractmethod
-    def process(self) -> List[Transaction]:
+    def process(self) -> TransactionBatch:
         """
         Process the raw data and extract standardized transactions.
         
         Returns:
-            List of Transaction objects
+            TransactionBatch (indexes and iterates as Transaction objects)
         """
         pass
     
+    def process_chunks(self, chunks: Iterable[pd.DataFrame]) -> Iterator[TransactionBatch]:
+        """
+        Process a statement one chunk at a time (see CSVParser.parse_chunks).
+        
+        The column mapping and date formats are decided on the first chunk
+        and reused for the rest, so every chunk is read the same way. Only
+        the current chunk is held; self.transactions is the last batch.
+        
+        Args:
+            chunks: DataFrames with the same columns, in statement order
+            
+        Yields:
+            One TransactionBatch per chunk
+        """
+        self._streaming = True
+        self._date_formats = {}
+        self.column_mapping = None
+        try:
+            for chunk in chunks:
+                self.df = chunk
+                yield self.process()
+        finally:
+            self._streaming = False
+    
     def validate(self) -> bool:
         """
-        Validate if the data matches the expected format for this adapter.
+        Validate the processed statement.
+        
+        Checks running-balance continuity of self.transactions (see
+        check_balances); before process() there is nothing to check.
         
         Returns:
             True if valid
         """
-        return True
+        return self.check_balances().ok
     
-    def _clean_amount(self, value: Any) -> float:
-        """Helper to clean and convert amount strings to float."""
-        if pd.isna(value) or value == '':
-            return 0.0
-        if isinstance(value, (int, float)):
-            return float(value)
-        
-        # Remove currency symbols, commas, and whitespace
-        clean_str = str(value).replace(',', '').replace('₹', '').strip()
-        
-        # Handle "Cr"/"Dr" suffixes if present
-        if clean_str.lower().endswith('cr'):
-            clean_str = clean_str[:-2].strip()
-        elif clean_str.lower().endswith('dr'):
-            clean_str = clean_str[:-2].strip()
+    def check_balances(self, order: str = 'auto') -> 'BalanceReport':
+        """
+        Check prev_balance + credit - debit == balance over self.transactions.
+        
+        Args:
+            order: 'asc', 'desc' or 'auto' (see adapters.balance)
             
-        try:
-            return float(clean_str)
-        except ValueError:
-            return 0.0
-
-    def _parse_date(self, value: Any, date_format: Optional[str] = None) -> Optional[datetime]:
-        """Helper to parse date strings."""
+        Returns:
+            BalanceReport with the rows where continuity breaks
+        """
+        from .balance import check_running_balance
+        return check_running_balance(self.transactions, order)
+    
+    def _parse_date(self, value: Any, date_format: Optional[str] = None,
+                    dayfirst: bool = False) -> Optional[datetime]:
+        """Helper to parse date strings; dayfirst applies when no format is given."""
         if pd.isna(value) or value == '':
             return None
         
@@ -102,7 +327,129 @@ class BankAdapter(ABC):
                 return datetime.strptime(clean_str, date_format)
             
             # Auto-parse using pandas
-            return pd.to_datetime(clean_str).to_pydatetime()
+            # dateutil would read ISO 2024-01-03 as 1 March when dayfirst
+            dayfirst = dayfirst and not clean_str[:4].isdigit()
+            return pd.to_datetime(clean_str, dayfirst=dayfirst).to_pydatetime()
             
         except (ValueError, TypeError):
             return None
+
+    def _detect_columns(self) -> Dict[str, Any]:
+        """
+        Map the dataframe's headers to standard fields.
+        
+        The full result, including per-field confidence, is kept on
+        self.column_mapping.
+        
+        Returns:
+            Field name -> source column label
+        """
+        if not (self._streaming and self.column_mapping is not None):
+            self.column_mapping = ColumnDetector.detect(self.df.columns)
+        return self.column_mapping.columns
+
+    def _amount_paise_column(self, values: pd.Series) -> np.ndarray:
+        """
+        Parse a whole amount column into signed int64 paise.
+        
+        Dr / (..) / a leading or trailing '-' make the amount negative; see
+        adapters.amounts for the accepted forms.
+        
+        Args:
+            values: Raw amount column
+            
+        Returns:
+            int64 array, 0 where the cell is blank or unparseable
+        """
+        return parse_paise(values)
+    
+    def _infer_date_format(self, values: pd.Series, preferred: Sequence[str] = ()) -> Optional[str]:
+        """
+        Pick the strptime format that parses most of a sample of a column.
+        
+        Ties go to the earlier candidate: preferred formats first, then
+        DATE_FORMATS, which lists day-first layouts before month-first ones
+        (Indian statements are dd/mm).
+        
+        Args:
+            values: Raw date column
+            preferred: Formats to try before DATE_FORMATS (e.g. from a bank layout)
+            
+        Returns:
+            Format string, or None if no candidate parses any sampled cell
+        """
+        if self._streaming and values.name in self._date_formats:
+            return self._date_formats[values.name]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            return None
+        
+        text = values.dropna().astype(str).str.strip()
+        sample = text[text != ''].unique()[:self.DATE_SAMPLE_SIZE]
+        
+        best_format, best_hits = None, 0
+        candidates = list(preferred) + [f for f in self.DATE_FORMATS if f not in preferred]
+        for date_format in candidates:
+            hits = 0
+            for value in sample:
+                try:
+                    datetime.strptime(value, date_format)
+                    hits += 1
+                except ValueError:
+                    pass
+            if hits > best_hits:
+                best_format, best_hits = date_format, hits
+                if hits == len(sample):
+                    break
+        if self._streaming and len(sample):
+            self._date_formats[values.name] = best_format
+        return best_format
+    
+    def _parse_date_column(self, values: pd.Series, date_format: Optional[str] = None) -> pd.Series:
+        """
+        Vectorized equivalent of _parse_date for a whole column.
+        
+        The column is parsed in one call, with date_format if given (see
+        _infer_date_format) or else the format pandas infers from its first
+        value; cells that do not fit fall back to the row-wise _parse_date,
+        read day-first unless date_format puts the month first.
+        
+        Args:
+            values: Raw date column
+            date_format: Optional strptime format for the whole column
+            
+        Returns:
+            datetime64 Series aligned with values, NaT where unparseable
+        """
+        if pd.api.types.is_datetime64_any_dtype(values):
+            return values
+        
+        text = values.astype(object).where(values.notna(), '').astype(str).str.strip()
+        with warnings.catch_warnings():
+            # Raised when no single format can be inferred; pandas then
+            # parses element-wise, which is what we want anyway
+            warnings.simplefilter('ignore', UserWarning)
+            dates = pd.to_datetime(text.where(text != ''), format=date_format, errors='coerce')
+        
+        outliers = dates.isna() & (text != '')
+        if outliers.any():
+            dayfirst = self._is_dayfirst(date_format)
+            fallback = values[outliers].map(
+                lambda value: self._parse_date(value, dayfirst=dayfirst)
+            )
+            dates = dates.astype(object)
+            dates[outliers] = fallback
+            dates = pd.to_datetime(dates, errors='coerce')
+        return dates
+    
+    @staticmethod
+    def _is_dayfirst(date_format: Optional[str]) -> bool:
+        """Whether a column's format has the day before the month; True if unknown."""
+        if not date_format or '%d' not in date_format:
+            return True
+        months = [date_format.find(d) for d in ('%m', '%b', '%B') if d in date_format]
+        return not months or date_format.index('%d') < min(months)
+    
+    @staticmethod
+    def _text_column(values: pd.Series) -> pd.Series:
+        """Convert a column to str, with missing cells as ''."""
+        return values.astype(object).where(values.notna(), '').astype(str)
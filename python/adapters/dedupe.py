@@ -0,0 +1,129 @@
+"""Duplicate transaction detection across overlapping statements.
+
+Clients often send statements whose date ranges overlap (March plus a Q1
+statement). Each transaction is reduced to a fingerprint of its normalized
+(date, debit, credit, balance, reference or description); the first file to
+produce a fingerprint owns it and the same fingerprint in any later file is
+a duplicate. Lookups go through a hash index, so a whole ``process`` call
+is linear in the number of transactions.
+
+Repeats inside one file are never flagged: with the balance in the key, a
+statement's own rows only collide when the bank printed no balance, and then
+two identical payments on one day are real.
+
+Works on the transaction dicts produced by TransactionBatch.to_records and
+needs only the standard library.
+"""
+
+import hashlib
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+MODES = ('flag', 'drop')
+
+_SPACES = re.compile(r'\s+')
+
+
+def _paise(value: Any) -> int:
+    """Rupee amount as integer paise."""
+    return int(round(float(value or 0) * 100))
+
+
+def transaction_fingerprint(record: Dict[str, Any]) -> bytes:
+    """
+    Fingerprint one transaction dict.
+
+    Args:
+        record: Transaction dict (date, debit, credit, balance,
+                reference_no, description)
+
+    Returns:
+        16-byte digest
+    """
+    text = record.get('reference_no') or record.get('description') or ''
+    text = _SPACES.sub(' ', str(text)).strip().upper()
+    key = '|'.join((
+        str(record.get('date') or '')[:10],
+        str(_paise(record.get('debit'))),
+        str(_paise(record.get('credit'))),
+        str(_paise(record.get('balance'))),
+        text,
+    ))
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+
+
+class DuplicateIndex:
+    """Hash index of fingerprints seen so far in one run."""
+
+    def __init__(self, mode: str = 'flag', history: Optional[Any] = None):
+        """
+        Args:
+            mode: 'flag' marks duplicates with 'duplicate_of'; 'drop' removes them
+            history: Optional HistoryIndex consulted for earlier runs and
+                     updated with this run's new transactions
+
+        Raises:
+            ValueError: If mode is unknown
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown dedupe mode: {mode}")
+        self.mode = mode
+        self.history = history
+        # fingerprint -> (source, file, row) of the first occurrence
+        self._seen: Dict[bytes, Tuple[str, str, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def apply(self, result: Dict[str, Any], source: str, digest: Optional[str] = None) -> int:
+        """
+        Flag or drop duplicates in one process result, then index its rows.
+
+        Results must be applied in input order so the earliest file wins.
+
+        Args:
+            result: process_file result dict; modified in place
+            source: Identity of this file within the run (e.g. input index)
+            digest: Content digest of the file; history entries recorded from
+                    the same content are not counted as duplicates, so
+                    re-processing a file is harmless
+
+        Returns:
+            Number of duplicates found
+        """
+        records = result.get('transactions')
+        if result.get('status') != 'success' or records is None:
+            return 0
+
+        fingerprints = [transaction_fingerprint(r) for r in records]
+        earlier = self.history.lookup(fingerprints, exclude_source=digest) if self.history else {}
+
+        kept: List[Dict[str, Any]] = []
+        new_entries = []
+        duplicates = 0
+        for row, (record, fingerprint) in enumerate(zip(records, fingerprints)):
+            origin = self._seen.get(fingerprint)
+            if origin is not None and origin[0] == source:
+                origin = None
+            if origin is None:
+                origin = earlier.get(fingerprint)
+
+            if origin is None:
+                if fingerprint not in self._seen:
+                    self._seen[fingerprint] = (source, result['file'], row)
+                    new_entries.append((fingerprint, digest or source, result['file'], row))
+                kept.append(record)
+                continue
+
+            duplicates += 1
+            if self.mode == 'flag':
+                record['duplicate_of'] = {'file': origin[1], 'index': origin[2]}
+                kept.append(record)
+
+        if self.mode == 'drop':
+            result['transactions'] = kept
+            result['transaction_count'] = len(kept)
+        result['duplicate_count'] = duplicates
+        if self.history is not None and new_entries:
+            self.history.add(new_entries)
+        return duplicates
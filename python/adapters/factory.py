@@ -1,19 +1,29 @@
 """Factory for creating bank adapters."""
 
-from typing import Type
+from typing import Dict, List, Type
 import pandas as pd
 from .base import BankAdapter
+from .layout import load_layouts
+from .layout_adapter import LayoutAdapter
 from .sbi_adapter import SBIAdapter
 from .std_adapter import StandardAdapter
 
 class AdapterFactory:
     """Factory to get the appropriate adapter."""
     
-    @staticmethod
-    def get_adapter(bank_name: str, data: pd.DataFrame) -> BankAdapter:
+    # Banks that need code beyond their layout spec
+    _adapters: Dict[str, Type[BankAdapter]] = {
+        'SBI': SBIAdapter,
+    }
+    
+    @classmethod
+    def get_adapter(cls, bank_name: str, data: pd.DataFrame) -> BankAdapter:
         """
         Get adapter instance for the specified bank.
         
+        Registered adapter classes win, then layout specs from
+        adapters/layouts, then the generic StandardAdapter.
+        
         Args:
             bank_name: Name of the bank (detected by BankDetector)
             data: Raw DataFrame
@@ -23,10 +33,22 @@ class AdapterFactory:
         """
         bank = bank_name.upper() if bank_name else ""
         
-        if bank == 'SBI':
-            return SBIAdapter(data)
-        # elif bank == 'HDFC':
-        #     return HDFCAdapter(data)
+        if bank in cls._adapters:
+            return cls._adapters[bank](data)
+        
+        layout = load_layouts().get(bank)
+        if layout is not None:
+            return LayoutAdapter(data, layout)
         
         # Default to standard adapter
         return StandardAdapter(data)
+    
+    @classmethod
+    def register_adapter(cls, bank_code: str, adapter_class: Type[BankAdapter]) -> None:
+        """Register an adapter class for a bank code."""
+        cls._adapters[bank_code.upper()] = adapter_class
+    
+    @classmethod
+    def get_supported_banks(cls) -> List[str]:
+        """Bank codes with a dedicated adapter or layout spec."""
+        return sorted(set(cls._adapters) | set(load_layouts()))
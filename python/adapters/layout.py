@@ -0,0 +1,188 @@
+"""Declarative bank statement layouts.
+
+Each bank's export layout lives in ``adapters/layouts/<bank>.json``::
+
+    {
+        "bank": "HDFC",
+        "columns": {"date": ["Date"], "debit": ["Withdrawal Amt."], ...},
+        "date_formats": ["%d/%m/%y"],
+        "amounts": "split",
+        "skip_rows": 0
+    }
+
+columns
+    Field -> header labels used by the bank, most common first. Fields are
+    date, value_date, description, reference, debit, credit, amount,
+    indicator and balance. Labels are compared after
+    ColumnDetector.normalize, so case and punctuation do not matter.
+date_formats
+    strptime formats tried before the generic BankAdapter.DATE_FORMATS.
+amounts
+    Sign convention: ``split`` (separate debit/credit columns), ``signed``
+    (one amount column, negative or Dr is a debit) or ``indicator`` (one
+    amount column plus a Dr/Cr column named by the ``indicator`` field).
+    A file lacking the columns its convention needs falls back to
+    ``signed`` if it has an amount column, or ``split`` if it has debit or
+    credit columns.
+skip_rows
+    Preamble rows (account details, address) that may sit above the real
+    header row.
+
+Specs are read once per process and compiled per header layout into a
+LayoutPlan that LayoutAdapter applies column-at-a-time.
+"""
+
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from parsers.column_detector import ColumnDetector
+
+LAYOUT_DIR = Path(__file__).parent / 'layouts'
+
+FIELDS = ('date', 'value_date', 'description', 'reference', 'debit', 'credit',
+          'amount', 'indicator', 'balance')
+SIGN_CONVENTIONS = ('split', 'signed', 'indicator')
+
+
+@dataclass(frozen=True)
+class LayoutPlan:
+    """A layout resolved against one concrete header row."""
+    columns: Tuple[Tuple[str, int], ...]  # (field, column position)
+    amounts: str  # sign convention the mapped columns support
+
+    def get(self, name: str) -> Optional[int]:
+        """Column position for a field, or None if not present."""
+        for field_name, position in self.columns:
+            if field_name == name:
+                return position
+        return None
+
+
+@dataclass(frozen=True)
+class BankLayout:
+    """One bank's statement layout, as loaded from its spec file."""
+    bank: str
+    columns: Tuple[Tuple[str, Tuple[str, ...]], ...]
+    date_formats: Tuple[str, ...] = ()
+    amounts: str = 'split'
+    skip_rows: int = 0
+
+    @classmethod
+    def from_dict(cls, spec: Dict[str, Any]) -> 'BankLayout':
+        """
+        Build a layout from a parsed spec.
+
+        Raises:
+            ValueError: If the spec names an unknown field or sign convention
+        """
+        unknown = set(spec.get('columns', {})) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown layout fields for {spec.get('bank')}: {sorted(unknown)}")
+        amounts = spec.get('amounts', 'split')
+        if amounts not in SIGN_CONVENTIONS:
+            raise ValueError(f"Unknown sign convention for {spec.get('bank')}: {amounts}")
+
+        return cls(
+            bank=spec['bank'].upper(),
+            columns=tuple(
+                (name, tuple(ColumnDetector.normalize(label) for label in labels))
+                for name, labels in spec.get('columns', {}).items()
+            ),
+            date_formats=tuple(spec.get('date_formats', ())),
+            amounts=amounts,
+            skip_rows=int(spec.get('skip_rows', 0)),
+        )
+
+    def compile(self, headers: Iterable[Any]) -> LayoutPlan:
+        """
+        Resolve the layout against a header row.
+
+        Spec labels win; fields the spec does not match fall back to
+        ColumnDetector so minor export changes keep working. Plans are
+        memoized per layout and header signature.
+
+        Args:
+            headers: Header labels in table order
+
+        Returns:
+            LayoutPlan
+        """
+        return _compile(self, tuple(ColumnDetector.normalize(h) for h in headers))
+
+    def matches(self, headers: Iterable[Any]) -> bool:
+        """Whether a row of labels looks like this layout's header row."""
+        normalized = {ColumnDetector.normalize(h) for h in headers}
+        return any(label in normalized for name, labels in self.columns
+                   if name == 'date' for label in labels)
+
+    def is_header(self, headers: Iterable[Any], min_fields: int = 3) -> bool:
+        """
+        Stricter than matches(): the date and at least min_fields spec labels.
+
+        Used to find this bank's header row before parsing, where a preamble
+        line such as "Date,01/04/2024" must not be mistaken for it.
+        """
+        normalized = {ColumnDetector.normalize(h) for h in headers}
+        fields = {name for name, labels in self.columns
+                  if any(label in normalized for label in labels)}
+        return 'date' in fields and len(fields) >= min_fields
+
+
+@lru_cache(maxsize=256)
+def _compile(layout: BankLayout, signature: Tuple[str, ...]) -> LayoutPlan:
+    """Build the plan for one (layout, header signature) pair."""
+    positions: Dict[str, int] = {}
+    used = set()
+    for name, labels in layout.columns:
+        for label in labels:
+            if label in signature and signature.index(label) not in used:
+                positions[name] = signature.index(label)
+                used.add(positions[name])
+                break
+
+    for name, index, _ in ColumnDetector._detect_signature(signature):
+        if name not in positions and index not in used:
+            positions[name] = index
+            used.add(index)
+
+    return LayoutPlan(
+        columns=tuple((name, positions[name]) for name in FIELDS if name in positions),
+        amounts=_sign_convention(layout.amounts, positions),
+    )
+
+
+def _sign_convention(amounts: str, positions: Dict[str, int]) -> str:
+    """The layout's sign convention, or the one the mapped columns support."""
+    split = 'debit' in positions or 'credit' in positions
+    supported = {
+        'split': split,
+        'signed': 'amount' in positions,
+        'indicator': 'amount' in positions and 'indicator' in positions,
+    }
+    if supported[amounts]:
+        return amounts
+    if supported['signed']:
+        return 'signed'
+    return 'split' if split else amounts
+
+
+@lru_cache(maxsize=None)
+def load_layouts(directory: Optional[str] = None) -> Dict[str, BankLayout]:
+    """
+    Load every layout spec in a directory, once per process.
+
+    Args:
+        directory: Spec directory (defaults to adapters/layouts)
+
+    Returns:
+        Bank code -> BankLayout
+    """
+    layouts = {}
+    for path in sorted(Path(directory or LAYOUT_DIR).glob('*.json')):
+        with open(path, encoding='utf-8') as f:
+            layout = BankLayout.from_dict(json.load(f))
+        layouts[layout.bank] = layout
+    return layouts
@@ -0,0 +1,119 @@
+"""Adapter driven by a declarative bank layout spec."""
+
+import itertools
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from parsers.header_locator import HeaderLocator
+from .base import BankAdapter, TransactionBatch
+from .layout import BankLayout, LayoutPlan, load_layouts
+
+
+class LayoutAdapter(BankAdapter):
+    """
+    Applies a BankLayout (see adapters/layout.py) to a statement table.
+
+    Subclasses may pin a bank by setting bank_code; otherwise the layout is
+    passed in by AdapterFactory.
+    """
+
+    bank_code: Optional[str] = None
+
+    def __init__(self, data: pd.DataFrame, layout: Optional[BankLayout] = None):
+        """
+        Initialize adapter with raw data and a layout.
+
+        Args:
+            data: pandas DataFrame containing raw statement data
+            layout: Bank layout (defaults to the spec for bank_code)
+        """
+        super().__init__(data)
+        self.layout = layout or load_layouts()[self.bank_code]
+        self.plan: Optional[LayoutPlan] = None
+        self._header: Optional[list] = None
+
+    def process(self) -> TransactionBatch:
+        """Process the statement according to the layout."""
+        # Promote the real header when a preamble line was read as the header;
+        # while streaming, later chunks reuse the one found in the first
+        data = self.df
+        if self._streaming and self._header is not None:
+            data = data.copy(deep=False)
+            data.columns = self._header
+        else:
+            if self.layout.skip_rows:
+                rows = itertools.chain(
+                    [list(data.columns)],
+                    data.head(self.layout.skip_rows).itertuples(index=False, name=None)
+                )
+                location = HeaderLocator.locate(rows, fallback=self.layout.is_header)
+                if location.row:
+                    data = data.iloc[location.row:].reset_index(drop=True)
+                    data.columns = location.columns
+            self._header = list(data.columns)
+        plan = self.plan = self.layout.compile(data.columns)
+
+        if plan.get('date') is None:
+            self.transactions = TransactionBatch.empty()
+            return self.transactions
+
+        def column(field):
+            """Source column for a field, or an all-blank column if unmapped."""
+            position = plan.get(field)
+            if position is None:
+                return pd.Series([None] * len(data), index=data.index, dtype=object)
+            return data.iloc[:, position]
+
+        # Column-at-a-time cleaning; rows without a valid date are skipped
+        self.date_format = self._infer_date_format(column('date'), self.layout.date_formats)
+        dates = self._parse_date_column(column('date'), self.date_format)
+        debits, credits = self._split_amounts(plan, column)
+        balances = self._amount_paise_column(column('balance'))
+        descriptions = self._text_column(column('description'))
+        refs = self._text_column(column('reference'))
+
+        valid = dates.notna().to_numpy()
+        value_dates = None
+        if plan.get('value_date') is not None:
+            raw = column('value_date')
+            value_dates = self._parse_date_column(
+                raw, self._infer_date_format(raw, self.layout.date_formats)
+            )[valid]
+
+        transactions = TransactionBatch.from_columns(
+            dates[valid],
+            descriptions[valid].tolist(),
+            debits[valid],
+            credits[valid],
+            balances[valid],
+            refs[valid].tolist(),
+            value_dates,
+            paise=True
+        )
+
+        self.transactions = transactions
+        return transactions
+
+    def process_chunks(self, chunks: Iterable[pd.DataFrame]) -> Iterator[TransactionBatch]:
+        """Process chunk by chunk; the header is located in the first chunk only."""
+        self._header = None
+        yield from super().process_chunks(chunks)
+
+    def _split_amounts(self, plan: LayoutPlan, column) -> tuple:
+        """Debit and credit paise columns under the plan's sign convention."""
+        if plan.amounts == 'split':
+            # The column decides the side, so drop Dr/Cr signs
+            return (np.abs(self._amount_paise_column(column('debit'))),
+                    np.abs(self._amount_paise_column(column('credit'))))
+
+        amounts = self._amount_paise_column(column('amount'))
+        if plan.amounts == 'indicator':
+            side = self._text_column(column('indicator')).str.strip().str.upper()
+            debit_side = side.str.startswith('D').to_numpy()
+            amounts = np.abs(amounts)
+        else:
+            debit_side = amounts < 0
+            amounts = np.abs(amounts)
+        return np.where(debit_side, amounts, 0), np.where(debit_side, 0, amounts)
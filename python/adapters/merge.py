@@ -0,0 +1,50 @@
+"""Chronological k-way merge of several statements for one account.
+
+Each statement is already in date order (oldest or newest first), so the
+merge only normalizes each file to oldest-first and interleaves them with
+heapq.merge: O(n log k) for k files instead of concatenating and sorting
+everything. Ties keep file order, then row order.
+
+Works on transaction dicts (TransactionBatch.to_records) whose 'date' is
+an ISO string, so dates compare as text without parsing.
+"""
+
+import heapq
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List
+
+Record = Dict[str, Any]
+
+_by_date = itemgetter('date')
+
+
+def sorted_run(records: List[Record], key: Callable[[Record], Any] = _by_date) -> List[Record]:
+    """
+    Put one statement's rows in ascending date order.
+
+    Sorted input is returned as is and newest-first input is reversed, both
+    in one linear scan; anything else falls back to a stable sort, which is
+    still near-linear on mostly sorted rows.
+    """
+    keys = [key(r) for r in records]
+    pairs = list(zip(keys, keys[1:]))
+    if all(a <= b for a, b in pairs):
+        return records
+    if all(a >= b for a, b in pairs):
+        return records[::-1]
+    return sorted(records, key=key)
+
+
+def merge_transactions(statements: Iterable[List[Record]],
+                       key: Callable[[Record], Any] = _by_date) -> Iterator[Record]:
+    """
+    Merge statements into one chronological stream.
+
+    Args:
+        statements: One list of transaction dicts per file, in file order
+        key: Sort key (defaults to the 'date' field)
+
+    Yields:
+        Transaction dicts, oldest first
+    """
+    return heapq.merge(*(sorted_run(records, key) for records in statements), key=key)
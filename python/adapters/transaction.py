@@ -0,0 +1,32 @@
+"""Transaction record shared by adapters and exporters.
+
+Kept free of pandas so exporters can load it without the parsing stack.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+
+@dataclass
+class Transaction:
+    """Standardized transaction entry."""
+    date: datetime
+    description: str
+    debit: float
+    credit: float
+    balance: float
+    reference_no: Optional[str] = None
+    value_date: Optional[datetime] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert transaction to dictionary."""
+        return {
+            'date': self.date.isoformat(),
+            'description': self.description,
+            'debit': self.debit,
+            'credit': self.credit,
+            'balance': self.balance,
+            'reference_no': self.reference_no,
+            'value_date': self.value_date.isoformat() if self.value_date else None
+        }
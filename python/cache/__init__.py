@@ -0,0 +1,6 @@
+"""Cache package for reusing processed statement results."""
+
+from .history_index import HistoryIndex
+from .result_cache import ResultCache
+
+__all__ = ['HistoryIndex', 'ResultCache']
@@ -0,0 +1,84 @@
+"""Persistent index of transaction fingerprints from earlier runs."""
+
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .result_cache import ResultCache
+
+# SQLite's default limit on host parameters is 999
+_LOOKUP_BATCH = 500
+
+
+class HistoryIndex:
+    """SQLite-backed fingerprint -> first occurrence index (see adapters.dedupe)."""
+
+    def __init__(self, cache_dir: Optional[str] = None) -> None:
+        """
+        Open (or create) the history database.
+
+        Args:
+            cache_dir: Directory for the index file. Defaults to the
+                       ResultCache default directory.
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else ResultCache.default_dir()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.cache_dir / 'history.sqlite3'), timeout=30)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS fingerprints ("
+            " fingerprint BLOB PRIMARY KEY,"
+            " source TEXT NOT NULL,"
+            " file TEXT NOT NULL,"
+            " row INTEGER NOT NULL,"
+            " added REAL NOT NULL) WITHOUT ROWID"
+        )
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM fingerprints").fetchone()[0]
+
+    def lookup(self, fingerprints: List[bytes],
+               exclude_source: Optional[str] = None) -> Dict[bytes, Tuple[str, str, int]]:
+        """
+        Find fingerprints recorded by earlier runs.
+
+        Args:
+            fingerprints: Fingerprints to look up
+            exclude_source: Ignore entries recorded from this source
+
+        Returns:
+            fingerprint -> (source, file, row) for each hit
+        """
+        hits = {}
+        for start in range(0, len(fingerprints), _LOOKUP_BATCH):
+            batch = fingerprints[start:start + _LOOKUP_BATCH]
+            placeholders = ','.join('?' * len(batch))
+            for fingerprint, source, file, row in self._conn.execute(
+                "SELECT fingerprint, source, file, row FROM fingerprints"
+                f" WHERE fingerprint IN ({placeholders})",
+                batch
+            ):
+                if source != exclude_source:
+                    hits[bytes(fingerprint)] = (source, file, row)
+        return hits
+
+    def add(self, entries: Iterable[Tuple[bytes, str, str, int]]) -> None:
+        """Record (fingerprint, source, file, row) entries; existing fingerprints are kept."""
+        now = time.time()
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO fingerprints (fingerprint, source, file, row, added)"
+                " VALUES (?, ?, ?, ?, ?)",
+                ((fingerprint, source, file, row, now)
+                 for fingerprint, source, file, row in entries)
+            )
+
+    def clear(self) -> None:
+        """Forget every recorded transaction."""
+        with self._conn:
+            self._conn.execute("DELETE FROM fingerprints")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
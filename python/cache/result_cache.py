@@ -0,0 +1,163 @@
+"""Content-addressed on-disk cache for processed statement results."""
+
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Packages and modules whose source determines the shape of a processed
+# result. Any edit to these files changes the pipeline fingerprint and
+# invalidates old entries.
+_PIPELINE_PACKAGES = ('parsers', 'adapters')
+_PIPELINE_MODULES = ('cli.py',)
+# Settings that pick a reader and so can change a result; unset means 'auto'
+_PIPELINE_SETTINGS = ('CSV_ENGINE', 'EXCEL_ENGINE')
+
+_source_fingerprint: Optional[str] = None
+
+
+def _source_digest() -> str:
+    """Hex digest over the pipeline sources and the pandas version, once."""
+    global _source_fingerprint
+    if _source_fingerprint is None:
+        root = Path(__file__).resolve().parent.parent
+        paths = [root / module for module in _PIPELINE_MODULES]
+        for package in _PIPELINE_PACKAGES:
+            paths.extend(sorted((root / package).rglob('*')))
+        digest = hashlib.blake2b(digest_size=16)
+        for path in paths:
+            if path.suffix in ('.py', '.json') and path.is_file():
+                digest.update(path.relative_to(root).as_posix().encode())
+                digest.update(path.read_bytes())
+        try:
+            from importlib.metadata import version
+            digest.update(version('pandas').encode())
+        except Exception:
+            pass
+        _source_fingerprint = digest.hexdigest()
+    return _source_fingerprint
+
+
+def pipeline_fingerprint() -> str:
+    """
+    Get a version hash of the processing pipeline.
+    
+    Returns:
+        Hex digest over the pipeline sources, the pandas version and the
+        current reader engine settings
+    """
+    digest = hashlib.blake2b(_source_digest().encode(), digest_size=16)
+    for name in _PIPELINE_SETTINGS:
+        digest.update(f"{name}={os.environ.get(name) or 'auto'};".encode())
+    return digest.hexdigest()
+
+
+def file_digest(file_path: str) -> str:
+    """Hash file content in 1 MB blocks."""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """SQLite-backed cache of process results keyed by file content."""
+    
+    DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+    
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: Optional[int] = None) -> None:
+        """
+        Open (or create) the cache database.
+        
+        Args:
+            cache_dir: Directory for the cache file. Defaults to $CACHE_DIR or
+                       the per-user cache directory.
+            max_bytes: Size budget for stored results (compressed). Defaults to
+                       $CACHE_MAX_SIZE or 256 MB. Least recently used entries
+                       are evicted beyond it.
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else self.default_dir()
+        if max_bytes is None:
+            max_bytes = int(os.environ.get('CACHE_MAX_SIZE') or self.DEFAULT_MAX_BYTES)
+        self.max_bytes = max_bytes
+        
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.cache_dir / 'results.sqlite3'), timeout=30)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY,"
+            " data BLOB NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS results_lru ON results (last_access)")
+        self._conn.commit()
+    
+    @staticmethod
+    def default_dir() -> Path:
+        """Resolve the default cache directory."""
+        if os.environ.get('CACHE_DIR'):
+            return Path(os.environ['CACHE_DIR'])
+        if sys.platform == 'win32' and os.environ.get('LOCALAPPDATA'):
+            return Path(os.environ['LOCALAPPDATA']) / 'Ledger' / 'Cache'
+        base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+        return Path(base) / 'ledger'
+    
+    def key_for(self, file_path: str) -> str:
+        """Build the cache key for a file's current content."""
+        return f"{file_digest(file_path)}:{pipeline_fingerprint()}"
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached result.
+        
+        Returns:
+            The stored result dict, or None on a miss
+        """
+        row = self._conn.execute("SELECT data FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        self._conn.execute("UPDATE results SET last_access = ? WHERE key = ?", (time.time(), key))
+        self._conn.commit()
+        return json.loads(zlib.decompress(row[0]))
+    
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """Store a result and evict least recently used entries over budget."""
+        data = zlib.compress(json.dumps(result, separators=(',', ':')).encode('utf-8'), 1)
+        if len(data) > self.max_bytes:
+            return
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, data, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, data, len(data), time.time())
+            )
+            self._evict()
+    
+    def _evict(self) -> None:
+        """Delete oldest entries until the total size fits max_bytes."""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        stale = []
+        rows = self._conn.execute("SELECT key, size FROM results ORDER BY last_access, rowid")
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM results WHERE key = ?", stale)
+    
+    def clear(self) -> None:
+        """Remove every cached result."""
+        with self._conn:
+            self._conn.execute("DELETE FROM results")
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
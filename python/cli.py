@@ -2,45 +2,132 @@
 
 import argparse
 import json
+import os
 import sys
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 
 # Ensure project root is in path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from datetime import datetime
-from parsers.csv_parser import CSVParser
-from parsers.excel_parser import ExcelParser
-from parsers.bank_detector import BankDetector
-from adapters.factory import AdapterFactory
-from adapters.base import Transaction
-from exporters.tally_xml import TallyXMLExporter
-
-def process_file(file_path: str) -> Dict[str, Any]:
-    # ... (existing content, no change in logic, just indentation if inside class but here it's function)
-    # Keeping existing logic.
+
+# Parsers, adapters and exporters are imported inside the functions that use
+# them so that e.g. `cli.py export` never pays for pandas/openpyxl start-up.
+
+_caches: Dict[str, Any] = {}
+
+def _open_cache(cache_dir: str):
+    """Get the ResultCache for a directory, opened once per process."""
+    from cache.result_cache import ResultCache
+    
+    if cache_dir not in _caches:
+        _caches[cache_dir] = ResultCache(cache_dir)
+    return _caches[cache_dir]
+
+def default_cache_dir() -> str:
+    """Resolve the cache directory used when --cache-dir is not given."""
+    from cache.result_cache import ResultCache
+    return str(ResultCache.default_dir())
+
+def process_file(file_path: str, cache_dir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Parse, detect and adapt a single statement file.
+    
+    Args:
+        file_path: Path to the statement
+        cache_dir: Result cache directory; None disables caching
+        
+    Returns:
+        Result dict with 'status' 'success' (plus transactions) or 'error'
+    """
     path = Path(file_path)
     if not path.exists():
         return {'file': file_path, 'status': 'error', 'message': 'File not found'}
     
+    cache = None
+    key = None
+    if cache_dir:
+        try:
+            cache = _open_cache(cache_dir)
+            key = cache.key_for(str(path))
+            cached = cache.get(key)
+        except Exception:
+            # An unusable cache must never fail the file itself
+            cache = cached = None
+        if cached is not None:
+            return {'file': file_path, **cached}
+    
+    result = _process_path(path, file_path)
+    
+    if cache is not None and result['status'] == 'success':
+        try:
+            cache.put(key, {k: v for k, v in result.items() if k != 'file'})
+        except Exception:
+            pass
+    return result
+
+# Keyword-only early detection must outscore the runner-up bank by this much
+EARLY_DETECTION_MARGIN = 2
+
+def _detect_early(parser: Any) -> str:
+    """
+    Detect the bank from a parser's bounded preamble, before the full read.
+    
+    When the bank has a layout spec, the parser gets it so the bank's own
+    header labels and columns steer the parse. That only happens on firm
+    evidence: one of the bank's patterns matched, or its keywords outscore
+    the runner-up by EARLY_DETECTION_MARGIN. A lone keyword (a customer
+    named "BOB") returns "" and detection falls back to the parsed header.
+    """
+    from parsers.bank_detector import BankDetector
+    from adapters.layout import load_layouts
+    
+    candidates = BankDetector.rank(parser.probe_text(), max_chars=BankDetector.PROBE_CHARS)
+    if not candidates:
+        return ""
+    best = candidates[0]
+    runner_up = candidates[1].score if len(candidates) > 1 else 0
+    patterns = BankDetector.SIGNATURES[best.bank]['patterns']
+    if not any(signature in patterns for signature in best.signatures) \
+            and best.score - runner_up < EARLY_DETECTION_MARGIN:
+        return ""
+    
+    layout = load_layouts().get(best.bank)
+    if layout is not None:
+        parser.use_layout(layout)
+    return best.bank
+
+def _process_path(path: Path, file_path: str) -> Dict[str, Any]:
+    """Run the parse -> detect -> adapt pipeline on an existing file."""
+    from parsers.csv_parser import CSVParser
+    from parsers.excel_parser import ExcelParser
+    from parsers.bank_detector import BankDetector
+    from adapters.factory import AdapterFactory
+    
     try:
         suffix = path.suffix.lower()
         df = None
         raw_text = ""
         
         if suffix == '.csv':
-            parser = CSVParser(str(path))
+            parser = CSVParser(str(path), engine=os.environ.get('CSV_ENGINE') or 'auto')
+            bank = _detect_early(parser)
             df = parser.parse()
-            raw_text = ",".join(df.columns) 
+            preamble = parser.preamble
         elif suffix in ['.xls', '.xlsx']:
-            parser = ExcelParser(str(path))
-            df = parser.parse()
-            raw_text = ",".join(df.columns)
+            # Banks often export one sheet per month
+            with ExcelParser(str(path), engine=os.environ.get('EXCEL_ENGINE') or 'auto') as parser:
+                bank = _detect_early(parser)
+                df = parser.parse_all_sheets()
+                preamble = parser.preamble
         else:
             return {'file': file_path, 'status': 'error', 'message': 'Unsupported file type'}
-            
-        bank = BankDetector.detect(raw_text) or ""
+        
+        if not bank:
+            # Fall back to the parsed header (e.g. a header past the probe window)
+            raw_text = "\n".join([preamble, ",".join(map(str, df.columns))])
+            bank = BankDetector.detect(raw_text) or ""
         adapter = AdapterFactory.get_adapter(bank, df)
         transactions = adapter.process()
         
@@ -48,23 +135,327 @@ def process_file(file_path: str) -> Dict[str, Any]:
             'file': file_path,
             'status': 'success',
             'bank': bank,
+            'date_format': adapter.date_format,
             'transaction_count': len(transactions),
-            'transactions': [txn.to_dict() for txn in transactions]
+            'balance_check': adapter.check_balances().to_dict(),
+            'transactions': transactions.to_records()
         }
         
     except Exception as e:
         return {'file': file_path, 'status': 'error', 'message': str(e)}
 
-def handle_export(format_type: str):
-    """Read transactions from stdin and export."""
+# Rows per chunk for --stream when --chunk-size is not given
+STREAM_CHUNK_SIZE = 100_000
+
+def stream_file(file_path: str, chunk_size: int, summary: Dict[str, Any]) -> Iterator[Any]:
+    """
+    Parse, detect and adapt one statement chunk by chunk.
+    
+    CSV and .xlsx files go through the parsers' parse_chunks, so memory is
+    bounded by one chunk; .xls sheets are parsed whole and yielded as one
+    batch each. Workbooks stream every transaction sheet in order (the
+    first sheet if none is recognized), aligned to the first sheet's
+    columns. The bank, column mapping and date format are decided on the
+    first chunk.
+    Streamed results bypass the result cache.
+    
+    Args:
+        file_path: Path to the statement
+        chunk_size: Rows per chunk
+        summary: Filled in with 'bank', 'date_format' and 'transaction_count'
+        
+    Yields:
+        One TransactionBatch per chunk
+    """
+    import itertools
+    from parsers.csv_parser import CSVParser
+    from parsers.excel_parser import ExcelParser
+    from parsers.bank_detector import BankDetector
+    from adapters.factory import AdapterFactory
+    
+    path = Path(file_path)
+    suffix = path.suffix.lower()
+    if suffix == '.csv':
+        parser = CSVParser(str(path))
+    elif suffix in ['.xls', '.xlsx']:
+        parser = ExcelParser(str(path))
+    else:
+        raise ValueError('Unsupported file type')
+    bank = _detect_early(parser)
+    if suffix == '.csv':
+        chunks = parser.parse_chunks(chunk_size)
+    else:
+        chunks = itertools.chain.from_iterable(
+            parser.parse_chunks(chunk_size, name) for name in parser.transaction_sheets() or [0]
+        )
+    
+    summary.update(bank='', date_format=None, transaction_count=0)
+    first = next(chunks, None)
+    if first is None:
+        return
+    # Adapters map columns on the first chunk, so later sheets must match it
+    columns = first.columns
+    chunks = (
+        chunk if chunk.columns.equals(columns) else chunk.reindex(columns=columns)
+        for chunk in chunks
+    )
+    
+    if not bank:
+        raw_text = "\n".join([parser.preamble, ",".join(map(str, first.columns))])
+        bank = BankDetector.detect(raw_text) or ""
+    summary['bank'] = bank
+    adapter = AdapterFactory.get_adapter(summary['bank'], first)
+    for batch in adapter.process_chunks(itertools.chain([first], chunks)):
+        summary['date_format'] = adapter.date_format
+        summary['transaction_count'] += len(batch)
+        yield batch
+
+def stream_export(file_paths: List[str], format_type: str, output: str,
+                  chunk_size: int = STREAM_CHUNK_SIZE) -> Dict[str, Any]:
+    """
+    Export statements to a file without holding them in memory.
+    
+    Files are streamed in input order (not merged) straight into the
+    exporter, which writes one voucher at a time.
+    
+    Returns:
+        Dictionary with 'success' and either 'output' (plus per-file
+        summaries) or 'message'
+    """
+    from exporters.tally_xml import TallyXMLExporter
+    
+    if format_type != 'tally-xml':
+        return {'success': False, 'message': f'Unknown format: {format_type}'}
+    
+    summaries: List[Dict[str, Any]] = []
+    
+    def transactions():
+        for file_path in file_paths:
+            summary: Dict[str, Any] = {'file': file_path}
+            summaries.append(summary)
+            for batch in stream_file(file_path, chunk_size, summary):
+                yield from batch
+    
     try:
-        input_data = sys.stdin.read()
-        if not input_data:
-            print(json.dumps({'success': False, 'message': 'No input data'}))
-            return
+        with open(output, 'w', encoding='utf-8') as out:
+            TallyXMLExporter(transactions()).write(out)
+    except Exception as e:
+        return {'success': False, 'message': str(e)}
+    
+    return {
+        'success': True,
+        'output': output,
+        'transaction_count': sum(s['transaction_count'] for s in summaries),
+        'files': summaries,
+    }
 
-        txns_data = json.loads(input_data)
+def iter_process_files(file_paths: List[str], jobs: int = 1,
+                       cache_dir: Optional[str] = None, dedupe: Optional[str] = None,
+                       history_dir: Optional[str] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Process several files, yielding each result as soon as it is ready.
+    
+    Args:
+        file_paths: Paths to statement files
+        jobs: Number of worker processes (1 processes serially in-process,
+              0 uses every CPU)
+        cache_dir: Result cache directory; None disables caching
+        dedupe: 'flag' or 'drop' duplicate transactions across files (see
+                adapters.dedupe); None leaves results untouched
+        history_dir: With dedupe, also check against and record into the
+                     persistent history index in this directory
         
+    Yields:
+        (input index, result dict) tuples in completion order, or in input
+        order when dedupe is set (the earliest file owns a transaction)
+    """
+    results = _iter_results(file_paths, jobs, cache_dir)
+    if dedupe:
+        results = _iter_deduped(results, file_paths, dedupe, history_dir)
+    yield from results
+
+def _iter_results(file_paths: List[str], jobs: int,
+                  cache_dir: Optional[str]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield (index, result) in completion order; see iter_process_files."""
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    if jobs <= 1 or len(file_paths) <= 1:
+        for index, file_path in enumerate(file_paths):
+            yield index, process_file(file_path, cache_dir)
+        return
+    
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    
+    with ProcessPoolExecutor(max_workers=min(jobs, len(file_paths))) as executor:
+        futures = {executor.submit(process_file, f, cache_dir): i for i, f in enumerate(file_paths)}
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # Worker died (e.g. BrokenProcessPool); isolate to this file
+                result = {'file': file_paths[index], 'status': 'error', 'message': str(e)}
+            yield index, result
+
+def _iter_deduped(results: Iterator[Tuple[int, Dict[str, Any]]], file_paths: List[str],
+                  mode: str, history_dir: Optional[str]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Re-order results into input order and apply duplicate detection."""
+    from adapters.dedupe import DuplicateIndex
+    
+    history = None
+    if history_dir:
+        from cache.history_index import HistoryIndex
+        from cache.result_cache import file_digest
+        history = HistoryIndex(history_dir)
+    
+    try:
+        index = DuplicateIndex(mode, history)
+        pending: Dict[int, Dict[str, Any]] = {}
+        next_index = 0
+        for i, result in results:
+            pending[i] = result
+            while next_index in pending:
+                result = pending.pop(next_index)
+                digest = None
+                if history is not None and result.get('status') == 'success':
+                    digest = file_digest(file_paths[next_index])
+                index.apply(result, str(next_index), digest)
+                yield next_index, result
+                next_index += 1
+    finally:
+        if history is not None:
+            history.close()
+
+def process_files(file_paths: List[str], jobs: int = 1,
+                  cache_dir: Optional[str] = None, dedupe: Optional[str] = None,
+                  history_dir: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Process several files, optionally in parallel worker processes.
+    
+    Args:
+        file_paths: Paths to statement files
+        jobs: Number of worker processes (see iter_process_files)
+        cache_dir: Result cache directory; None disables caching
+        dedupe, history_dir: Duplicate handling (see iter_process_files)
+        
+    Returns:
+        One result dict per file, in input order
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(file_paths)
+    for index, result in iter_process_files(file_paths, jobs, cache_dir, dedupe, history_dir):
+        results[index] = result
+    return results
+
+def merge_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Combine per-file results for one account into a single result.
+    
+    Transactions from every successful file are k-way merged into date
+    order (see adapters.merge); failed files are listed under 'errors'.
+    
+    Args:
+        results: process_files results, in input order
+        
+    Returns:
+        Result dict with 'files', 'errors', 'transaction_count' and the
+        merged 'transactions'
+    """
+    from adapters.merge import merge_transactions
+    
+    succeeded = [r for r in results if r.get('status') == 'success']
+    transactions = list(merge_transactions(r.get('transactions', []) for r in succeeded))
+    merged: Dict[str, Any] = {
+        'status': 'success' if succeeded or not results else 'error',
+        'files': [r['file'] for r in succeeded],
+        'errors': [r for r in results if r.get('status') != 'success'],
+        'transaction_count': len(transactions),
+        'transactions': transactions,
+    }
+    if any('duplicate_count' in r for r in succeeded):
+        merged['duplicate_count'] = sum(r.get('duplicate_count', 0) for r in succeeded)
+    return merged
+
+def write_ndjson(file_paths: List[str], jobs: int = 1, chunk_size: int = 0,
+                 cache_dir: Optional[str] = None, stdout=None,
+                 dedupe: Optional[str] = None, history_dir: Optional[str] = None,
+                 stream: bool = False):
+    """
+    Stream process results as newline-delimited JSON.
+    
+    One compact line is written (and flushed) per finished file, tagged with
+    its input 'index'. With chunk_size > 0, a successful file's transactions
+    are emitted first as {'index', 'file', 'chunk', 'transactions'} lines of
+    at most chunk_size entries, followed by the file's summary line without
+    the 'transactions' key.
+    
+    With stream=True, files are processed one after another through
+    stream_file, and each chunk line is written as soon as its rows are
+    parsed (jobs, cache and dedupe do not apply).
+    """
+    stdout = stdout or sys.stdout
+    
+    def emit(obj: Dict[str, Any]):
+        stdout.write(json.dumps(obj, separators=(',', ':')) + '\n')
+        stdout.flush()
+    
+    if stream:
+        for index, file_path in enumerate(file_paths):
+            summary: Dict[str, Any] = {}
+            try:
+                batches = stream_file(file_path, chunk_size or STREAM_CHUNK_SIZE, summary)
+                for chunk, batch in enumerate(batches):
+                    emit({'index': index, 'file': file_path, 'chunk': chunk,
+                          'transactions': batch.to_records()})
+                emit({'index': index, 'file': file_path, 'status': 'success', **summary})
+            except Exception as e:
+                emit({'index': index, 'file': file_path, 'status': 'error', 'message': str(e)})
+        return
+    
+    for index, result in iter_process_files(file_paths, jobs, cache_dir, dedupe, history_dir):
+        if chunk_size > 0 and 'transactions' in result:
+            transactions = result.pop('transactions')
+            for chunk, start in enumerate(range(0, len(transactions), chunk_size)):
+                emit({
+                    'index': index,
+                    'file': result['file'],
+                    'chunk': chunk,
+                    'transactions': transactions[start:start + chunk_size]
+                })
+            del transactions
+        emit({'index': index, **result})
+
+def write_columnar(file_paths: List[str], jobs: int = 1,
+                   cache_dir: Optional[str] = None, stdout=None,
+                   dedupe: Optional[str] = None, history_dir: Optional[str] = None):
+    """
+    Stream process results as columnar binary frames (see exporters.columnar).
+    
+    One frame is written per finished file. Its header meta holds the result
+    dict without 'transactions' plus the input 'index'; the transactions
+    themselves travel as typed column buffers.
+    """
+    from exporters.columnar import encode_records
+    
+    stdout = stdout or sys.stdout.buffer
+    for index, result in iter_process_files(file_paths, jobs, cache_dir, dedupe, history_dir):
+        records = result.pop('transactions', [])
+        stdout.write(encode_records(records, {'index': index, **result}))
+        stdout.flush()
+
+def export_transactions(txns_data: List[Dict[str, Any]], format_type: str) -> Dict[str, Any]:
+    """
+    Export transaction dicts (as produced by ``process``) to the given format.
+    
+    Args:
+        txns_data: List of transaction dictionaries
+        format_type: Export format (e.g. tally-xml)
+        
+    Returns:
+        Dictionary with 'success' and either 'content' or 'message'
+    """
+    from adapters.transaction import Transaction
+    
+    try:
         # Convert dicts back to Transaction objects
         transactions = []
         for t in txns_data:
@@ -77,17 +468,137 @@ def handle_export(format_type: str):
                 reference_no=t.get('reference_no'),
                 value_date=datetime.fromisoformat(t['value_date']) if t.get('value_date') else None
             ))
+        return render_export(transactions, format_type)
             
+    except Exception as e:
+        return {'success': False, 'message': str(e)}
+
+def render_export(transactions: list, format_type: str) -> Dict[str, Any]:
+    """Render Transaction objects in the given export format."""
+    from exporters.tally_xml import TallyXMLExporter
+    
+    try:
         if format_type == 'tally-xml':
             exporter = TallyXMLExporter(transactions)
             xml_content = exporter.generate_xml()
-            print(json.dumps({'success': True, 'content': xml_content}))
-        else:
-            print(json.dumps({'success': False, 'message': f'Unknown format: {format_type}'}))
+            return {'success': True, 'content': xml_content}
+        return {'success': False, 'message': f'Unknown format: {format_type}'}
+            
+    except Exception as e:
+        return {'success': False, 'message': str(e)}
+
+def handle_export(format_type: str, input_format: str = 'json', stdin=None):
+    """Read transactions from stdin (JSON list or columnar frames) and export."""
+    try:
+        if input_format == 'columnar':
+            from exporters.columnar import decode_transactions
+            
+            input_bytes = (stdin or sys.stdin.buffer).read()
+            if not input_bytes:
+                print(json.dumps({'success': False, 'message': 'No input data'}))
+                return
+            print(json.dumps(render_export(decode_transactions(input_bytes), format_type)))
+            return
+        
+        input_data = (stdin or sys.stdin).read()
+        if not input_data:
+            print(json.dumps({'success': False, 'message': 'No input data'}))
+            return
+
+        txns_data = json.loads(input_data)
+        print(json.dumps(export_transactions(txns_data, format_type)))
             
     except Exception as e:
         print(json.dumps({'success': False, 'message': str(e)}))
 
+def handle_request(request: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Dispatch a single JSON-RPC request from the ``serve`` loop.
+    
+    Supported methods:
+        process: params {"files": [...], "jobs": N, "cache": bool, "cache_dir": str,
+                         "dedupe": "flag"|"drop", "history": bool, "merge": bool}
+                 -> list of process_file results, or one merge_results dict
+        export:  params {"transactions": [...], "format": "tally-xml"}
+        ping:    no params -> "pong"
+        
+    Returns:
+        JSON-RPC response dictionary carrying the request id
+    """
+    req_id = request.get('id')
+    method = request.get('method')
+    params = request.get('params') or {}
+    
+    try:
+        if method == 'process':
+            cache_dir = None
+            if params.get('cache', True):
+                cache_dir = params.get('cache_dir') or default_cache_dir()
+            history_dir = None
+            if params.get('history'):
+                history_dir = params.get('cache_dir') or default_cache_dir()
+            result: Any = process_files(
+                params.get('files', []), int(params.get('jobs', 1)), cache_dir,
+                params.get('dedupe') or ('flag' if history_dir else None), history_dir
+            )
+            if params.get('merge'):
+                result = merge_results(result)
+        elif method == 'export':
+            result = export_transactions(params.get('transactions', []), params.get('format', ''))
+        elif method == 'ping':
+            result = 'pong'
+        else:
+            return {
+                'jsonrpc': '2.0', 'id': req_id,
+                'error': {'code': -32601, 'message': f'Unknown method: {method}'}
+            }
+    except Exception as e:
+        return {'jsonrpc': '2.0', 'id': req_id, 'error': {'code': -32000, 'message': str(e)}}
+    
+    return {'jsonrpc': '2.0', 'id': req_id, 'result': result}
+
+def serve(stdin=None, stdout=None):
+    """
+    Run a persistent worker reading line-delimited JSON-RPC requests.
+    
+    Each line on stdin is one request; each response is written as one
+    line on stdout and flushed immediately. Parsers, adapters and the
+    exporter stay imported for the lifetime of the process, so callers
+    only pay the parsing cost per request. The loop ends on EOF or a
+    ``shutdown`` request.
+    """
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    
+    for line in stdin:
+        line = line.strip()
+        if not line:
+            continue
+            
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            response: Dict[str, Any] = {
+                'jsonrpc': '2.0', 'id': None,
+                'error': {'code': -32700, 'message': f'Parse error: {e}'}
+            }
+        else:
+            if not isinstance(request, dict):
+                response = {
+                    'jsonrpc': '2.0', 'id': None,
+                    'error': {'code': -32600, 'message': 'Invalid request'}
+                }
+            elif request.get('method') == 'shutdown':
+                response = {'jsonrpc': '2.0', 'id': request.get('id'), 'result': None}
+                stdout.write(json.dumps(response) + '\n')
+                stdout.flush()
+                break
+            else:
+                response = handle_request(request)
+        
+        stdout.write(json.dumps(response) + '\n')
+        stdout.flush()
+
 def main():
     parser = argparse.ArgumentParser(description="Process bank statements.")
     subparsers = parser.add_subparsers(dest='command', help='Command to run')
@@ -95,22 +606,110 @@ def main():
     # Process Command
     proc_parser = subparsers.add_parser('process', help='Process files')
     proc_parser.add_argument('files', nargs='+', help="List of file paths")
+    proc_parser.add_argument('--jobs', '-j', type=int, default=1,
+                             help="Number of worker processes (default 1, 0 = all CPUs)")
+    proc_output = proc_parser.add_mutually_exclusive_group()
+    proc_output.add_argument('--ndjson', action='store_true',
+                             help="Stream one JSON line per file as it completes")
+    proc_output.add_argument('--columnar', action='store_true',
+                             help="Stream binary columnar frames (see exporters/columnar.py)")
+    proc_parser.add_argument('--chunk-size', type=int, default=0,
+                             help="With --ndjson, emit transactions in chunks of this many rows")
+    proc_parser.add_argument('--no-cache', action='store_true',
+                             help="Always re-parse files instead of using cached results")
+    proc_parser.add_argument('--cache-dir',
+                             help="Result cache directory (default: $CACHE_DIR or user cache)")
+    proc_parser.add_argument('--dedupe', choices=['flag', 'drop'],
+                             help="Flag or drop transactions already seen in an earlier file")
+    proc_parser.add_argument('--history', action='store_true',
+                             help="Also dedupe against (and record into) the history index "
+                                  "in the cache directory; implies --dedupe flag")
+    proc_parser.add_argument('--merge', action='store_true',
+                             help="Merge all files into one date-ordered transaction list "
+                                  "(one account)")
+    proc_parser.add_argument('--export', metavar='FORMAT',
+                             help="Export the merged transactions in this format (e.g. tally-xml); "
+                                  "implies --merge")
+    proc_parser.add_argument('--allow-partial', action='store_true',
+                             help="With --merge/--export, use the files that parsed even if "
+                                  "others failed (otherwise exit with status 1)")
+    proc_parser.add_argument('--output', metavar='PATH',
+                             help="With --export, write the exported document to this file")
+    proc_parser.add_argument('--stream', action='store_true',
+                             help="Parse CSV and .xlsx files in chunks of --chunk-size rows "
+                                  f"(default {STREAM_CHUNK_SIZE}) with bounded memory; needs "
+                                  "--ndjson, or --export with --output (files are exported in "
+                                  "input order)")
     
     # Export Command
     exp_parser = subparsers.add_parser('export', help='Export transactions')
     exp_parser.add_argument('--format', required=True, help="Export format (e.g. tally-xml)")
+    exp_parser.add_argument('--input-format', choices=['json', 'columnar'], default='json',
+                            help="Encoding of the transactions on stdin (default json)")
+    
+    # Serve Command
+    subparsers.add_parser('serve', help='Run a persistent JSON-RPC worker on stdin/stdout')
     
     args = parser.parse_args()
     
     if args.command == 'process':
-        results = []
-        for file_path in args.files:
-            result = process_file(file_path)
-            results.append(result)
-        print(json.dumps(results, indent=2))
+        cache_dir = None if args.no_cache else (args.cache_dir or default_cache_dir())
+        history_dir = (args.cache_dir or default_cache_dir()) if args.history else None
+        dedupe = args.dedupe or ('flag' if history_dir else None)
+        if args.stream:
+            if args.export and args.output:
+                print(json.dumps(stream_export(args.files, args.export, args.output,
+                                               args.chunk_size or STREAM_CHUNK_SIZE)))
+            elif args.ndjson and not args.export:
+                write_ndjson(args.files, chunk_size=args.chunk_size, stream=True)
+            else:
+                proc_parser.error("--stream needs --ndjson, or --export with --output")
+        elif args.merge or args.export:
+            if args.ndjson:
+                proc_parser.error("--merge/--export cannot be combined with --ndjson")
+            results = process_files(args.files, args.jobs, cache_dir, dedupe, history_dir)
+            merged = merge_results(results)
+            # A failed file would silently leave a gap in the account's history
+            partial = bool(merged['errors']) and not args.allow_partial
+            if args.export and partial:
+                print(json.dumps({
+                    'success': False,
+                    'message': f"{len(merged['errors'])} of {len(results)} files failed; "
+                               "pass --allow-partial to export the rest",
+                    'errors': merged['errors'],
+                }))
+            elif args.export:
+                exported = export_transactions(merged['transactions'], args.export)
+                if args.output and exported['success']:
+                    with open(args.output, 'w', encoding='utf-8') as out:
+                        out.write(exported.pop('content'))
+                    exported['output'] = args.output
+                exported['errors'] = merged['errors']
+                print(json.dumps(exported))
+            elif args.columnar:
+                from exporters.columnar import encode_records
+                
+                records = merged.pop('transactions')
+                sys.stdout.buffer.write(encode_records(records, {'index': 0, **merged}))
+                sys.stdout.buffer.flush()
+            else:
+                print(json.dumps(merged, indent=2))
+            if partial:
+                sys.exit(1)
+        elif args.ndjson:
+            write_ndjson(args.files, args.jobs, args.chunk_size, cache_dir,
+                         dedupe=dedupe, history_dir=history_dir)
+        elif args.columnar:
+            write_columnar(args.files, args.jobs, cache_dir, dedupe=dedupe, history_dir=history_dir)
+        else:
+            results = process_files(args.files, args.jobs, cache_dir, dedupe, history_dir)
+            print(json.dumps(results, indent=2))
         
     elif args.command == 'export':
-        handle_export(args.format)
+        handle_export(args.format, args.input_format)
+        
+    elif args.command == 'serve':
+        serve()
         
     else:
         # Default behavior for backward compatibility or error
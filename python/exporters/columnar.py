@@ -0,0 +1,246 @@
+"""Columnar binary interchange format for transactions.
+
+Used between `cli.py process --columnar` and
+`cli.py export --input-format columnar` so large statements travel as typed
+arrays instead of one JSON object per row. Only the standard library is
+required on either side.
+
+Frame layout (all integers little-endian)::
+
+    b'LDGC' | version: u8 | 3 pad bytes | header_len: u32 | body_len: u64
+    header: UTF-8 JSON {"meta": {...}, "rows": n, "columns": [...]}
+    body:   column buffers, each described in the header by name, type and
+            (offset, size) pairs relative to the start of the body
+
+Column types:
+    timestamp  int64 microseconds since 1970-01-01 (naive), INT64_MIN = null
+    float64    IEEE doubles
+    string     int64 offsets (rows + 1) into a UTF-8 data buffer, plus a
+               uint8 validity buffer (0 = null)
+
+A stream is any number of frames back to back.
+"""
+
+import json
+import struct
+import sys
+from array import array
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from adapters.transaction import Transaction
+
+MAGIC = b'LDGC'
+VERSION = 1
+NULL_TIMESTAMP = -(2 ** 63)
+
+_PREFIX = struct.Struct('<4sB3xIQ')
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+# Column name -> type, in frame order
+TRANSACTION_SCHEMA: List[Tuple[str, str]] = [
+    ('date', 'timestamp'),
+    ('description', 'string'),
+    ('debit', 'float64'),
+    ('credit', 'float64'),
+    ('balance', 'float64'),
+    ('reference_no', 'string'),
+    ('value_date', 'timestamp'),
+]
+
+
+def _le_bytes(values: array) -> bytes:
+    """Serialize an array in little-endian byte order."""
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_le_bytes(typecode: str, data: bytes) -> array:
+    """Deserialize a little-endian buffer into an array."""
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+def _to_epoch_us(value: Any) -> int:
+    """Convert a datetime / ISO string / None to epoch microseconds."""
+    if value is None or value == '':
+        return NULL_TIMESTAMP
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def _from_epoch_us(value: int) -> Optional[datetime]:
+    """Convert epoch microseconds back to a naive datetime."""
+    if value == NULL_TIMESTAMP:
+        return None
+    return _EPOCH + timedelta(microseconds=value)
+
+
+def _encode_column(kind: str, values: Sequence[Any]) -> List[bytes]:
+    """Encode one column into its buffers."""
+    if kind == 'timestamp':
+        # Statements repeat the same few hundred dates; convert each once
+        memo: Dict[Any, int] = {}
+        out = array('q')
+        for v in values:
+            epoch = memo.get(v)
+            if epoch is None:
+                epoch = memo[v] = _to_epoch_us(v)
+            out.append(epoch)
+        return [_le_bytes(out)]
+    if kind == 'float64':
+        return [_le_bytes(array('d', (float(v or 0) for v in values)))]
+    if kind == 'string':
+        offsets = array('q', [0])
+        validity = array('B')
+        chunks = []
+        position = 0
+        for value in values:
+            if value is None:
+                validity.append(0)
+            else:
+                encoded = str(value).encode('utf-8')
+                chunks.append(encoded)
+                position += len(encoded)
+                validity.append(1)
+            offsets.append(position)
+        return [_le_bytes(offsets), b''.join(chunks), validity.tobytes()]
+    raise ValueError(f"Unknown column type: {kind}")
+
+
+def _decode_column(kind: str, buffers: List[bytes]) -> List[Any]:
+    """Decode one column's buffers into a Python list."""
+    if kind == 'timestamp':
+        memo: Dict[int, Optional[datetime]] = {}
+        out = []
+        for v in _from_le_bytes('q', buffers[0]):
+            if v not in memo:
+                memo[v] = _from_epoch_us(v)
+            out.append(memo[v])
+        return out
+    if kind == 'float64':
+        return _from_le_bytes('d', buffers[0]).tolist()
+    if kind == 'string':
+        offsets = _from_le_bytes('q', buffers[0]).tolist()
+        data = buffers[1]
+        validity = buffers[2]
+        # Byte offsets equal character offsets for ASCII, so decode once
+        text: Any = data.decode('ascii') if data.isascii() else None
+        if text is None:
+            return [
+                data[offsets[i]:offsets[i + 1]].decode('utf-8') if validity[i] else None
+                for i in range(len(validity))
+            ]
+        return [
+            text[start:end] if valid else None
+            for start, end, valid in zip(offsets, offsets[1:], validity)
+        ]
+    raise ValueError(f"Unknown column type: {kind}")
+
+
+def encode_frame(columns: Dict[str, Sequence[Any]], rows: int,
+                 meta: Optional[Dict[str, Any]] = None,
+                 schema: List[Tuple[str, str]] = TRANSACTION_SCHEMA) -> bytes:
+    """
+    Encode column value sequences into one frame.
+
+    Args:
+        columns: Column name -> sequence of values (length rows)
+        rows: Number of rows
+        meta: Optional JSON-serializable metadata carried in the header
+        schema: Column (name, type) pairs to write
+
+    Returns:
+        Encoded frame bytes
+    """
+    header_cols = []
+    body = []
+    offset = 0
+    for name, kind in schema:
+        buffers = _encode_column(kind, columns[name])
+        spans = []
+        for buf in buffers:
+            spans.append([offset, len(buf)])
+            body.append(buf)
+            offset += len(buf)
+        header_cols.append({'name': name, 'type': kind, 'buffers': spans})
+
+    header = json.dumps(
+        {'meta': meta or {}, 'rows': rows, 'columns': header_cols},
+        separators=(',', ':')
+    ).encode('utf-8')
+    return _PREFIX.pack(MAGIC, VERSION, len(header), offset) + header + b''.join(body)
+
+
+def iter_frames(data: bytes) -> Iterator[Tuple[Dict[str, Any], Dict[str, List[Any]]]]:
+    """
+    Decode a stream of frames.
+
+    Yields:
+        (meta, columns) per frame, columns mapping name -> list of values
+
+    Raises:
+        ValueError: If the data is not a valid columnar stream
+    """
+    view = memoryview(data)
+    pos = 0
+    while pos < len(view):
+        if len(view) - pos < _PREFIX.size:
+            raise ValueError("Truncated columnar frame")
+        magic, version, header_len, body_len = _PREFIX.unpack_from(view, pos)
+        if magic != MAGIC:
+            raise ValueError("Not a columnar frame")
+        if version != VERSION:
+            raise ValueError(f"Unsupported columnar version: {version}")
+        pos += _PREFIX.size
+
+        header = json.loads(bytes(view[pos:pos + header_len]))
+        pos += header_len
+        body = view[pos:pos + body_len]
+        if len(body) != body_len:
+            raise ValueError("Truncated columnar frame")
+        pos += body_len
+
+        columns = {}
+        for col in header['columns']:
+            buffers = [bytes(body[start:start + size]) for start, size in col['buffers']]
+            columns[col['name']] = _decode_column(col['type'], buffers)
+        yield header['meta'], columns
+
+
+def encode_records(records: List[Dict[str, Any]], meta: Optional[Dict[str, Any]] = None) -> bytes:
+    """Encode transaction dicts (as produced by Transaction.to_dict)."""
+    columns = {name: [r.get(name) for r in records] for name, _ in TRANSACTION_SCHEMA}
+    return encode_frame(columns, len(records), meta)
+
+
+def encode_transactions(transactions: List[Transaction],
+                        meta: Optional[Dict[str, Any]] = None) -> bytes:
+    """Encode Transaction objects into one frame."""
+    columns = {name: [getattr(t, name) for t in transactions] for name, _ in TRANSACTION_SCHEMA}
+    return encode_frame(columns, len(transactions), meta)
+
+
+def columns_to_transactions(columns: Dict[str, List[Any]]) -> List[Transaction]:
+    """Build Transaction objects from decoded transaction columns."""
+    descriptions = [d or '' for d in columns['description']]
+    # Positional construction, in Transaction field order
+    return list(map(
+        Transaction, columns['date'], descriptions, columns['debit'], columns['credit'],
+        columns['balance'], columns['reference_no'], columns['value_date']
+    ))
+
+
+def decode_transactions(data: bytes) -> List[Transaction]:
+    """Decode every frame in a stream into one list of Transactions."""
+    transactions: List[Transaction] = []
+    for _, columns in iter_frames(data):
+        transactions.extend(columns_to_transactions(columns))
+    return transactions
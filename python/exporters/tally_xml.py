@@ -2,13 +2,13 @@
 
 import xml.etree.ElementTree as ET
 from datetime import datetime
-from typing import List, Optional
-from adapters.base import Transaction
+from typing import Iterable, Iterator, List, Optional, TextIO
+from adapters.transaction import Transaction
 
 class TallyXMLExporter:
     """Generates Tally Import XML from Transactions."""
     
-    def __init__(self, transactions: List[Transaction]):
+    def __init__(self, transactions: Iterable[Transaction]):
         self.transactions = transactions
         
     def generate_xml(self) -> str:
@@ -43,6 +43,30 @@ class TallyXMLExporter:
         # Using encoding='unicode' to return string
         return ET.tostring(envelope, encoding='unicode', method='xml')
         
+    def iter_xml(self) -> Iterator[str]:
+        """
+        Generate the same document as generate_xml, one voucher at a time.
+        
+        Only the current voucher is built in memory, so transactions may be
+        a lazy stream (e.g. from BankAdapter.process_chunks).
+        """
+        yield "<ENVELOPE><HEADER><TALLYREQUEST>Import Data</TALLYREQUEST></HEADER><BODY><IMPORTDATA>"
+        opened = False
+        for txn in self.transactions:
+            if not opened:
+                yield "<REQUESTDATA>"
+                opened = True
+            scratch = ET.Element("REQUESTDATA")
+            self._create_voucher_element(scratch, txn)
+            yield ET.tostring(scratch[0], encoding='unicode', method='xml')
+        yield "</REQUESTDATA>" if opened else "<REQUESTDATA />"
+        yield "</IMPORTDATA></BODY></ENVELOPE>"
+    
+    def write(self, stream: TextIO) -> None:
+        """Write the XML document to a text stream incrementally."""
+        for piece in self.iter_xml():
+            stream.write(piece)
+        
     def _create_voucher_element(self, parent: ET.Element, txn: Transaction):
         """Create VOUCHER element for a transaction."""
         tally_msg = ET.SubElement(parent, "TALLYMESSAGE", {"xmlns:UDF": "TallyUDF"})
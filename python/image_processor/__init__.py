@@ -1,5 +1,12 @@
 """Image Processor package for bank statement OCR."""
 
-from .ocr import OCRProcessor
+from lazy_exports import attach
+
+# Submodules load on first attribute access; see lazy_exports.
+_LAZY_ATTRS = {
+    'OCRProcessor': '.ocr',
+}
 
 __all__ = ['OCRProcessor']
+
+__getattr__, __dir__ = attach(__name__, _LAZY_ATTRS, globals())
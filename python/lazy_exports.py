@@ -0,0 +1,35 @@
+"""Lazy package exports (PEP 562).
+
+Packages list their public names in ``_LAZY_ATTRS`` and build their module
+``__getattr__``/``__dir__`` with attach(), so importing a package does not
+import its submodules (and heavy dependencies such as pandas) up front.
+"""
+
+import importlib
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def attach(package: str, lazy_attrs: Dict[str, str],
+           namespace: Dict[str, Any]) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Build a package's module ``__getattr__`` and ``__dir__``.
+
+    Args:
+        package: The package's ``__name__``
+        lazy_attrs: Public name -> relative submodule defining it
+        namespace: The package's ``globals()``; resolved names are cached there
+
+    Returns:
+        (__getattr__, __dir__) to assign at package level
+    """
+    def __getattr__(name: str) -> Any:
+        if name in lazy_attrs:
+            value = getattr(importlib.import_module(lazy_attrs[name], package), name)
+            namespace[name] = value
+            return value
+        raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+    def __dir__() -> List[str]:
+        return sorted(list(namespace) + list(lazy_attrs))
+
+    return __getattr__, __dir__
@@ -1,7 +1,22 @@
 """Parsers package for handling different file formats."""
 
-from .csv_parser import CSVParser
-from .excel_parser import ExcelParser
-from .bank_detector import BankDetector
+from lazy_exports import attach
 
-__all__ = ['CSVParser', 'ExcelParser', 'BankDetector']
+# Submodules load on first attribute access; see lazy_exports.
+_LAZY_ATTRS = {
+    'CSVParser': '.csv_parser',
+    'ExcelParser': '.excel_parser',
+    'BankDetector': '.bank_detector',
+    'BankMatch': '.bank_detector',
+    'ColumnDetector': '.column_detector',
+    'ColumnMapping': '.column_detector',
+    'HeaderLocator': '.header_locator',
+    'HeaderLocation': '.header_locator',
+}
+
+__all__ = [
+    'CSVParser', 'ExcelParser', 'BankDetector', 'BankMatch', 'ColumnDetector', 'ColumnMapping',
+    'HeaderLocator', 'HeaderLocation',
+]
+
+__getattr__, __dir__ = attach(__name__, _LAZY_ATTRS, globals())
@@ -0,0 +1,139 @@
+"""Optional pyarrow CSV engine for CSVParser.
+
+pyarrow's reader parses on several threads and, given a schema, skips type
+inference entirely. The schema comes from the header row: date and amount
+columns stay strings (the adapters parse them with an inferred date format
+and the fixed-point paise parser), description and reference columns are
+dictionary-encoded (statements repeat the same few hundred narrations), and
+anything else is left to pyarrow. The C engine reads the same columns as
+text (see text_columns), so both engines hand the adapters identical values.
+
+pyarrow is not a hard dependency; callers check available() and fall back
+to pandas' C engine. The C engine is also the fallback for files pyarrow
+rejects: it pads rows with fewer fields than the header (a "Total,,500.00"
+footer under a five-column table), where pyarrow raises ArrowInvalid, so
+read_csv returns None for those.
+"""
+
+import csv
+import io
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from .column_detector import ColumnDetector
+
+_STRING_FIELDS = ('date', 'value_date', 'debit', 'credit', 'amount', 'balance')
+_DICTIONARY_FIELDS = ('description', 'reference', 'indicator')
+
+_pyarrow: Any = None
+
+
+def _modules() -> Optional[Any]:
+    """Import pyarrow.csv on first use; None if pyarrow is not installed."""
+    global _pyarrow
+    if _pyarrow is None:
+        try:
+            import pyarrow
+            import pyarrow.csv
+            _pyarrow = pyarrow
+        except ImportError:
+            _pyarrow = False
+    return _pyarrow or None
+
+
+def available() -> bool:
+    """Whether the pyarrow engine can be used."""
+    return _modules() is not None
+
+
+def header_row(prefix: str, delimiter: str, row: int = 0) -> List[str]:
+    """
+    Read the header labels on a line of the file prefix.
+
+    Labels are returned unstripped, as both readers name the columns, so a
+    padded " Debit " still matches its frame column.
+    """
+    lines = prefix.splitlines()
+    if row >= len(lines):
+        return []
+    return next(csv.reader(io.StringIO(lines[row]), delimiter=delimiter), [])
+
+
+def _fields(headers: List[str], layout: Any = None) -> Dict[str, str]:
+    """Column label -> standard field name for the detected columns."""
+    if layout is not None:
+        return {headers[position]: name for name, position in layout.compile(headers).columns}
+    return {label: name for name, label in ColumnDetector.detect(headers).columns.items()}
+
+
+def text_columns(headers: List[str], layout: Any = None) -> List[str]:
+    """
+    Labels of the columns read as text by either engine.
+
+    The C engine reads these with ``dtype=str``; otherwise it would turn a
+    reference such as 12345 into the float 12345.0 where pyarrow keeps
+    '12345'.
+
+    Args:
+        headers: Header labels as they appear in the file (see header_row)
+        layout: Optional BankLayout (see column_schema)
+    """
+    return [label for label, name in _fields(headers, layout).items()
+            if name in _STRING_FIELDS or name in _DICTIONARY_FIELDS]
+
+
+def column_schema(headers: List[str], layout: Any = None) -> Dict[str, Any]:
+    """
+    Build pyarrow column types for a header row.
+
+    Args:
+        headers: Header labels as they appear in the file (see header_row)
+        layout: Detected bank's BankLayout; its compiled plan names the
+                columns. Without one, ColumnDetector does.
+
+    Returns:
+        Column label -> pyarrow DataType for the detected fields
+    """
+    pa = _modules()
+    schema = {}
+    for label, name in _fields(headers, layout).items():
+        if name in _STRING_FIELDS:
+            schema[label] = pa.string()
+        elif name in _DICTIONARY_FIELDS:
+            schema[label] = pa.dictionary(pa.int32(), pa.string())
+    return schema
+
+
+def read_csv(path: Path, delimiter: str, headers: List[str], skip_rows: int = 0,
+             layout: Any = None) -> Optional[pd.DataFrame]:
+    """
+    Read a CSV file with pyarrow's multithreaded reader.
+
+    Args:
+        path: CSV file
+        delimiter: Field delimiter
+        headers: Header labels (see header_row), used for the schema
+        skip_rows: Preamble lines above the header
+        layout: Optional BankLayout for the schema (see column_schema)
+
+    Returns:
+        DataFrame, with blank cells as missing values as with the C engine;
+        None if pyarrow rejects the rows (e.g. ragged footer lines)
+    """
+    pa = _modules()
+    try:
+        table = pa.csv.read_csv(
+            str(path),
+            read_options=pa.csv.ReadOptions(use_threads=True, encoding='utf8',
+                                            skip_rows=skip_rows),
+            parse_options=pa.csv.ParseOptions(delimiter=delimiter),
+            convert_options=pa.csv.ConvertOptions(
+                column_types=column_schema(headers, layout),
+                strings_can_be_null=True,
+            ),
+        )
+    except pa.lib.ArrowInvalid:
+        return None
+    return table.to_pandas()
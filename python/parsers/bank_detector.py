@@ -1,12 +1,26 @@
 """Bank Detector Module for identifying banks from statement text."""
 
-from typing import Optional, Dict, List
+from dataclasses import dataclass, field
+from typing import Optional, Dict, List, Tuple
+import bisect
 import re
 
 
+@dataclass
+class BankMatch:
+    """One candidate bank with the evidence found for it."""
+    bank: str
+    score: int
+    confidence: float
+    # Signatures seen in the text, in order of first appearance
+    signatures: List[str] = field(default_factory=list)
+    # Offset of the first signature, used to break score ties
+    position: int = 0
+
+
 class BankDetector:
     """Detects bank name from statement content."""
-    
+
     # Bank signatures: keywords and regex patterns
     SIGNATURES = {
         'HDFC': {
@@ -50,44 +64,133 @@ class BankDetector:
             'patterns': [r'IndusInd\s*Bank', r'www\.indusind\.com']
         }
     }
-    
+
+    # Leading characters scanned when detecting from a file preamble
+    PROBE_CHARS = 16384
+
+    KEYWORD_WEIGHT = 1
+    PATTERN_WEIGHT = 2  # Higher weight for regex/exact patterns
+
+    # Per scan ('patterns', 'keywords'): (bank, signature, weight, compiled
+    # regex) in alternation order, and the alternation itself
+    _signatures: Dict[str, List[Tuple[str, str, int, 're.Pattern[str]']]] = {}
+    _compiled: Dict[str, 're.Pattern[str]'] = {}
+
     @classmethod
-    def detect(cls, text: str) -> Optional[str]:
+    def _matchers(cls) -> Tuple['re.Pattern[str]', 're.Pattern[str]']:
+        """
+        Compile the patterns and the keywords into one alternation each, once.
+
+        Neither alternation has groups, so re can skip ahead on the possible
+        first characters and each scan runs at C speed; the few matches are
+        attributed to a signature afterwards. Patterns ignore case and run
+        over lowercased text. Keywords match case as written ("BOB" is not
+        "Bob", "kotak" is not "Kotak"), are tried longest first and must not
+        touch another letter on either side ("BOB" is not in "KEBOB" or
+        "BOBBY").
+        """
+        if not cls._compiled:
+            patterns = [
+                (bank, pattern, cls.PATTERN_WEIGHT, pattern.lower())
+                for bank, sig in cls.SIGNATURES.items() for pattern in sig['patterns']
+            ]
+            keywords = []
+            unique = {(k, bank) for bank, sig in cls.SIGNATURES.items() for k in sig['keywords']}
+            for keyword, bank in sorted(unique, key=lambda k: (-len(k[0]), k)):
+                # The leading (?<![A-Za-z]) is checked after the first letter,
+                # as a two-character lookbehind: in front of the keyword it
+                # would run at every position and make the scan ~25x slower
+                regex = (re.escape(keyword[0]) + '(?<![A-Za-z].)'
+                         + re.escape(keyword[1:]) + '(?![A-Za-z])')
+                keywords.append((bank, keyword, cls.KEYWORD_WEIGHT, regex))
+
+            for kind, signatures in (('patterns', patterns), ('keywords', keywords)):
+                cls._signatures[kind] = [
+                    (bank, signature, weight, re.compile(regex))
+                    for bank, signature, weight, regex in signatures
+                ]
+                cls._compiled[kind] = re.compile('|'.join(regex for *_, regex in signatures))
+        return cls._compiled['patterns'], cls._compiled['keywords']
+
+    @classmethod
+    def _signature_for(cls, kind: str, matched: str) -> Tuple[str, str, int]:
+        """The first signature of a scan, in alternation order, that produced a match."""
+        for bank, signature, weight, regex in cls._signatures[kind]:
+            if regex.fullmatch(matched):
+                return bank, signature, weight
+        raise LookupError(matched)
+
+    @classmethod
+    def rank(cls, text: str, max_chars: Optional[int] = None) -> List[BankMatch]:
+        """
+        Score every bank whose signatures appear in the text.
+
+        Patterns ignore case; keywords do not. Each distinct signature counts
+        once: patterns score PATTERN_WEIGHT, keywords KEYWORD_WEIGHT, and a
+        keyword overlapping a pattern match adds nothing. Ties go to the bank
+        mentioned first, which on a statement is usually the issuer in the
+        letterhead.
+
+        Args:
+            text: Extracted text from bank statement
+            max_chars: Only scan this many leading characters (the bank
+                       name is almost always on the first page)
+
+        Returns:
+            BankMatch candidates, best first; empty if nothing matched
+        """
+        if not text:
+            return []
+        if max_chars is not None:
+            text = text[:max_chars]
+
+        patterns, keywords = cls._matchers()
+        pattern_hits = [(m.start(), m.end(), 'patterns', m.group())
+                        for m in patterns.finditer(text.lower())]
+        starts = [start for start, *_ in pattern_hits]
+        hits = list(pattern_hits)
+        for m in keywords.finditer(text):
+            # Pattern matches do not overlap, so only the neighbours can
+            i = bisect.bisect_right(starts, m.start())
+            if (i and pattern_hits[i - 1][1] > m.start()) or \
+                    (i < len(starts) and starts[i] < m.end()):
+                continue
+            hits.append((m.start(), m.end(), 'keywords', m.group()))
+        hits.sort()
+
+        found: Dict[str, BankMatch] = {}
+        seen = set()
+        for start, _, kind, matched in hits:
+            bank, signature, weight = cls._signature_for(kind, matched)
+            if signature in seen:
+                continue
+            seen.add(signature)
+            candidate = found.get(bank)
+            if candidate is None:
+                candidate = found[bank] = BankMatch(bank, 0, 0.0, position=start)
+            candidate.score += weight
+            candidate.signatures.append(signature)
+
+        total = sum(c.score for c in found.values())
+        for candidate in found.values():
+            candidate.confidence = round(candidate.score / total, 3)
+        return sorted(found.values(), key=lambda c: (-c.score, c.position))
+
+    @classmethod
+    def detect(cls, text: str, max_chars: Optional[int] = None) -> Optional[str]:
         """
         Detect bank from text content using keywords and patterns.
-        
+
         Args:
             text: Extracted text from bank statement
-            
+            max_chars: Only scan this many leading characters
+
         Returns:
             Detected bank code (e.g., 'SBI', 'HDFC') or None
         """
-        if not text:
-            return None
-            
-        scores: Dict[str, int] = {bank: 0 for bank in cls.SIGNATURES}
-        
-        # Check keywords (fast)
-        for bank, sig in cls.SIGNATURES.items():
-            for keyword in sig['keywords']:
-                if keyword in text:
-                    scores[bank] += 1
-        
-        # Check regex patterns (if keywords aren't decisive or robust)
-        for bank, sig in cls.SIGNATURES.items():
-            for pattern in sig['patterns']:
-                if re.search(pattern, text, re.IGNORECASE):
-                    scores[bank] += 2  # Higher weight for regex/exact patterns
-        
-        # Get bank with highest score
-        best_match = max(scores.items(), key=lambda x: x[1])
-        
-        # Threshold: must have at least some match
-        if best_match[1] > 0:
-            return best_match[0]
-            
-        return None
-    
+        candidates = cls.rank(text, max_chars)
+        return candidates[0].bank if candidates else None
+
     @classmethod
     def get_supported_banks(cls) -> List[str]:
         """Get list of supported bank codes."""
@@ -0,0 +1,150 @@
+"""Column Detector Module for mapping statement headers to standard fields."""
+
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import re
+
+
+@dataclass
+class ColumnMapping:
+    """Result of header detection."""
+    columns: Dict[str, Any] = field(default_factory=dict)
+    confidence: Dict[str, float] = field(default_factory=dict)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """Get the source column for a field."""
+        return self.columns.get(name, default)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+
+class ColumnDetector:
+    """Maps raw header labels to standard transaction fields."""
+
+    # Field -> keywords, most specific first. Earlier keywords score higher.
+    KEYWORDS = {
+        'date': ['date', 'txn date', 'transaction date', 'tran date', 'posting date', 'value date'],
+        'description': ['description', 'narration', 'details', 'particulars', 'remarks',
+                        'transaction details', 'transaction remarks'],
+        'debit': ['debit', 'withdrawal', 'withdrawals', 'dr', 'paid', 'amount paid',
+                  'withdrawal amt', 'debit amount'],
+        'credit': ['credit', 'deposit', 'deposits', 'cr', 'received', 'amount received',
+                   'deposit amt', 'credit amount'],
+        'amount': ['amount', 'transaction amount', 'txn amount'],
+        'balance': ['balance', 'closing balance', 'running balance', 'available balance', 'bal'],
+        'reference': ['ref no cheque no', 'ref no', 'reference', 'reference no', 'ref',
+                      'cheque no', 'chq no', 'cheque', 'chq', 'utr'],
+    }
+
+    # Generic fields lose ties against specific ones ("Withdrawal Amount"
+    # is a debit column, not a signed amount column)
+    FIELD_WEIGHTS = {'amount': 0.9}
+
+    EXACT_SCORE = 1.0
+    CONTAINS_SCORE = 0.8
+    FUZZY_SCORE = 0.6
+    FUZZY_THRESHOLD = 0.85
+    RANK_PENALTY = 0.01
+
+    _NON_WORD = re.compile(r'[^0-9a-z]+')
+    _compiled: Optional[List[Tuple[str, int, str, frozenset]]] = None
+
+    @classmethod
+    def normalize(cls, label: Any) -> str:
+        """Lowercase a header and collapse punctuation/whitespace to single spaces."""
+        return cls._NON_WORD.sub(' ', str(label).lower()).strip()
+
+    @classmethod
+    def _keyword_table(cls) -> List[Tuple[str, int, str, frozenset]]:
+        """Compile KEYWORDS into (field, rank, keyword, tokens) once."""
+        if cls._compiled is None:
+            cls._compiled = [
+                (name, rank, cls.normalize(keyword), frozenset(cls.normalize(keyword).split()))
+                for name, keywords in cls.KEYWORDS.items()
+                for rank, keyword in enumerate(keywords)
+            ]
+        return cls._compiled
+
+    @classmethod
+    def score(cls, header: str, name: str) -> float:
+        """
+        Score how well a normalized header matches a field.
+
+        Args:
+            header: Normalized header label
+            name: Field name
+
+        Returns:
+            Score in [0, 1]; 0 means no match
+        """
+        tokens = frozenset(header.split())
+        best = 0.0
+        for field_name, rank, keyword, keyword_tokens in cls._keyword_table():
+            if field_name != name or not header:
+                continue
+            if header == keyword:
+                value = cls.EXACT_SCORE
+            elif keyword_tokens <= tokens:
+                coverage = len(keyword_tokens) / len(tokens)
+                value = cls.CONTAINS_SCORE + 0.1 * coverage
+            else:
+                ratio = SequenceMatcher(None, header, keyword).ratio()
+                if ratio < cls.FUZZY_THRESHOLD:
+                    continue
+                value = cls.FUZZY_SCORE * ratio
+            value = (value - cls.RANK_PENALTY * rank) * cls.FIELD_WEIGHTS.get(name, 1.0)
+            best = max(best, value)
+        return best
+
+    @classmethod
+    def detect(cls, columns: Iterable[Any]) -> ColumnMapping:
+        """
+        Map header labels to standard fields.
+
+        Each column is assigned to at most one field, best scores first.
+        Results are memoized by the normalized header signature, so repeat
+        layouts resolve without re-scoring.
+
+        Args:
+            columns: Header labels in table order
+
+        Returns:
+            ColumnMapping with source labels and confidence per field
+        """
+        labels = list(columns)
+        signature = tuple(cls.normalize(label) for label in labels)
+        mapping = ColumnMapping()
+        for name, index, confidence in cls._detect_signature(signature):
+            mapping.columns[name] = labels[index]
+            mapping.confidence[name] = confidence
+        return mapping
+
+    @classmethod
+    @lru_cache(maxsize=512)
+    def _detect_signature(cls, signature: Tuple[str, ...]) -> Tuple[Tuple[str, int, float], ...]:
+        """Assign fields for one header signature: (field, column index, score)."""
+        candidates = []
+        for index, header in enumerate(signature):
+            scores = {name: cls.score(header, name) for name in cls.KEYWORDS}
+            if scores['debit'] > 0 and scores['credit'] > 0:
+                # "Dr/Cr", "Debit/Credit": a side indicator, not an amount column
+                scores['debit'] = scores['credit'] = 0.0
+            candidates.extend((value, index, name) for name, value in scores.items() if value > 0)
+
+        # Highest score first; ties go to the left-most column
+        candidates.sort(key=lambda c: (-c[0], c[1]))
+        assigned: Dict[str, Tuple[int, float]] = {}
+        used = set()
+        for value, index, name in candidates:
+            if name in assigned or index in used:
+                continue
+            assigned[name] = (index, round(min(value, 1.0), 3))
+            used.add(index)
+
+        return tuple(
+            (name, assigned[name][0], assigned[name][1])
+            for name in cls.KEYWORDS if name in assigned
+        )
@@ -1,76 +1,289 @@
 """CSV Parser Module for processing bank statement CSV files."""
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator, Tuple
 from pathlib import Path
 import pandas as pd
 import csv
+import mmap
+
+from . import arrow_csv
+from .column_detector import ColumnDetector
+from .header_locator import HeaderLocation, HeaderLocator
+
+ENGINES = ('c', 'pyarrow', 'auto')
+
+
+class CSVSession:
+    """
+    One read of a CSV file, shared by sniffing, parsing and validation.
+    
+    The header row (below any preamble) and delimiter are found from a
+    memory-mapped prefix and the frame is parsed at most once per delimiter.
+    Everything is dropped and re-read if the file's size or modification
+    time changes.
+    """
+    
+    SNIFF_BYTES = 16384
+    
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._prefix: Optional[str] = None
+        self._delimiter: Optional[str] = None
+        self._header: Optional[HeaderLocation] = None
+        self._frames: Dict[Tuple[str, str], pd.DataFrame] = {}
+        # Whether pyarrow rejected the file and the C engine read it instead
+        self.arrow_rejected = False
+        # Detected bank's layout (see CSVParser.use_layout)
+        self.layout: Any = None
+    
+    def _check(self) -> None:
+        """Forget cached reads if the file changed on disk."""
+        stat = self.path.stat()
+        stamp = (stat.st_size, stat.st_mtime_ns)
+        if stamp != self._stamp:
+            self._stamp = stamp
+            self._prefix = None
+            self._delimiter = None
+            self._header = None
+            self._frames = {}
+            self.arrow_rejected = False
+    
+    def set_layout(self, layout: Any) -> None:
+        """Locate the header with a bank layout; the prefix is kept."""
+        self.layout = layout
+        self._header = None
+        self._delimiter = None
+        self._frames = {}
+    
+    @property
+    def prefix(self) -> str:
+        """The first SNIFF_BYTES of the file, decoded as UTF-8."""
+        self._check()
+        if self._prefix is None:
+            with open(self.path, 'rb') as file:
+                if self._stamp[0] == 0:
+                    data = b''  # mmap cannot map an empty file
+                else:
+                    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        data = mapped[:self.SNIFF_BYTES]
+            # A multi-byte character may be cut at the end of the prefix
+            self._prefix = data.decode('utf-8', errors='ignore')
+        return self._prefix
+    
+    @property
+    def header(self) -> HeaderLocation:
+        """Location of the table header within the prefix (see HeaderLocator)."""
+        self._check()
+        if self._header is None:
+            self._header = HeaderLocator.locate_text(
+                self.prefix, complete=self._stamp[0] <= self.SNIFF_BYTES,
+                fallback=self.layout.is_header if self.layout is not None else None
+            )
+        return self._header
+    
+    @property
+    def delimiter(self) -> str:
+        """
+        The header row's delimiter, or a sniffed one (comma if the sample is
+        inconclusive) when no header was recognized.
+        """
+        self._check()
+        if self._delimiter is None:
+            self._delimiter = self.header.delimiter
+        if self._delimiter is None:
+            try:
+                self._delimiter = csv.Sniffer().sniff(self.prefix).delimiter
+            except Exception:
+                self._delimiter = ','
+        return self._delimiter
+    
+    def frame(self, delimiter: Optional[str] = None, engine: str = 'c') -> pd.DataFrame:
+        """
+        Parse the whole file once per delimiter and engine.
+        
+        Preamble lines above the header are skipped by the reader. The
+        returned frame is shared by every caller of the session and must be
+        treated as read-only.
+        
+        Args:
+            delimiter: Optional delimiter. If None, uses the sniffed one.
+            engine: 'c' (pandas) or 'pyarrow' (see arrow_csv); files pyarrow
+                    rejects, such as ones with ragged footer rows, are read
+                    with the C engine instead
+        
+        Raises:
+            RuntimeError: If the file cannot be parsed
+        """
+        self._check()
+        delimiter = delimiter or self.delimiter
+        header = self.header
+        key = (delimiter, engine)
+        if key not in self._frames:
+            try:
+                df = None
+                headers = arrow_csv.header_row(self.prefix, delimiter, header.row)
+                if engine == 'pyarrow':
+                    df = arrow_csv.read_csv(self.path, delimiter, headers, skip_rows=header.row,
+                                            layout=self.layout)
+                    self.arrow_rejected = df is None
+                if df is None:
+                    df = pd.read_csv(
+                        self.path,
+                        delimiter=delimiter,
+                        skiprows=header.row,
+                        encoding='utf-8',
+                        # Same text columns as the pyarrow schema
+                        dtype=dict.fromkeys(arrow_csv.text_columns(headers, self.layout), str),
+                        parse_dates=False,  # We'll handle date parsing later
+                        low_memory=False
+                    )
+                
+                # Remove completely empty rows and columns (one copy, not two)
+                present = df.notna()
+                df = df.loc[present.any(axis=1), present.any(axis=0)]
+                
+            except Exception as e:
+                raise RuntimeError(f"Error parsing CSV: {str(e)}")
+            self._frames[key] = df
+        return self._frames[key]
 
 
 class CSVParser:
     """Handles parsing and validation of CSV bank statements."""
     
-    def __init__(self, csv_path: str) -> None:
+    def __init__(self, csv_path: str, engine: str = 'c') -> None:
         """
         Initialize CSV parser.
         
         Args:
             csv_path: Path to the CSV file
+            engine: 'c' (pandas C reader), 'pyarrow' (multithreaded, with a
+                    dtype schema from the detected columns) or 'auto'
+                    (pyarrow when installed). pyarrow falls back to 'c' when
+                    the package is unavailable.
         """
         self.csv_path = Path(csv_path)
         
         if not self.csv_path.exists():
             raise FileNotFoundError(f"CSV file not found: {csv_path}")
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown CSV engine: {engine}")
+        
+        self.engine = engine
+        
+        self.session = CSVSession(self.csv_path)
     
     def detect_delimiter(self) -> str:
         """
         Auto-detect CSV delimiter.
         
+        Sniffed once per file from a memory-mapped prefix (see CSVSession).
+        
         Returns:
             Detected delimiter character (comma, semicolon, tab, or pipe)
         """
-        try:
-            with open(self.csv_path, 'r', encoding='utf-8') as file:
-                # Read first few lines
-                sample = file.read(4096)
-                
-                # Use csv.Sniffer to detect delimiter
-                sniffer = csv.Sniffer()
-                dialect = sniffer.sniff(sample)
-                return dialect.delimiter
-                
-        except Exception as e:
-            # Fallback to comma
-            return ','
+        return self.session.delimiter
+    
+    @property
+    def header(self) -> HeaderLocation:
+        """Where the table header starts, found from the first few KB only."""
+        return self.session.header
+    
+    @property
+    def preamble(self) -> str:
+        """Text above the table header (account details, bank name), if any."""
+        return self.session.header.text
+    
+    def probe_text(self) -> str:
+        """
+        Text for early bank detection, from the first few KB only.
+        
+        The preamble and header labels when a header is found, otherwise
+        the first lines of the file. Transaction rows are left out, since
+        their narrations often name other banks.
+        """
+        header = self.session.header
+        if header.found:
+            return '\n'.join(header.preamble + [','.join(header.columns)])
+        return '\n'.join(HeaderLocator.lines(self.session.prefix))
+    
+    def use_layout(self, layout: Any) -> None:
+        """
+        Parse with a detected bank's layout (adapters.layout.BankLayout).
+        
+        The layout's header labels locate a header the generic keywords
+        miss, and with the pyarrow engine its columns set the dtype schema.
+        Call before parse(); cached reads are dropped.
+        
+        Args:
+            layout: BankLayout, or None to go back to generic detection
+        """
+        self.session.set_layout(layout)
+    
+    @property
+    def engine_used(self) -> str:
+        """The engine parse() uses ('c' or 'pyarrow'); final once parse() has run."""
+        if (self.engine in ('pyarrow', 'auto') and arrow_csv.available()
+                and not self.session.arrow_rejected):
+            return 'pyarrow'
+        return 'c'
     
     def parse(self, delimiter: Optional[str] = None) -> pd.DataFrame:
         """
         Parse CSV file into DataFrame.
         
+        Reading starts at the header row, below any preamble. The file is
+        read once; later calls (including those made by
+        detect_columns, validate_structure and get_info) reuse the frame,
+        so treat it as read-only.
+        
+        With the pyarrow engine, date and amount columns are read as strings
+        and descriptions/references as categoricals (columns come from the
+        bank layout given to use_layout, else from ColumnDetector).
+        
         Args:
             delimiter: Optional delimiter. If None, auto-detects.
             
         Returns:
             pandas DataFrame containing parsed CSV data
         """
-        try:
-            if delimiter is None:
-                delimiter = self.detect_delimiter()
+        return self.session.frame(delimiter, self.engine_used)
+    
+    def parse_chunks(self, chunksize: int = 100_000,
+                     delimiter: Optional[str] = None) -> Iterator[pd.DataFrame]:
+        """
+        Parse CSV file incrementally, at most chunksize rows at a time.
+        
+        Memory stays bounded by one chunk, so multi-year statements can flow
+        through BankAdapter.process_chunks without loading the whole file.
+        Completely empty rows are dropped; unlike parse(), empty columns are
+        kept so that every chunk has the same columns.
+        
+        Args:
+            chunksize: Maximum rows per chunk
+            delimiter: Optional delimiter. If None, auto-detects.
             
-            # Read CSV with pandas
-            df = pd.read_csv(
+        Yields:
+            pandas DataFrames, in file order
+        """
+        if delimiter is None:
+            delimiter = self.detect_delimiter()
+        
+        try:
+            with pd.read_csv(
                 self.csv_path,
                 delimiter=delimiter,
+                skiprows=self.session.header.row,
                 encoding='utf-8',
-                parse_dates=False,  # We'll handle date parsing later
-                low_memory=False
-            )
-            
-            # Remove completely empty rows and columns
-            df = df.dropna(how='all')
-            df = df.dropna(axis=1, how='all')
-            
-            return df
-            
+                parse_dates=False,
+                chunksize=chunksize
+            ) as reader:
+                for chunk in reader:
+                    chunk = chunk[chunk.notna().any(axis=1)]
+                    if len(chunk):
+                        yield chunk
+                        
         except Exception as e:
             raise RuntimeError(f"Error parsing CSV: {str(e)}")
     
@@ -119,60 +332,7 @@ class CSVParser:
         if df is None:
             df = self.parse()
         
-        column_map = {}
-        
-        # Common date column keywords
-        date_keywords = ['date', 'txn date', 'transaction date', 'value date', 'posting date']
-        # Common description keywords
-        desc_keywords = ['description', 'narration', 'details', 'particulars', 'remarks']
-        # Common debit/credit keywords
-        debit_keywords = ['debit', 'withdrawal', 'dr', 'paid', 'amount paid']
-        credit_keywords = ['credit', 'deposit', 'cr', 'received', 'amount received']
-        # Common amount keywords (when single amount column)
-        amount_keywords = ['amount', 'transaction amount', 'txn amount']
-        # Common balance keywords
-        balance_keywords = ['balance', 'closing balance', 'running balance']
-        
-        # Normalize column names for matching
-        normalized_cols = {col.lower().strip(): col for col in df.columns}
-        
-        # Detect date column
-        for keyword in date_keywords:
-            if keyword in normalized_cols:
-                column_map['date'] = normalized_cols[keyword]
-                break
-        
-        # Detect description column
-        for keyword in desc_keywords:
-            if keyword in normalized_cols:
-                column_map['description'] = normalized_cols[keyword]
-                break
-        
-        # Detect amount columns (debit/credit or single amount)
-        for keyword in debit_keywords:
-            if keyword in normalized_cols:
-                column_map['debit'] = normalized_cols[keyword]
-                break
-        
-        for keyword in credit_keywords:
-            if keyword in normalized_cols:
-                column_map['credit'] = normalized_cols[keyword]
-                break
-        
-        # If no debit/credit, look for single amount column
-        if 'debit' not in column_map and 'credit' not in column_map:
-            for keyword in amount_keywords:
-                if keyword in normalized_cols:
-                    column_map['amount'] = normalized_cols[keyword]
-                    break
-        
-        # Detect balance column
-        for keyword in balance_keywords:
-            if keyword in normalized_cols:
-                column_map['balance'] = normalized_cols[keyword]
-                break
-        
-        return column_map
+        return ColumnDetector.detect(df.columns).columns
     
     def get_info(self) -> Dict[str, Any]:
         """
@@ -182,7 +342,7 @@ class CSVParser:
             Dictionary containing file info
         """
         df = self.parse()
-        column_map = self.detect_columns(df)
+        mapping = ColumnDetector.detect(df.columns)
         
         return {
             'file_path': str(self.csv_path),
@@ -190,6 +350,10 @@ class CSVParser:
             'num_columns': len(df.columns),
             'columns': list(df.columns),
             'detected_delimiter': self.detect_delimiter(),
-            'column_mapping': column_map,
+            'header_row': self.header.row,
+            'preamble': self.preamble,
+            'engine': self.engine_used,
+            'column_mapping': mapping.columns,
+            'column_confidence': mapping.confidence,
             'is_valid': self.validate_structure(df),
         }
@@ -1,25 +1,243 @@
 """Excel Parser Module for processing bank statement Excel files."""
 
-from typing import Optional, List, Dict, Any, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Any, Union, Iterator, Sequence, Tuple
 from pathlib import Path
+import importlib.util
+import itertools
+import os
+import threading
 import pandas as pd
-import openpyxl
+
+from .column_detector import ColumnDetector
+from .header_locator import HeaderLocation, HeaderLocator
+
+
+ENGINES = ('openpyxl', 'calamine', 'auto')
+
+
+def calamine_available() -> bool:
+    """Whether the Rust-backed python-calamine reader is usable.
+
+    pandas only accepts ``engine='calamine'`` from 2.2 on, so an older
+    pandas falls back to openpyxl even with python-calamine installed.
+    """
+    major, minor = (int(part) for part in pd.__version__.split('.')[:2])
+    if (major, minor) < (2, 2):
+        return False
+    return importlib.util.find_spec('python_calamine') is not None
+
+
+def _cell_text(value: Any) -> Optional[str]:
+    """A cell value as read_excel(dtype=str) would give it; None if blank."""
+    if value is None or value == '':
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+
+def _header_labels(cells: Sequence[Optional[str]]) -> List[str]:
+    """Column labels for a header row, named and de-duplicated like pandas."""
+    labels: List[str] = []
+    counts: Dict[str, int] = {}
+    for index, cell in enumerate(cells):
+        label = cell if cell is not None else f"Unnamed: {index}"
+        if label in counts:
+            counts[label] += 1
+            label = f"{label}.{counts[label]}"
+        else:
+            counts[label] = 0
+        labels.append(label)
+    return labels
+
+
+class ExcelSession:
+    """
+    One open workbook shared by sheet listing, header location and parsing.
+    
+    The workbook is opened on first use and kept open; each sheet's header
+    is located and its table parsed at most once. Everything is dropped and
+    re-read if the file's size or modification time changes.
+    
+    Reader handles (openpyxl, calamine) are not thread-safe, so every read
+    through the open workbook holds the session lock; threads sharing a
+    session overlap only the work done on frames already read.
+    """
+    
+    def __init__(self, path: Path, engine: Optional[str] = None) -> None:
+        self.path = path
+        self.engine = engine
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._book: Optional[pd.ExcelFile] = None
+        self._stream_book: Any = None
+        self._heads: Dict[str, List[List[str]]] = {}
+        self._headers: Dict[str, HeaderLocation] = {}
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._lock = threading.RLock()
+        # Detected bank's layout (see ExcelParser.use_layout)
+        self.layout: Any = None
+    
+    def _check(self) -> None:
+        """Forget the open workbook and cached reads if the file changed on disk."""
+        stat = self.path.stat()
+        stamp = (stat.st_size, stat.st_mtime_ns)
+        if stamp != self._stamp:
+            self.close()
+            self._stamp = stamp
+    
+    def close(self) -> None:
+        """Close the workbook and drop cached reads."""
+        if self._book is not None:
+            self._book.close()
+        if self._stream_book is not None:
+            self._stream_book.close()
+        self._book = None
+        self._stream_book = None
+        self._heads = {}
+        self._headers = {}
+        self._frames = {}
+    
+    def set_layout(self, layout: Any) -> None:
+        """Locate headers with a bank layout; the workbook stays open."""
+        self.layout = layout
+        self._headers = {}
+        self._frames = {}
+    
+    @property
+    def book(self) -> pd.ExcelFile:
+        """The open workbook, read with the session's engine."""
+        with self._lock:
+            self._check()
+            if self._book is None:
+                self._book = pd.ExcelFile(self.path, engine=self.engine)
+            return self._book
+    
+    @property
+    def openpyxl_book(self) -> Any:
+        """
+        A read-only openpyxl workbook for streaming rows.
+        
+        This is the session's workbook under the openpyxl engine; other
+        engines cannot stream, so a separate read-only handle is opened.
+        Rows are iterated outside the session lock, so stream from one
+        thread at a time.
+        """
+        book = self.book
+        if book.engine == 'openpyxl':
+            return book.book
+        with self._lock:
+            if self._stream_book is None:
+                import openpyxl
+                self._stream_book = openpyxl.load_workbook(
+                    self.path, read_only=True, data_only=True, keep_links=False
+                )
+            return self._stream_book
+    
+    @property
+    def sheet_names(self) -> List[str]:
+        """Sheet names in workbook order."""
+        with self._lock:
+            return self.book.sheet_names
+    
+    def _read(self, name: str, **kwargs: Any) -> pd.DataFrame:
+        """Read a sheet through the shared workbook, one caller at a time."""
+        with self._lock:
+            return self.book.parse(name, **kwargs)
+    
+    def sheet(self, sheet_name: Union[str, int]) -> str:
+        """Resolve a sheet index to its name."""
+        if isinstance(sheet_name, int):
+            return self.sheet_names[sheet_name]
+        return sheet_name
+    
+    def head(self, sheet_name: Union[str, int]) -> List[List[str]]:
+        """A sheet's first HeaderLocator.MAX_ROWS rows; missing cells are ''."""
+        name = self.sheet(sheet_name)
+        if name not in self._heads:
+            head = self._read(name, header=None, nrows=HeaderLocator.MAX_ROWS, dtype=str)
+            self._heads[name] = head.fillna('').values.tolist()
+        return self._heads[name]
+    
+    def header(self, sheet_name: Union[str, int]) -> HeaderLocation:
+        """Find a sheet's header from its first rows (see head())."""
+        name = self.sheet(sheet_name)
+        if name not in self._headers:
+            self._headers[name] = HeaderLocator.locate(
+                self.head(name),
+                fallback=self.layout.is_header if self.layout is not None else None
+            )
+        return self._headers[name]
+    
+    def frame(self, sheet_name: Union[str, int]) -> pd.DataFrame:
+        """
+        Parse a sheet once, starting at its located header.
+        
+        The returned frame is shared by every caller of the session and must
+        be treated as read-only.
+        """
+        name = self.sheet(sheet_name)
+        if name not in self._frames:
+            df = self._read(
+                name,
+                skiprows=self.header(name).row,
+                parse_dates=False,
+                dtype=str  # Read all as string to preserve formatting
+            )
+            
+            # Remove completely empty rows and columns (one copy, not two)
+            present = df.notna()
+            self._frames[name] = df.loc[present.any(axis=1), present.any(axis=0)]
+        return self._frames[name]
 
 
 class ExcelParser:
     """Handles parsing and validation of Excel bank statements."""
     
-    def __init__(self, excel_path: str) -> None:
+    def __init__(self, excel_path: str, engine: str = 'openpyxl') -> None:
         """
         Initialize Excel parser.
         
         Args:
             excel_path: Path to the Excel file
+            engine: 'openpyxl', 'calamine' (Rust-backed, much faster) or
+                    'auto' (calamine when installed). calamine falls back
+                    to openpyxl when python-calamine is unavailable.
         """
         self.excel_path = Path(excel_path)
         
         if not self.excel_path.exists():
             raise FileNotFoundError(f"Excel file not found: {excel_path}")
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown Excel engine: {engine}")
+        
+        self.engine = engine
+        
+        self.session = ExcelSession(self.excel_path, self.engine_used)
+    
+    @property
+    def engine_used(self) -> str:
+        """
+        The pandas engine parse() actually uses.
+        
+        openpyxl cannot read legacy .xls files; without calamine those go
+        to xlrd, as read_excel would choose by default.
+        """
+        if self.engine in ('calamine', 'auto') and calamine_available():
+            return 'calamine'
+        if self.excel_path.suffix.lower() == '.xls':
+            return 'xlrd'
+        return 'openpyxl'
+    
+    def __enter__(self) -> 'ExcelParser':
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+    
+    def close(self) -> None:
+        """Close the workbook; it is reopened if the parser is used again."""
+        self.session.close()
     
     def get_sheet_names(self) -> List[str]:
         """
@@ -29,15 +247,64 @@ class ExcelParser:
             List of sheet names
         """
         try:
-            with pd.ExcelFile(self.excel_path) as xls:
-                return xls.sheet_names
+            return self.session.sheet_names
         except Exception as e:
             raise RuntimeError(f"Error reading Excel sheets: {str(e)}")
     
+    def locate_header(self, sheet_name: Union[str, int] = 0) -> HeaderLocation:
+        """
+        Find the header row of a sheet without reading the whole table.
+        
+        Args:
+            sheet_name: Sheet name or index (default 0 for first sheet)
+            
+        Returns:
+            HeaderLocation (row 0 if no header was recognized)
+        """
+        try:
+            return self.session.header(sheet_name)
+        except Exception as e:
+            raise RuntimeError(f"Error parsing Excel: {str(e)}")
+    
+    @property
+    def preamble(self) -> str:
+        """Text above the first sheet's table header, if any."""
+        return self.locate_header(0).text
+    
+    def probe_text(self) -> str:
+        """
+        Text for early bank detection, from the first sheet's first rows.
+        
+        The preamble and header labels when a header is found, otherwise
+        every non-blank row scanned.
+        """
+        header = self.locate_header(0)
+        if header.found:
+            return '\n'.join(header.preamble + [','.join(header.columns)])
+        rows = self.session.head(0)
+        return '\n'.join(line for line in (' '.join(c for c in row if c) for row in rows) if line)
+    
+    def use_layout(self, layout: Any) -> None:
+        """
+        Locate headers with a detected bank's layout (adapters.layout.BankLayout).
+        
+        The layout's header labels find a header the generic keywords miss.
+        Call before parse(); parsed sheets are dropped, the workbook is not.
+        
+        Args:
+            layout: BankLayout, or None to go back to generic detection
+        """
+        self.session.set_layout(layout)
+    
     def parse(self, sheet_name: Optional[Union[str, int]] = 0) -> pd.DataFrame:
         """
         Parse Excel sheet into DataFrame.
         
+        The header row is located from the first rows of the sheet and the
+        table is read from there, so preamble rows above it are skipped.
+        The workbook is opened once per parser and each sheet parsed once;
+        later calls reuse the frame, so treat it as read-only.
+        
         Args:
             sheet_name: Sheet name or index (default 0 for first sheet)
             
@@ -45,21 +312,110 @@ class ExcelParser:
             pandas DataFrame containing parsed data
         """
         try:
-            # Read Excel with pandas
-            # openpyxl engine is used for xlsx
-            df = pd.read_excel(
-                self.excel_path,
-                sheet_name=sheet_name,
-                parse_dates=False,
-                dtype=str  # Read all as string to preserve formatting
-            )
+            return self.session.frame(sheet_name)
+        except Exception as e:
+            raise RuntimeError(f"Error parsing Excel: {str(e)}")
+    
+    def transaction_sheets(self) -> List[str]:
+        """
+        Names of the sheets that hold a transaction table, in workbook order.
+        
+        A sheet qualifies when HeaderLocator recognizes a header in its
+        first rows; summary and cover sheets do not.
+        """
+        return [name for name in self.get_sheet_names() if self.locate_header(name).found]
+    
+    def parse_all_sheets(self, max_workers: Optional[int] = None) -> pd.DataFrame:
+        """
+        Parse every transaction sheet and concatenate them in workbook order.
+        
+        Banks often export one sheet per month. Sheets are located and parsed
+        on a thread pool over the shared workbook, whose reads the session
+        serializes (see ExcelSession); columns are aligned by name. If no
+        sheet is recognized, the first sheet is returned as by parse().
+        
+        Args:
+            max_workers: Thread count (defaults to one per sheet, up to the
+                         CPU count)
+            
+        Returns:
+            pandas DataFrame with the rows of all transaction sheets
+        """
+        names = self.get_sheet_names()
+        if len(names) <= 1:
+            return self.parse(0)
+        
+        workers = max_workers or min(len(names), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            headers = list(executor.map(self.locate_header, names))
+            sheets = [name for name, header in zip(names, headers) if header.found]
+            if not sheets:
+                return self.parse(0)
+            frames = list(executor.map(self.parse, sheets))
+        
+        if len(frames) == 1:
+            return frames[0]
+        return pd.concat(frames, ignore_index=True)
+    
+    def parse_chunks(self, chunksize: int = 100_000,
+                     sheet_name: Union[str, int] = 0) -> Iterator[pd.DataFrame]:
+        """
+        Parse an .xlsx sheet incrementally, at most chunksize rows at a time.
+        
+        Rows are streamed from a read-only openpyxl workbook (whatever
+        the parse engine), so memory stays bounded by one chunk instead of the whole sheet and
+        the chunks can flow through BankAdapter.process_chunks. Cells come out as strings,
+        as with parse(). Completely empty rows are dropped; unlike parse(),
+        empty columns are kept so that every chunk has the same columns.
+        
+        Legacy .xls workbooks cannot be streamed; they are parsed whole and
+        yielded as a single chunk.
+        
+        Args:
+            chunksize: Maximum rows per chunk
+            sheet_name: Sheet name or index (default 0 for first sheet)
             
-            # Remove completely empty rows and columns
-            df = df.dropna(how='all')
-            df = df.dropna(axis=1, how='all')
+        Yields:
+            pandas DataFrames, in sheet order
+        """
+        if self.excel_path.suffix.lower() == '.xls':
+            yield self.parse(sheet_name)
+            return
+        
+        header = self.locate_header(sheet_name)
+        
+        try:
+            sheet = self.session.openpyxl_book[self.session.sheet(sheet_name)]
+            # Exporters often write a wrong sheet dimension; read what is there
+            sheet.reset_dimensions()
             
-            return df
+            rows = (
+                [_cell_text(value) for value in row]
+                for row in sheet.iter_rows(values_only=True)
+            )
+            head = list(itertools.islice(rows, HeaderLocator.MAX_ROWS))
+            if not head:
+                return
+            columns = _header_labels(head[header.row])
+            width = len(columns)
+            rows = itertools.chain(head[header.row + 1:], rows)
             
+            start = 0
+            while True:
+                batch = list(itertools.islice(rows, chunksize))
+                if not batch:
+                    break
+                # Rows may be ragged once dimensions are reset
+                batch = [(row + [None] * width)[:width] for row in batch]
+                chunk = pd.DataFrame(
+                    batch, columns=columns, dtype=object,
+                    index=pd.RangeIndex(start, start + len(batch))
+                )
+                start += len(batch)
+                chunk = chunk[chunk.notna().any(axis=1)]
+                if len(chunk):
+                    yield chunk
+                    
         except Exception as e:
             raise RuntimeError(f"Error parsing Excel: {str(e)}")
     
@@ -108,47 +464,7 @@ class ExcelParser:
         if df is None:
             df = self.parse()
         
-        column_map = {}
-        
-        # Reuse keywords from CSV parser (could refactor to shared util)
-        date_keywords = ['date', 'txn date', 'transaction date', 'value date', 'posting date']
-        desc_keywords = ['description', 'narration', 'details', 'particulars', 'remarks']
-        debit_keywords = ['debit', 'withdrawal', 'dr', 'paid', 'amount paid']
-        credit_keywords = ['credit', 'deposit', 'cr', 'received', 'amount received']
-        amount_keywords = ['amount', 'transaction amount', 'txn amount']
-        balance_keywords = ['balance', 'closing balance', 'running balance']
-        
-        # Normalize column names for matching
-        # Convert to string first just in case
-        normalized_cols = {str(col).lower().strip(): col for col in df.columns}
-        
-        # Helper to find column
-        def find_col(keywords: List[str]) -> Optional[str]:
-            for keyword in keywords:
-                if keyword in normalized_cols:
-                    return normalized_cols[keyword]
-            return None
-            
-        col = find_col(date_keywords)
-        if col: column_map['date'] = col
-        
-        col = find_col(desc_keywords)
-        if col: column_map['description'] = col
-        
-        col = find_col(debit_keywords)
-        if col: column_map['debit'] = col
-        
-        col = find_col(credit_keywords)
-        if col: column_map['credit'] = col
-        
-        if 'debit' not in column_map and 'credit' not in column_map:
-            col = find_col(amount_keywords)
-            if col: column_map['amount'] = col
-            
-        col = find_col(balance_keywords)
-        if col: column_map['balance'] = col
-        
-        return column_map
+        return ColumnDetector.detect(df.columns).columns
     
     def get_info(self) -> Dict[str, Any]:
         """
@@ -159,17 +475,22 @@ class ExcelParser:
         """
         sheet_names = self.get_sheet_names()
         
-        # Parse first sheet for details
-        df = self.parse()
-        column_map = self.detect_columns(df)
+        # Details cover every transaction sheet (the first sheet if none)
+        df = self.parse_all_sheets()
+        mapping = ColumnDetector.detect(df.columns)
         
         return {
             'file_path': str(self.excel_path),
             'sheet_names': sheet_names,
+            'engine': self.engine_used,
+            'header_row': self.locate_header(0).row,
+            'preamble': self.preamble,
             'num_sheets': len(sheet_names),
+            'transaction_sheets': self.transaction_sheets(),
             'num_rows': len(df),
             'num_columns': len(df.columns),
             'columns': list(df.columns),
-            'column_mapping': column_map,
+            'column_mapping': mapping.columns,
+            'column_confidence': mapping.confidence,
             'is_valid': self.validate_structure(df),
         }
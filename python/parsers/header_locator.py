@@ -0,0 +1,135 @@
+"""Header Locator Module for finding the table header below a statement preamble.
+
+Bank exports often start with 5-20 lines of account details (holder, account
+number, branch, statement period) before the transaction table. The locator
+scans only the first rows of a file, scores each one with ColumnDetector and
+reports where the header is, so the reader can skip straight to it and the
+preamble text can go to bank detection.
+"""
+
+import csv
+import itertools
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, List, Optional, Sequence
+
+import pandas as pd
+
+from .column_detector import ColumnDetector
+
+_AMOUNT_FIELDS = ('debit', 'credit', 'amount')
+
+# Extra header test, e.g. a detected bank's BankLayout.matches
+HeaderMatch = Callable[[Sequence[str]], bool]
+
+
+@dataclass
+class HeaderLocation:
+    """Where the table header is, and what came before it."""
+    row: int = 0
+    columns: List[str] = field(default_factory=list)
+    preamble: List[str] = field(default_factory=list)
+    delimiter: Optional[str] = None
+    found: bool = False
+
+    @property
+    def text(self) -> str:
+        """Preamble lines joined with newlines."""
+        return '\n'.join(self.preamble)
+
+
+class HeaderLocator:
+    """Finds the header row of a statement table from its first rows."""
+
+    # Rows scanned before giving up and assuming row 0 is the header
+    MAX_ROWS = 30
+    # A header must name at least this many fields, including a date and an amount
+    MIN_FIELDS = 3
+    DELIMITERS = (',', ';', '\t', '|')
+
+    @staticmethod
+    def _cells(row: Iterable[Any]) -> List[str]:
+        """Row values as stripped strings; missing cells become ''."""
+        return ['' if pd.isna(value) else str(value).strip() for value in row]
+
+    @classmethod
+    def is_header(cls, cells: Sequence[str]) -> bool:
+        """Whether a row's labels look like a transaction table header."""
+        mapping = ColumnDetector.detect(cells)
+        return (
+            len(mapping.columns) >= cls.MIN_FIELDS
+            and 'date' in mapping
+            and any(name in mapping for name in _AMOUNT_FIELDS)
+        )
+
+    @classmethod
+    def locate(cls, rows: Iterable[Iterable[Any]],
+               fallback: Optional[HeaderMatch] = None) -> HeaderLocation:
+        """
+        Find the header among already-split rows (e.g. an Excel sheet).
+
+        Args:
+            rows: Rows of cell values from the top of the sheet
+            fallback: Header test tried only if no row passes is_header
+
+        Returns:
+            HeaderLocation; row 0 with found=False if no row qualifies
+        """
+        rows = [cls._cells(row) for row in itertools.islice(rows, cls.MAX_ROWS)]
+        for test in (cls.is_header, fallback):
+            if test is None:
+                continue
+            preamble = []
+            for index, cells in enumerate(rows):
+                if test(cells):
+                    return HeaderLocation(row=index, columns=cells, preamble=preamble, found=True)
+                line = ' '.join(cell for cell in cells if cell)
+                if line:
+                    preamble.append(line)
+        return HeaderLocation()
+
+    @classmethod
+    def locate_text(cls, prefix: str, complete: bool = True,
+                    fallback: Optional[HeaderMatch] = None) -> HeaderLocation:
+        """
+        Find the header among the first lines of a delimited text file.
+
+        Each line is tried with every candidate delimiter, so the delimiter
+        comes from the header itself rather than from a sniffer confused by
+        the preamble.
+
+        Args:
+            prefix: Start of the file
+            complete: Whether prefix is the whole file; if not, its last
+                      (possibly cut) line is ignored
+            fallback: Header test tried only if no line passes is_header
+
+        Returns:
+            HeaderLocation whose row counts physical lines, blank ones included
+        """
+        lines = cls.lines(prefix, complete)
+
+        for test in (cls.is_header, fallback):
+            if test is None:
+                continue
+            preamble = []
+            for index, line in enumerate(lines):
+                for delimiter in cls.DELIMITERS:
+                    if delimiter not in line:
+                        continue
+                    cells = cls._cells(next(csv.reader([line], delimiter=delimiter), []))
+                    if test(cells):
+                        return HeaderLocation(
+                            row=index, columns=cells, preamble=preamble,
+                            delimiter=delimiter, found=True
+                        )
+                if line.strip():
+                    preamble.append(line.strip())
+        return HeaderLocation()
+
+    @classmethod
+    def lines(cls, prefix: str, complete: bool = True) -> List[str]:
+        """The first MAX_ROWS whole lines of a file prefix."""
+        lines = prefix.splitlines()
+        if not complete:
+            lines = lines[:-1]
+        return lines[:cls.MAX_ROWS]
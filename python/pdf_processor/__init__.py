@@ -1,5 +1,12 @@
 """PDF Processor package for handling PDF bank statements."""
 
-from .reader import PDFReader
+from lazy_exports import attach
+
+# Submodules load on first attribute access; see lazy_exports.
+_LAZY_ATTRS = {
+    'PDFReader': '.reader',
+}
 
 __all__ = ['PDFReader']
+
+__getattr__, __dir__ = attach(__name__, _LAZY_ATTRS, globals())
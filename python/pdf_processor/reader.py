@@ -117,6 +117,43 @@ class PDFReader:
         except Exception as e:
             raise RuntimeError(f"Error reading PDF: {str(e)}")
     
+    def probe_text(self, max_pages: int = 1) -> str:
+        """
+        Text for early bank detection, without extracting the whole document.
+        
+        Bank statements name the bank on the first page, and many are
+        produced by the bank's own generator, which shows up in the
+        metadata, so only those are read.
+        
+        Args:
+            max_pages: Leading pages to extract
+            
+        Returns:
+            Metadata title/author/creator/producer lines, then page text
+        """
+        try:
+            with open(self.pdf_path, 'rb') as file:
+                reader = PyPDF2.PdfReader(file)
+                
+                if reader.is_encrypted:
+                    if not self.password or reader.decrypt(self.password) != 1:
+                        raise ValueError("PDF is encrypted and could not be unlocked")
+                
+                parts = []
+                if reader.metadata:
+                    for key in ('/Title', '/Author', '/Creator', '/Producer'):
+                        value = reader.metadata.get(key)
+                        if value:
+                            parts.append(str(value))
+                
+                for page in reader.pages[:max_pages]:
+                    parts.append(page.extract_text() or '')
+                
+                return '\n'.join(parts)
+                
+        except Exception as e:
+            raise RuntimeError(f"Error reading PDF: {str(e)}")
+    
     def get_page_text(self, page_number: int) -> str:
         """
         Extract text from a specific page.
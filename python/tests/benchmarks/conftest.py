@@ -0,0 +1,29 @@
+"""Shared setup for the benchmarks.
+
+Tests marked ``benchmark`` assert wall-clock timings, which depend on the
+machine, so they are skipped unless RUN_BENCHMARKS=1 is set:
+
+    RUN_BENCHMARKS=1 python -m pytest tests/benchmarks -q
+"""
+
+import os
+
+import pytest
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'benchmark: wall-clock benchmark, run with RUN_BENCHMARKS=1')
+
+
+def pytest_runtest_setup(item):
+    if item.get_closest_marker('benchmark') and not os.environ.get('RUN_BENCHMARKS'):
+        pytest.skip('benchmark; set RUN_BENCHMARKS=1 to run')
+
+
+@pytest.fixture
+def report(capsys):
+    """Print a "[bench]" result line past pytest's output capture."""
+    def report(line: str) -> None:
+        with capsys.disabled():
+            print(f"\n[bench] {line}")
+    return report
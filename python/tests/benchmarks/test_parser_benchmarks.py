@@ -0,0 +1,69 @@
+"""Benchmarks for statement file parsing."""
+
+import os
+import time
+import pytest
+import pandas as pd
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from parsers.excel_parser import ExcelParser
+
+# Set BENCH_XLSX_ROWS=200000 for timings closer to a multi-year statement
+ROWS = int(os.environ.get('BENCH_XLSX_ROWS', 5_000))
+
+
+@pytest.fixture(scope='module')
+def large_xlsx(tmp_path_factory):
+    """Generate a ROWS-row statement workbook with a preamble."""
+    import openpyxl
+    
+    file_path = tmp_path_factory.mktemp('bench') / 'large.xlsx'
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet('Statement')
+    sheet.append(['HDFC BANK Ltd.'])
+    sheet.append(['Account No', '50100012345'])
+    sheet.append([])
+    sheet.append(['Date', 'Narration', 'Chq./Ref.No.', 'Withdrawal Amt.', 'Deposit Amt.',
+                  'Closing Balance'])
+    balance = 0.0
+    for i in range(ROWS):
+        amount = (i * 37 % 100_000) / 100
+        debit = i % 2 == 0
+        balance += -amount if debit else amount
+        sheet.append([
+            f'{i % 28 + 1:02d}/{i % 12 + 1:02d}/24',
+            f'UPI/{i % 500}/MERCHANT',
+            f'REF{i}',
+            amount if debit else None,
+            None if debit else amount,
+            round(balance, 2),
+        ])
+    workbook.save(file_path)
+    return file_path
+
+
+@pytest.mark.benchmark
+class TestExcelEngineBenchmark:
+    """calamine against openpyxl on a large workbook."""
+    
+    def test_engines_agree(self, large_xlsx, report):
+        pytest.importorskip('python_calamine')
+        
+        timings = {}
+        frames = {}
+        for engine in ('openpyxl', 'calamine'):
+            with ExcelParser(str(large_xlsx), engine=engine) as parser:
+                start = time.perf_counter()
+                frames[engine] = parser.parse()
+                timings[engine] = time.perf_counter() - start
+        
+        report(f"Excel {ROWS} rows: openpyxl {timings['openpyxl']:.2f}s, "
+               f"calamine {timings['calamine']:.2f}s "
+               f"({timings['openpyxl'] / timings['calamine']:.1f}x)")
+        
+        assert len(frames['calamine']) == ROWS
+        pd.testing.assert_frame_equal(frames['calamine'], frames['openpyxl'])
+        assert timings['calamine'] < timings['openpyxl']
@@ -11,6 +11,10 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from adapters.std_adapter import StandardAdapter
 from adapters.sbi_adapter import SBIAdapter
 from adapters.factory import AdapterFactory
+from adapters.base import Transaction, TransactionBatch
+from adapters.layout import BankLayout, load_layouts
+from adapters.layout_adapter import LayoutAdapter
+from parsers.bank_detector import BankDetector
 
 
 class TestStandardAdapter:
@@ -35,15 +39,74 @@ class TestStandardAdapter:
         assert txns[1].credit == 200.0
         assert txns[0].date.year == 2024
 
-    def test_clean_amount(self):
-        """Test amount cleaning utility."""
+    def test_infers_day_first_format(self):
+        """Test ambiguous dd/mm dates are read day-first and the format is reported."""
+        df = pd.DataFrame({
+            'Date': ['01/02/2024', '13/02/2024', '05/03/2024'],
+            'Description': ['a', 'b', 'c'],
+            'Amount': ['10', '20', '30']
+        })
+        
+        adapter = StandardAdapter(df)
+        txns = adapter.process()
+        
+        assert adapter.date_format == '%d/%m/%Y'
+        assert [t.date for t in txns] == [
+            datetime(2024, 2, 1), datetime(2024, 2, 13), datetime(2024, 3, 5)
+        ]
+    
+    def test_date_outliers_fall_back_row_wise(self):
+        """Test cells outside the inferred format are still parsed."""
+        df = pd.DataFrame({
+            'Date': ['01-Jan-2024', '02-Jan-2024', '2024-01-03', 'Opening'],
+            'Description': ['a', 'b', 'c', 'd'],
+            'Amount': ['1', '2', '3', '4']
+        })
+        
+        adapter = StandardAdapter(df)
+        txns = adapter.process()
+        
+        assert adapter.date_format == '%d-%b-%Y'
+        assert [t.date.day for t in txns] == [1, 2, 3]
+    
+    def test_date_outliers_keep_day_first(self):
+        """Test fallback cells are read day-first like the inferred format."""
+        df = pd.DataFrame({
+            'Date': ['01/02/2024', '13/02/2024', '05/03/2024', '03/04/2024 10:00'],
+            'Description': ['a', 'b', 'c', 'd'],
+            'Amount': ['1', '2', '3', '4']
+        })
+    
+        adapter = StandardAdapter(df)
+        txns = adapter.process()
+    
+        assert adapter.date_format == '%d/%m/%Y'
+        assert txns[3].date == datetime(2024, 4, 3, 10, 0)
+        assert StandardAdapter._is_dayfirst('%m/%d/%Y') is False
+        assert StandardAdapter._is_dayfirst('%Y-%m-%d') is False
+    
+    def test_dr_cr_signs_in_amount_column(self):
+        """Test Dr/Cr suffixes and brackets decide the side of a single amount column."""
+        df = pd.DataFrame({
+            'Date': ['2024-01-01', '2024-01-02', '2024-01-03'],
+            'Description': ['a', 'b', 'c'],
+            'Amount': ['1,00,000.00 Dr', '250.50 Cr', '(10.00)'],
+            'Balance': ['5,000.00 Dr', '4,749.50 Dr', '4,759.50 Dr']
+        })
+        
+        txns = StandardAdapter(df).process()
+        
+        assert [(t.debit, t.credit) for t in txns] == [(100000.0, 0.0), (0.0, 250.5), (10.0, 0.0)]
+        assert txns.balance_paise.tolist() == [-500000, -474950, -475950]
+    
+    def test_amount_column(self):
+        """Test amount columns parse to signed paise."""
         adapter = StandardAdapter(pd.DataFrame())
+        values = pd.Series(["1,000.50", "₹ 500", "100 Dr", "200 Cr", "300-", None])
         
-        assert adapter._clean_amount("1,000.50") == 1000.50
-        assert adapter._clean_amount("₹ 500") == 500.0
-        assert adapter._clean_amount("100 Dr") == 100.0
-        assert adapter._clean_amount("200 Cr") == 200.0
-        assert adapter._clean_amount(None) == 0.0
+        assert adapter._amount_paise_column(values).tolist() == [
+            100050, 50000, -10000, 20000, -30000, 0
+        ]
 
 
 class TestSBIAdapter:
@@ -66,6 +129,226 @@ class TestSBIAdapter:
         assert len(txns) == 1
         assert txns[0].reference_no == 'REF123'
         assert txns[0].description == 'UPI Payment'
+    
+    def test_skips_rows_without_valid_date(self):
+        """Test opening-balance and footer rows without a date are dropped."""
+        df = pd.DataFrame({
+            'Txn Date': ['', '01-Jan-2024', None, 'Total'],
+            'Description': ['Opening Balance', 'NEFT IN', 'x', 'y'],
+            'Debit': ['', '', '', '1,000.00'],
+            'Credit': ['', '1,000.00', '', ''],
+            'Balance': ['4,000.00', '5,000.00', '', '']
+        })
+        
+        txns = SBIAdapter(df).process()
+        
+        assert len(txns) == 1
+        assert txns[0].credit == 1000.0
+        assert txns[0].balance == 5000.0
+        assert txns[0].reference_no == ''
+
+
+class TestProcessChunks:
+    """Tests for chunk-at-a-time adapter processing."""
+    
+    def test_chunks_match_whole_frame(self):
+        """Test concatenated chunk batches equal one-shot processing."""
+        df = pd.DataFrame({
+            'Date': ['25/01/2024', '26/01/2024', '01/02/2024', '03/02/2024', 'Total'],
+            'Description': ['a', 'b', 'c', 'd', ''],
+            'Debit': ['10.00', '', '5.00', '', '15.00'],
+            'Credit': ['', '20.00', '', '1.00', '21.00'],
+            'Balance': ['90.00', '110.00', '105.00', '106.00', ''],
+        })
+        chunks = [df.iloc[:2], df.iloc[2:4], df.iloc[4:]]
+        
+        adapter = StandardAdapter(chunks[0])
+        batches = list(adapter.process_chunks(chunks))
+        
+        assert [len(b) for b in batches] == [2, 2, 0]
+        assert TransactionBatch.concat(batches) == StandardAdapter(df).process()
+        # Decided on the first chunk only
+        assert adapter._date_formats == {'Date': '%d/%m/%Y'}
+    
+    def test_layout_header_found_once(self):
+        """Test later chunks reuse the header located in the first chunk."""
+        df = pd.DataFrame([
+            ['Account Name', 'A K SHARMA', None],
+            ['Txn Date', 'Description', 'Credit'],
+            ['01 Apr 2024', 'NEFT IN', '1,000.00'],
+            ['02 Apr 2024', 'NEFT IN', '2,000.00'],
+        ], columns=['Statement', 'x', 'y'])
+        
+        batches = list(SBIAdapter(df.iloc[:3]).process_chunks([df.iloc[:3], df.iloc[3:]]))
+        
+        assert [t.credit for b in batches for t in b] == [1000.0, 2000.0]
+
+
+class TestLayoutAdapter:
+    """Tests for spec-driven adapters."""
+    
+    def test_hdfc_split_columns(self):
+        """Test the HDFC spec maps its own header labels."""
+        df = pd.DataFrame({
+            'Date': ['05/04/24', '06/04/24'],
+            'Narration': ['UPI-SWIGGY', 'NEFT CR-ACME'],
+            'Chq./Ref.No.': ['0000412345', 'N0961234'],
+            'Value Dt': ['05/04/24', '07/04/24'],
+            'Withdrawal Amt.': ['250.00', ''],
+            'Deposit Amt.': ['', '50,000.00'],
+            'Closing Balance': ['9,750.00', '59,750.00'],
+        })
+        
+        adapter = AdapterFactory.get_adapter('HDFC', df)
+        txns = adapter.process()
+        
+        assert isinstance(adapter, LayoutAdapter)
+        assert adapter.date_format == '%d/%m/%y'
+        assert txns[0] == Transaction(
+            datetime(2024, 4, 5), 'UPI-SWIGGY', 250.0, 0.0, 9750.0,
+            '0000412345', datetime(2024, 4, 5)
+        )
+        assert txns[1].credit == 50000.0
+        assert txns[1].value_date == datetime(2024, 4, 7)
+    
+    def test_indicator_sign_convention(self):
+        """Test an amount column with a separate Dr/Cr column."""
+        df = pd.DataFrame({
+            'Transaction Date': ['01-04-2024', '02-04-2024'],
+            'Description': ['ATM', 'Salary'],
+            'Amount': ['1,000.00', '20,000.00'],
+            'Dr / Cr': ['DR', 'CR'],
+            'Balance': ['4,000.00', '24,000.00'],
+        })
+        
+        txns = AdapterFactory.get_adapter('KOTAK', df).process()
+        
+        assert [(t.debit, t.credit) for t in txns] == [(1000.0, 0.0), (0.0, 20000.0)]
+    
+    def test_signed_sign_convention(self):
+        """Test a single amount column with Dr/Cr suffixes."""
+        df = pd.DataFrame({
+            'Tran Date': ['01/04/2024', '02/04/2024'],
+            'Remarks': ['Rent', 'Refund'],
+            'Amount(Rs.)': ['15,000.00 Dr', '200.00 Cr'],
+            'Balance(Rs.)': ['5,000.00', '5,200.00'],
+        })
+        
+        txns = AdapterFactory.get_adapter('UNION', df).process()
+        
+        assert [(t.debit, t.credit) for t in txns] == [(15000.0, 0.0), (0.0, 200.0)]
+    
+    @pytest.mark.parametrize("bank", ['HDFC', 'SBI', 'KOTAK', 'UNION'])
+    def test_signed_amount_without_convention_columns(self, bank):
+        """Test a lone signed Amount column is split like StandardAdapter does."""
+        df = pd.DataFrame({
+            'Date': ['01/04/2024', '02/04/2024'],
+            'Description': ['Rent', 'Refund'],
+            'Amount': ['-500.00', '1,000.00'],
+        })
+    
+        adapter = AdapterFactory.get_adapter(bank, df)
+        txns = adapter.process()
+    
+        assert adapter.plan.amounts == 'signed'
+        assert [(t.debit, t.credit) for t in txns] == [(500.0, 0.0), (0.0, 1000.0)]
+        assert [(t.debit, t.credit) for t in txns] == \
+            [(t.debit, t.credit) for t in StandardAdapter(df).process()]
+    
+    def test_split_columns_under_signed_layout(self):
+        """Test debit/credit columns are used when the amount column is missing."""
+        df = pd.DataFrame({
+            'Tran Date': ['01/04/2024', '02/04/2024'],
+            'Remarks': ['Rent', 'Refund'],
+            'Debit': ['15,000.00', ''],
+            'Credit': ['', '200.00'],
+        })
+    
+        adapter = AdapterFactory.get_adapter('UNION', df)
+        txns = adapter.process()
+    
+        assert adapter.plan.amounts == 'split'
+        assert [(t.debit, t.credit) for t in txns] == [(15000.0, 0.0), (0.0, 200.0)]
+    
+    def test_skips_preamble_rows(self):
+        """Test the real header is found below account-detail rows."""
+        df = pd.DataFrame([
+            ['Address', 'MG Road', None, None, None],
+            ['Txn Date', 'Description', 'Debit', 'Credit', 'Balance'],
+            ['01 Apr 2024', 'NEFT IN', '', '1,000.00', '5,000.00'],
+        ], columns=['Account Name', 'A K SHARMA', 'x', 'y', 'z'])
+        
+        txns = SBIAdapter(df).process()
+        
+        assert len(txns) == 1
+        assert txns[0].date == datetime(2024, 4, 1)
+        assert txns[0].credit == 1000.0
+    
+    def test_every_detected_bank_has_layout(self):
+        """Test each BankDetector bank resolves to a spec or adapter."""
+        assert set(BankDetector.get_supported_banks()) <= set(AdapterFactory.get_supported_banks())
+    
+    def test_plans_are_memoized(self):
+        """Test compiling the same header twice reuses the plan."""
+        layout = load_layouts()['AXIS']
+        
+        assert layout.compile(['Tran Date', 'PARTICULARS', 'DR', 'CR', 'BAL']) is \
+            layout.compile(['TRAN DATE', 'Particulars', 'Dr', 'Cr', 'Bal'])
+    
+    def test_is_header_needs_several_labels(self):
+        """Test a preamble line naming only the date is not a header row."""
+        layout = load_layouts()['HDFC']
+        
+        assert layout.matches(['Date', '01/04/2024'])
+        assert not layout.is_header(['Date', '01/04/2024'])
+        assert layout.is_header(['Date', 'Narration', 'Withdrawal Amt.', 'Closing Balance'])
+    
+    def test_invalid_spec(self):
+        """Test unknown fields and sign conventions are rejected."""
+        with pytest.raises(ValueError):
+            BankLayout.from_dict({'bank': 'X', 'columns': {'amt': ['Amt']}})
+        with pytest.raises(ValueError):
+            BankLayout.from_dict({'bank': 'X', 'amounts': 'reversed'})
+
+
+class TestTransactionBatch:
+    """Tests for the columnar TransactionBatch container."""
+    
+    @pytest.fixture
+    def transactions(self):
+        return [
+            Transaction(datetime(2024, 1, 1), 'Rent', 15000.0, 0.0, 5000.0, 'CHQ1'),
+            Transaction(datetime(2024, 1, 2), 'Salary', 0.0, 50000.1, 55000.1),
+            Transaction(datetime(2024, 1, 2), 'Rent', 0.05, 0.0, 55000.05, None,
+                        value_date=datetime(2024, 1, 3)),
+        ]
+    
+    def test_round_trip(self, transactions):
+        """Test iteration and indexing give back equal Transaction objects."""
+        batch = TransactionBatch.from_transactions(transactions)
+        
+        assert len(batch) == 3
+        assert list(batch) == transactions
+        assert batch[-1] == transactions[-1]
+        assert isinstance(batch[0], Transaction)
+        assert batch.debit_paise.tolist() == [1500000, 0, 5]
+        assert batch.description_categories == ['Rent', 'Salary']
+    
+    def test_slicing_and_masks(self, transactions):
+        """Test slices and boolean masks return batches."""
+        batch = TransactionBatch.from_transactions(transactions)
+        
+        assert isinstance(batch[1:], TransactionBatch)
+        assert list(batch[1:]) == transactions[1:]
+        assert list(batch[batch.credit_paise > 0]) == [transactions[1]]
+    
+    def test_to_records_matches_to_dict(self, transactions):
+        """Test bulk conversion matches Transaction.to_dict."""
+        batch = TransactionBatch.from_transactions(transactions)
+        
+        assert batch.to_records() == [t.to_dict() for t in transactions]
+        assert TransactionBatch.concat([batch[:1], batch[1:]]) == batch
+        assert TransactionBatch.empty().to_json() == '[]'
 
 
 class TestAdapterFactory:
@@ -80,3 +363,8 @@ class TestAdapterFactory:
         df = pd.DataFrame()
         adapter = AdapterFactory.get_adapter('UNKNOWN', df)
         assert isinstance(adapter, StandardAdapter)
+    
+    def test_get_layout_adapter(self):
+        adapter = AdapterFactory.get_adapter('icici', pd.DataFrame())
+        assert isinstance(adapter, LayoutAdapter)
+        assert adapter.layout.bank == 'ICICI'
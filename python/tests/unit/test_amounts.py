@@ -0,0 +1,78 @@
+"""Unit tests for fixed-point amount parsing."""
+
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from adapters.amounts import amount_to_paise, parse_paise
+
+
+CASES = [
+    ('1,00,000.00', 10000000),
+    ('₹ 500', 50000),
+    ('Rs. 1,234.5', 123450),
+    ('INR 10', 1000),
+    ('(123.45)', -12345),
+    ('100 Dr', -10000),
+    ('-100 Dr', -10000),
+    ('5,000.00 Dr.', -500000),
+    ('200 Cr', 20000),
+    ('-50', -5000),
+    ('500-', -50000),
+    ('1,250.00 -', -125000),
+    ('.5', 50),
+    ('1.005', 101),
+    ('1e3', 100000),
+    ('', 0),
+    (None, 0),
+    ('abc', 0),
+    ('12.3.4', 0),
+    (12.5, 1250),
+]
+
+
+class TestAmountToPaise:
+    """Test cases for single-cell parsing."""
+    
+    @pytest.mark.parametrize("value,expected", CASES)
+    def test_cell(self, value, expected):
+        assert (amount_to_paise(value) or 0) == expected
+    
+    def test_blank_is_none(self):
+        """Test blanks are distinguishable from zero."""
+        assert amount_to_paise('  ') is None
+        assert amount_to_paise('0.00') == 0
+
+
+class TestParsePaise:
+    """Test cases for whole-column parsing."""
+    
+    def test_text_column_matches_cells(self):
+        """Test the bulk path agrees with the per-cell parser."""
+        values = pd.Series([v for v, _ in CASES] * 3, dtype=object)
+        result = parse_paise(values)
+        
+        assert result.dtype == np.int64
+        assert result.tolist() == [e for _, e in CASES] * 3
+    
+    def test_numeric_column(self):
+        """Test float columns scale to paise with NaN as 0."""
+        result = parse_paise(pd.Series([0.1, 0.2, np.nan, -1234.56]))
+        assert result.tolist() == [10, 20, 0, -123456]
+    
+    def test_sum_is_exact(self):
+        """Test summing many small amounts has no float drift."""
+        result = parse_paise(pd.Series(['0.10'] * 1_000_000))
+        assert int(result.sum()) == 10_000_000
+    
+    def test_halves_round_like_text(self):
+        """Test float cells and columns round halves away from zero, as text does."""
+        for text, number in (('0.125', 0.125), ('-0.125', -0.125), ('2.675', 2.675)):
+            expected = amount_to_paise(text)
+            assert amount_to_paise(number) == expected
+            assert parse_paise(pd.Series([number])).tolist() == [expected]
+        assert parse_paise(pd.Series([0.125, -0.375])).tolist() == [13, -38]
@@ -0,0 +1,113 @@
+"""Unit tests for running-balance continuity checks."""
+
+import pytest
+import pandas as pd
+from datetime import datetime
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from adapters.base import TransactionBatch
+from adapters.balance import check_running_balance
+from adapters.std_adapter import StandardAdapter
+
+
+def make_batch(rows):
+    """Build a batch from (debit, credit, balance) rupee tuples."""
+    return TransactionBatch.from_columns(
+        [datetime(2024, 4, 1)] * len(rows),
+        [f'Txn {i}' for i in range(len(rows))],
+        [r[0] for r in rows],
+        [r[1] for r in rows],
+        [r[2] for r in rows],
+    )
+
+
+CONTINUOUS = [
+    (0, 1000, 1000),
+    (250.50, 0, 749.50),
+    (0, 0.50, 750),
+    (100, 0, 650),
+]
+
+
+class TestCheckRunningBalance:
+    """Test cases for check_running_balance."""
+
+    def test_continuous_statement(self):
+        """Test a clean statement has no breaks."""
+        report = check_running_balance(make_batch(CONTINUOUS))
+
+        assert report.ok
+        assert report.checked
+        assert report.rows == 4
+
+    def test_dropped_row(self):
+        """Test a missing row is reported once, at the row after the gap."""
+        rows = CONTINUOUS[:2] + CONTINUOUS[3:]
+
+        report = check_running_balance(make_batch(rows))
+
+        assert not report.ok
+        assert len(report.breaks) == 1
+        brk = report.breaks[0]
+        assert (brk.index, brk.expected, brk.actual) == (2, 649.5, 650.0)
+        assert brk.difference == 0.5
+
+    def test_duplicated_row(self):
+        """Test a duplicated row breaks at the duplicate."""
+        rows = CONTINUOUS[:2] + [CONTINUOUS[1]] + CONTINUOUS[2:]
+
+        report = check_running_balance(make_batch(rows))
+
+        assert [b.index for b in report.breaks] == [2]
+        assert report.breaks[0].difference == 250.5
+
+    def test_descending_statement(self):
+        """Test newest-first statements are detected and indexed correctly."""
+        rows = list(reversed(CONTINUOUS[:2] + CONTINUOUS[3:]))
+
+        report = check_running_balance(make_batch(rows))
+
+        assert report.descending
+        assert [b.index for b in report.breaks] == [0]
+
+    def test_forced_order(self):
+        """Test an explicit order is respected."""
+        report = check_running_balance(make_batch(CONTINUOUS), order='desc')
+
+        assert report.descending
+        assert not report.ok
+        with pytest.raises(ValueError):
+            check_running_balance(make_batch(CONTINUOUS), order='sideways')
+
+    def test_no_balances(self):
+        """Test statements without a balance column are not flagged."""
+        report = check_running_balance(make_batch([(10, 0, 0), (0, 5, 0)]))
+
+        assert report.ok
+        assert not report.checked
+
+
+class TestAdapterValidate:
+    """BankAdapter.validate uses the balance check."""
+
+    def test_validate(self):
+        """Test validate() fails only once a break is present."""
+        df = pd.DataFrame({
+            'Date': ['01/04/2024', '02/04/2024', '03/04/2024'],
+            'Description': ['a', 'b', 'c'],
+            'Debit': ['', '100.00', '100.00'],
+            'Credit': ['500.00', '', ''],
+            'Balance': ['500.00', '400.00', '200.00'],
+        })
+        adapter = StandardAdapter(df)
+        assert adapter.validate()
+
+        adapter.process()
+
+        assert not adapter.validate()
+        assert adapter.check_balances().to_dict()['breaks'] == [
+            {'index': 2, 'expected': 300.0, 'actual': 200.0, 'difference': -100.0}
+        ]
@@ -55,3 +55,56 @@ class TestBankDetector:
         assert 'HDFC' in banks
         assert 'SBI' in banks
         assert len(banks) >= 10
+
+
+class TestBankRanking:
+    """Test cases for ranked, scored detection."""
+    
+    def test_rank_orders_candidates(self):
+        """Test every matching bank is returned, best first, with scores."""
+        candidates = BankDetector.rank("STATE BANK OF INDIA. NEFT to HDFC Bank via SBI")
+        
+        assert [c.bank for c in candidates] == ['SBI', 'HDFC']
+        assert candidates[0].score == 3
+        assert candidates[1].score == 2
+        assert candidates[0].confidence == 0.6
+        assert candidates[0].signatures == [r'State\s*Bank\s*of\s*India', 'SBI']
+    
+    def test_repeated_signature_counts_once(self):
+        """Test mentions in every transaction line do not inflate the score."""
+        text = "Axis Bank statement\n" + "IMPS to ICICI Bank\n" * 50
+        candidates = BankDetector.rank(text)
+        
+        assert candidates[0].score == candidates[1].score == 2
+    
+    def test_tie_goes_to_first_mention(self):
+        """Test equal scores are broken by position, not dictionary order."""
+        assert BankDetector.detect("Canara Bank statement, transfer from HDFC Bank") == 'CANARA'
+        assert BankDetector.detect("HDFC Bank statement, transfer from Canara Bank") == 'HDFC'
+    
+    def test_max_chars_limits_scan(self):
+        """Test only the leading characters are scanned when asked."""
+        text = "Statement of account\n" + "x" * 10_000 + "\nIndusInd Bank"
+        
+        assert BankDetector.detect(text) == 'INDUSIND'
+        assert BankDetector.detect(text, max_chars=4096) is None
+    
+    def test_case_and_word_boundaries(self):
+        """Test patterns ignore case; keywords match case and whole words only."""
+        assert BankDetector.detect("statement from kotak mahindra bank") == 'KOTAK'
+        assert BankDetector.detect("Paid to Bobby Traders") is None
+        assert BankDetector.detect("Paid to BOBBY Traders") is None
+        assert BankDetector.detect("Branch: BOB Main Road") == 'BOB'
+        assert BankDetector.detect("NEFT/SBI/1234") == 'SBI'
+    
+    @pytest.mark.parametrize("text", [
+        "Customer Name: Bob Kumar",
+        "Address: 12 Kebob Lane",
+        "Address: 12 KEBOB LANE",
+        "Account holder: Rajesh Kotak",
+        "Nominee: Sbi Raman",
+        "Paid to PNBX Traders",
+    ])
+    def test_names_are_not_banks(self, text):
+        """Test person and street names containing short bank codes are not matched."""
+        assert BankDetector.rank(text) == []
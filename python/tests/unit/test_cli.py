@@ -0,0 +1,483 @@
+"""Unit tests for the CLI entry point."""
+
+import pytest
+import io
+import json
+import subprocess
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import cli
+
+CLI_PATH = Path(__file__).parent.parent.parent / "cli.py"
+
+
+@pytest.fixture
+def statement_csv(tmp_path):
+    """Small generic statement CSV."""
+    csv_path = tmp_path / "statement.csv"
+    csv_path.write_text(
+        "Date,Description,Debit,Credit,Balance\n"
+        "2024-01-01,Purchase,100,,1900\n"
+        "2024-01-02,Salary,,5000,6900"
+    )
+    return csv_path
+
+
+def run_serve(lines):
+    """Feed request lines to serve() and return decoded responses."""
+    stdin = io.StringIO("\n".join(json.dumps(l) if not isinstance(l, str) else l for l in lines) + "\n")
+    stdout = io.StringIO()
+    cli.serve(stdin=stdin, stdout=stdout)
+    return [json.loads(l) for l in stdout.getvalue().splitlines()]
+
+
+class TestServe:
+    """Tests for the persistent JSON-RPC worker."""
+    
+    def test_process_and_export_round_trip(self, statement_csv):
+        """Test process then export over one worker session."""
+        responses = run_serve([
+            {'id': 1, 'method': 'process', 'params': {'files': [str(statement_csv)], 'cache': False}},
+        ])
+        assert responses[0]['id'] == 1
+        result = responses[0]['result'][0]
+        assert result['status'] == 'success'
+        assert result['transaction_count'] == 2
+        
+        responses = run_serve([
+            {'id': 'exp', 'method': 'export',
+             'params': {'transactions': result['transactions'], 'format': 'tally-xml'}},
+        ])
+        assert responses[0]['id'] == 'exp'
+        assert responses[0]['result']['success'] is True
+        assert '<ENVELOPE>' in responses[0]['result']['content']
+    
+    def test_errors_keep_worker_alive(self):
+        """Test malformed lines and unknown methods answer without stopping."""
+        responses = run_serve([
+            'not json',
+            {'id': 2, 'method': 'bogus'},
+            {'id': 3, 'method': 'ping'},
+        ])
+        assert responses[0]['error']['code'] == -32700
+        assert responses[1]['id'] == 2
+        assert responses[1]['error']['code'] == -32601
+        assert responses[2] == {'jsonrpc': '2.0', 'id': 3, 'result': 'pong'}
+    
+    def test_shutdown_stops_loop(self):
+        """Test shutdown request ends the loop before later requests."""
+        responses = run_serve([
+            {'id': 1, 'method': 'shutdown'},
+            {'id': 2, 'method': 'ping'},
+        ])
+        assert len(responses) == 1
+        assert responses[0]['id'] == 1
+
+
+class TestProcessFiles:
+    """Tests for multi-file processing."""
+    
+    def test_parallel_matches_serial(self, statement_csv, tmp_path):
+        """Test pooled results equal serial results, in input order."""
+        other = tmp_path / "other.csv"
+        other.write_text("Date,Description,Amount\n2024-02-01,Fee,-10")
+        files = [str(other), str(tmp_path / "missing.csv"), str(statement_csv)]
+        
+        serial = cli.process_files(files, jobs=1)
+        parallel = cli.process_files(files, jobs=2)
+        
+        assert parallel == serial
+        assert [r['file'] for r in parallel] == files
+        assert parallel[1] == {'file': files[1], 'status': 'error', 'message': 'File not found'}
+    
+    def test_dedupe_overlapping_statements(self, statement_csv, tmp_path):
+        """Test overlapping rows in a later file are dropped, in any job order."""
+        overlap = tmp_path / "overlap.csv"
+        overlap.write_text(
+            "Date,Description,Debit,Credit,Balance\n"
+            "2024-01-02,Salary,,5000,6900\n"
+            "2024-01-03,Rent,3000,,3900"
+        )
+        files = [str(statement_csv), str(overlap)]
+        
+        results = cli.process_files(files, jobs=2, dedupe='drop')
+        
+        assert [r['transaction_count'] for r in results] == [2, 1]
+        assert [r['duplicate_count'] for r in results] == [0, 1]
+        assert results[1]['transactions'][0]['description'] == 'Rent'
+    
+    def test_history_flags_across_runs(self, statement_csv, tmp_path):
+        """Test --history remembers transactions from an earlier call."""
+        copy = tmp_path / "resent.csv"
+        copy.write_text(statement_csv.read_text() + "\n2024-01-03,Rent,3000,,3900")
+        history_dir = str(tmp_path / "history")
+        
+        first = cli.process_files([str(statement_csv)], dedupe='flag', history_dir=history_dir)
+        again = cli.process_files([str(statement_csv)], dedupe='flag', history_dir=history_dir)
+        later = cli.process_files([str(copy)], dedupe='flag', history_dir=history_dir)
+        
+        assert first[0]['duplicate_count'] == 0
+        assert again[0]['duplicate_count'] == 0  # same content re-run
+        assert later[0]['duplicate_count'] == 2
+        assert later[0]['transactions'][1]['duplicate_of'] == {'file': str(statement_csv), 'index': 1}
+
+
+class TestPreamble:
+    """Tests for statements with a preamble above the table."""
+    
+    def test_bank_detected_from_preamble(self, tmp_path):
+        """Test the preamble reaches bank detection and the table parses."""
+        csv_path = tmp_path / "hdfc.csv"
+        csv_path.write_text(
+            "HDFC BANK Ltd.\n"
+            "Statement of account,50100012345\n"
+            "Date,Narration,Chq./Ref.No.,Value Dt,Withdrawal Amt.,Deposit Amt.,Closing Balance\n"
+            "01/04/24,UPI-SWIGGY,R1,01/04/24,250.50,,8749.50\n"
+        )
+        
+        result = cli.process_file(str(csv_path))
+        
+        assert result['status'] == 'success'
+        assert result['bank'] == 'HDFC'
+        assert result['transaction_count'] == 1
+        assert result['transactions'][0]['debit'] == 250.5
+
+
+class TestEarlyDetection:
+    """Tests for detecting the bank before the full parse."""
+    
+    def test_issuer_wins_over_narrations(self, tmp_path):
+        """Test narrations naming other banks do not sway detection."""
+        csv_path = tmp_path / "axis.csv"
+        csv_path.write_text(
+            "Axis Bank Ltd\n"
+            "Tran Date,PARTICULARS,CHQNO,DR,CR,BAL\n"
+            "01-04-2024,NEFT TO HDFC BANK www.hdfcbank.com,1,10.00,,90.00\n"
+        )
+        
+        result = cli.process_file(str(csv_path))
+        
+        assert result['bank'] == 'AXIS'
+        assert result['transactions'][0]['debit'] == 10.0
+    
+    def test_layout_given_before_parse(self, tmp_path, monkeypatch):
+        """Test the detected bank's layout reaches the parser before parsing."""
+        from parsers.csv_parser import CSVParser
+        calls = []
+        use_layout = CSVParser.use_layout
+        parse = CSVParser.parse
+        monkeypatch.setattr(CSVParser, 'use_layout', lambda self, layout: calls.append(layout.bank) or use_layout(self, layout))
+        monkeypatch.setattr(CSVParser, 'parse', lambda self, *a: calls.append('parse') or parse(self, *a))
+        csv_path = tmp_path / "hdfc.csv"
+        csv_path.write_text(
+            "HDFC BANK Ltd.\n"
+            "Date,Narration,Chq./Ref.No.,Value Dt,Withdrawal Amt.,Deposit Amt.,Closing Balance\n"
+            "01/04/24,UPI,R1,01/04/24,250.50,,8749.50\n"
+        )
+        
+        result = cli.process_file(str(csv_path))
+        
+        assert result['bank'] == 'HDFC'
+        assert calls == ['HDFC', 'parse']
+    
+    def test_customer_name_is_not_a_bank(self, tmp_path):
+        """Test a holder named Bob does not turn a generic statement into BOB."""
+        csv_path = tmp_path / "generic.csv"
+        csv_path.write_text(
+            "Customer Name: Bob Kumar\n"
+            "Date,Description,Amount\n"
+            "2024-04-01,Rent,-500.00\n"
+            "2024-04-02,Salary,1000.00\n"
+        )
+        
+        proc = subprocess.run([sys.executable, str(CLI_PATH), "process", "--no-cache",
+                               str(csv_path)], capture_output=True, text=True, timeout=120)
+        result = json.loads(proc.stdout)[0]
+        
+        assert result['bank'] == ''
+        assert [(t['debit'], t['credit']) for t in result['transactions']] == [(500.0, 0.0),
+                                                                              (0.0, 1000.0)]
+    
+    @pytest.mark.parametrize("probe,bank", [
+        ("Branch: BOB", ""),
+        ("Bank of Baroda\nBranch: BOB", "BOB"),
+        ("SBI savings account (sbi)", "SBI"),
+        ("SBI savings, NEFT to HDFC", ""),
+    ])
+    def test_layout_needs_firm_evidence(self, probe, bank):
+        """Test a lone keyword does not pick the layout before parsing."""
+        class Probe:
+            layouts = []
+            
+            def probe_text(self):
+                return probe
+            
+            def use_layout(self, layout):
+                self.layouts.append(layout.bank)
+        
+        parser = Probe()
+        
+        assert cli._detect_early(parser) == bank
+        assert parser.layouts == ([bank] if bank else [])
+
+
+class TestExcelSheets:
+    """Tests for workbooks with one sheet per month."""
+    
+    def test_all_transaction_sheets_processed(self, tmp_path):
+        """Test every month sheet contributes transactions, in order."""
+        import openpyxl
+        xlsx_path = tmp_path / "monthly.xlsx"
+        workbook = openpyxl.Workbook()
+        workbook.active.append(['Statement summary'])
+        for month, day in (('Jan', '2024-01-05'), ('Feb', '2024-02-05')):
+            sheet = workbook.create_sheet(month)
+            sheet.append(['Date', 'Description', 'Debit', 'Credit', 'Balance'])
+            sheet.append([day, f'{month} rent', '100', None, '900'])
+        workbook.save(xlsx_path)
+        
+        result = cli.process_file(str(xlsx_path))
+        
+        assert result['status'] == 'success'
+        assert [t['description'] for t in result['transactions']] == ['Jan rent', 'Feb rent']
+
+
+class TestMerge:
+    """Tests for merging several statements of one account."""
+    
+    def test_merge_results(self, statement_csv, tmp_path):
+        """Test files are merged by date and errors are kept aside."""
+        earlier = tmp_path / "earlier.csv"
+        earlier.write_text(
+            "Date,Description,Debit,Credit,Balance\n"
+            "2023-12-31,Opening,,2000,2000\n"
+            "2024-01-01,Coffee,50,,1950"
+        )
+        files = [str(statement_csv), str(earlier), str(tmp_path / "missing.csv")]
+        
+        merged = cli.merge_results(cli.process_files(files))
+        
+        assert [t['description'] for t in merged['transactions']] == ['Opening', 'Purchase', 'Coffee', 'Salary']
+        assert merged['transaction_count'] == 4
+        assert merged['files'] == files[:2]
+        assert [e['file'] for e in merged['errors']] == files[2:]
+    
+    def test_merge_export(self, statement_csv, tmp_path):
+        """Test --export feeds the merged stream to the exporter."""
+        overlap = tmp_path / "overlap.csv"
+        overlap.write_text(
+            "Date,Description,Debit,Credit,Balance\n"
+            "2024-01-02,Salary,,5000,6900\n"
+            "2024-01-03,Rent,3000,,3900"
+        )
+        proc = subprocess.run(
+            [sys.executable, str(CLI_PATH), "process", "--no-cache", "--dedupe", "drop",
+             "--export", "tally-xml", str(statement_csv), str(overlap)],
+            capture_output=True, text=True, timeout=120
+        )
+        output = json.loads(proc.stdout)
+        
+        assert output['success'] is True
+        assert output['content'].count('<VOUCHER ') == 3
+        assert output['errors'] == []
+    
+    def test_export_fails_on_failed_file(self, statement_csv, tmp_path):
+        """Test a failed file stops the export unless --allow-partial is given."""
+        missing = str(tmp_path / "missing.csv")
+        target = tmp_path / "out.xml"
+        command = [sys.executable, str(CLI_PATH), "process", "--no-cache", "--export", "tally-xml",
+                   "--output", str(target), str(statement_csv), missing]
+        
+        proc = subprocess.run(command, capture_output=True, text=True, timeout=120)
+        output = json.loads(proc.stdout)
+        
+        assert proc.returncode == 1
+        assert output['success'] is False
+        assert [e['file'] for e in output['errors']] == [missing]
+        assert not target.exists()
+        
+        proc = subprocess.run(command + ["--allow-partial"], capture_output=True, text=True,
+                              timeout=120)
+        output = json.loads(proc.stdout)
+        
+        assert proc.returncode == 0
+        assert output['success'] is True
+        assert [e['file'] for e in output['errors']] == [missing]
+        assert target.read_text().count('<VOUCHER ') == 2
+
+
+class TestNDJSON:
+    """Tests for streaming NDJSON output."""
+    
+    def test_one_line_per_file(self, statement_csv, tmp_path):
+        """Test each file yields one compact, indexed line."""
+        files = [str(statement_csv), str(tmp_path / "missing.csv")]
+        stdout = io.StringIO()
+        cli.write_ndjson(files, stdout=stdout)
+        
+        lines = [json.loads(l) for l in stdout.getvalue().splitlines()]
+        assert [l['index'] for l in lines] == [0, 1]
+        assert lines[0]['transaction_count'] == 2
+        assert len(lines[0]['transactions']) == 2
+        assert lines[1]['status'] == 'error'
+    
+    def test_transaction_chunks(self, statement_csv):
+        """Test chunked mode emits transaction chunks before the summary."""
+        stdout = io.StringIO()
+        cli.write_ndjson([str(statement_csv)], chunk_size=1, stdout=stdout)
+        
+        lines = [json.loads(l) for l in stdout.getvalue().splitlines()]
+        assert [l.get('chunk') for l in lines] == [0, 1, None]
+        assert all(len(l['transactions']) == 1 for l in lines[:2])
+        assert 'transactions' not in lines[2]
+        assert lines[2]['transaction_count'] == 2
+
+
+class TestResultCache:
+    """Tests for --cache-dir result reuse."""
+    
+    def test_cache_hit_skips_parsing(self, statement_csv, tmp_path, monkeypatch):
+        """Test an unchanged file is served from the cache under its new path."""
+        cache_dir = str(tmp_path / "cache")
+        first = cli.process_files([str(statement_csv)], cache_dir=cache_dir)
+        
+        copy = tmp_path / "copy.csv"
+        copy.write_bytes(statement_csv.read_bytes())
+        monkeypatch.setattr(cli, '_process_path', lambda *a: pytest.fail("cache miss"))
+        second = cli.process_files([str(copy)], cache_dir=cache_dir)
+        
+        assert second[0]['file'] == str(copy)
+        assert second[0]['transactions'] == first[0]['transactions']
+
+
+class TestStreaming:
+    """Tests for --stream chunked processing."""
+    
+    def test_stream_ndjson_chunks(self, statement_csv):
+        """Test chunk lines are followed by a summary without transactions."""
+        stdout = io.StringIO()
+        
+        cli.write_ndjson([str(statement_csv)], chunk_size=1, stdout=stdout, stream=True)
+        
+        lines = [json.loads(l) for l in stdout.getvalue().splitlines()]
+        assert [l.get('chunk') for l in lines] == [0, 1, None]
+        assert lines[0]['transactions'][0]['description'] == 'Purchase'
+        assert lines[2]['status'] == 'success'
+        assert lines[2]['transaction_count'] == 2
+        assert 'transactions' not in lines[2]
+    
+    def test_stream_export_matches_export(self, statement_csv, tmp_path):
+        """Test streamed Tally XML equals the in-memory export."""
+        output = tmp_path / "out.xml"
+        
+        result = cli.stream_export([str(statement_csv)], 'tally-xml', str(output), chunk_size=1)
+        
+        records = cli.process_files([str(statement_csv)])[0]['transactions']
+        assert result['success'] is True
+        assert result['transaction_count'] == 2
+        assert output.read_text() == cli.export_transactions(records, 'tally-xml')['content']
+    
+    def test_stream_xlsx_matches_process(self, statement_csv, tmp_path):
+        """Test an .xlsx statement streams in chunks with the same transactions."""
+        import pandas as pd
+        xlsx_path = tmp_path / "statement.xlsx"
+        pd.read_csv(statement_csv, dtype=str).to_excel(xlsx_path, index=False)
+        
+        summary = {}
+        batches = list(cli.stream_file(str(xlsx_path), 1, summary))
+        
+        records = cli.process_files([str(xlsx_path)])[0]['transactions']
+        assert len(batches) == 2
+        assert summary['transaction_count'] == 2
+        assert [r for b in batches for r in b.to_records()] == records
+    
+    def test_stream_xlsx_all_sheets(self, tmp_path):
+        """Test every transaction sheet is streamed, with columns aligned by name."""
+        import openpyxl
+        xlsx_path = tmp_path / "monthly.xlsx"
+        workbook = openpyxl.Workbook()
+        workbook.active.append(['Statement summary'])
+        jan = workbook.create_sheet('Jan')
+        jan.append(['Date', 'Description', 'Debit', 'Credit', 'Balance'])
+        jan.append(['2024-01-05', 'Jan rent', '100', None, '900'])
+        feb = workbook.create_sheet('Feb')
+        feb.append(['Date', 'Description', 'Credit', 'Debit', 'Balance'])
+        feb.append(['2024-02-05', 'Feb rent', None, '100', '800'])
+        workbook.save(xlsx_path)
+        
+        summary = {}
+        batches = list(cli.stream_file(str(xlsx_path), 10, summary))
+        
+        records = [r for b in batches for r in b.to_records()]
+        assert summary['transaction_count'] == 2
+        assert [(r['description'], r['debit']) for r in records] == [('Jan rent', 100.0),
+                                                                      ('Feb rent', 100.0)]
+        assert records == cli.process_file(str(xlsx_path))['transactions']
+    
+    def test_stream_missing_file(self, tmp_path):
+        stdout = io.StringIO()
+        cli.write_ndjson([str(tmp_path / "nope.csv")], stdout=stdout, stream=True)
+        assert json.loads(stdout.getvalue())['status'] == 'error'
+
+
+class TestColumnarCLI:
+    """Tests for columnar process -> export piping."""
+    
+    def test_columnar_export_matches_json(self, statement_csv):
+        """Test both wire formats produce identical Tally XML."""
+        def run(args, stdin):
+            return subprocess.run(
+                [sys.executable, str(CLI_PATH), *args], input=stdin,
+                capture_output=True, timeout=120
+            ).stdout
+        
+        frames = run(["process", "--no-cache", "--columnar", str(statement_csv)], b"")
+        from_columnar = json.loads(run(["export", "--format", "tally-xml", "--input-format", "columnar"], frames))
+        
+        results = json.loads(run(["process", "--no-cache", str(statement_csv)], b""))
+        from_json = json.loads(run(["export", "--format", "tally-xml"], json.dumps(results[0]['transactions']).encode()))
+        
+        assert from_columnar['success'] is True
+        assert from_columnar == from_json
+
+
+def imported_modules(args, stdin=""):
+    """Run cli.py under -X importtime; return (top-level modules, total seconds)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", str(CLI_PATH), *args],
+        input=stdin, capture_output=True, text=True, timeout=120
+    )
+    assert proc.returncode == 0, proc.stderr
+    modules = set()
+    total_us = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        total_us += int(self_us)
+        modules.add(name.strip().split(".")[0])
+    return modules, total_us / 1e6
+
+
+class TestStartup:
+    """Cold-start benchmarks for the CLI entry point."""
+    
+    def test_export_skips_heavy_imports(self, capsys):
+        """Test `cli.py export` loads neither cv2, openpyxl nor pandas."""
+        modules, seconds = imported_modules(["export", "--format", "tally-xml"], stdin="[]")
+        with capsys.disabled():
+            print(f"\n[startup] export imports: {seconds * 1000:.1f} ms")
+        
+        assert "cv2" not in modules
+        assert "openpyxl" not in modules
+        assert "pandas" not in modules
+    
+    def test_csv_process_skips_excel_and_ocr(self, statement_csv):
+        """Test processing a CSV never touches openpyxl or cv2."""
+        modules, _ = imported_modules(["process", "--no-cache", str(statement_csv)])
+        
+        assert "cv2" not in modules
+        assert "openpyxl" not in modules
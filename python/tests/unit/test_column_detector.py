@@ -0,0 +1,99 @@
+"""Unit tests for shared header-to-field detection."""
+
+import pytest
+import pandas as pd
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from parsers.column_detector import ColumnDetector
+from parsers.csv_parser import CSVParser
+from adapters.std_adapter import StandardAdapter
+
+
+class TestColumnDetector:
+    """Test cases for ColumnDetector."""
+
+    def test_exact_headers(self):
+        """Test plain headers map with full confidence."""
+        mapping = ColumnDetector.detect(['Date', 'Description', 'Debit', 'Credit', 'Balance'])
+
+        assert mapping.columns == {
+            'date': 'Date', 'description': 'Description',
+            'debit': 'Debit', 'credit': 'Credit', 'balance': 'Balance',
+        }
+        assert mapping.confidence['date'] == 1.0
+        assert 'amount' not in mapping
+
+    def test_punctuation_and_contained_keywords(self):
+        """Test HDFC-style headers with punctuation and extra words."""
+        mapping = ColumnDetector.detect([
+            'Date', 'Narration', 'Chq./Ref.No.', 'Value Dt',
+            'Withdrawal Amt.', 'Deposit Amt.', 'Closing Balance'
+        ])
+
+        assert mapping.get('debit') == 'Withdrawal Amt.'
+        assert mapping.get('credit') == 'Deposit Amt.'
+        assert mapping.get('reference') == 'Chq./Ref.No.'
+        assert mapping.get('balance') == 'Closing Balance'
+        assert 'amount' not in mapping
+
+    def test_fuzzy_match(self):
+        """Test near-miss spellings still map, with lower confidence."""
+        mapping = ColumnDetector.detect(['Txn Date', 'Naration', 'Amount'])
+
+        assert mapping.get('description') == 'Naration'
+        assert mapping.confidence['description'] < mapping.confidence['date']
+
+    def test_specific_date_column_preferred(self):
+        """Test transaction date wins over value date."""
+        mapping = ColumnDetector.detect(['Value Date', 'Txn Date', 'Description'])
+
+        assert mapping.get('date') == 'Txn Date'
+
+    def test_side_indicator_not_amount(self):
+        """Test a Dr/Cr indicator column is not taken as debit or credit."""
+        mapping = ColumnDetector.detect(['Date', 'Amount', 'Dr/Cr'])
+
+        assert mapping.get('amount') == 'Amount'
+        assert 'debit' not in mapping
+        assert 'credit' not in mapping
+
+    def test_memoized_by_signature(self):
+        """Test equivalent header rows reuse the cached assignment."""
+        ColumnDetector.detect(['Posting Date', 'Remarks', 'Amount'])
+        hits = ColumnDetector._detect_signature.cache_info().hits
+
+        mapping = ColumnDetector.detect([' POSTING DATE ', 'remarks', 'amount'])
+
+        assert ColumnDetector._detect_signature.cache_info().hits == hits + 1
+        assert mapping.get('date') == ' POSTING DATE '
+
+    def test_unknown_headers(self):
+        """Test unrelated headers produce an empty mapping."""
+        mapping = ColumnDetector.detect(['Foo', 'Bar', 42])
+
+        assert mapping.columns == {}
+        assert mapping.confidence == {}
+
+
+class TestSharedDetection:
+    """Parsers and adapters agree on the mapping."""
+
+    def test_parser_and_adapter_agree(self, tmp_path):
+        """Test CSVParser and StandardAdapter use the same mapping."""
+        csv_file = tmp_path / "statement.csv"
+        csv_file.write_text(
+            "Tran Date,Particulars,Withdrawals,Deposits,Balance\n"
+            "01/04/2024,Opening,,1000.00,1000.00\n"
+        )
+        parser = CSVParser(str(csv_file))
+        df = parser.parse()
+
+        adapter = StandardAdapter(df)
+        transactions = adapter.process()
+
+        assert parser.detect_columns(df) == adapter.column_mapping.columns
+        assert parser.get_info()['column_confidence'] == adapter.column_mapping.confidence
+        assert transactions[0].credit == 1000.0
@@ -0,0 +1,63 @@
+"""Unit tests for the columnar transaction interchange format."""
+
+import pytest
+from datetime import datetime
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from adapters.transaction import Transaction
+from exporters.columnar import (
+    encode_transactions, encode_records, decode_transactions, iter_frames
+)
+
+
+@pytest.fixture
+def transactions():
+    return [
+        Transaction(
+            date=datetime(2024, 1, 1), description="Payment ₹ to Vendor",
+            debit=500.25, credit=0.0, balance=1000.0, reference_no="REF001",
+            value_date=datetime(2024, 1, 2, 10, 30)
+        ),
+        Transaction(
+            date=datetime(1969, 12, 31), description="",
+            debit=0.0, credit=2000.0, balance=3000.0
+        ),
+    ]
+
+
+class TestColumnar:
+    """Test cases for frame encoding and decoding."""
+    
+    def test_round_trip_transactions(self, transactions):
+        """Test Transaction objects survive encode/decode unchanged."""
+        assert decode_transactions(encode_transactions(transactions)) == transactions
+    
+    def test_records_match_objects(self, transactions):
+        """Test encoding to_dict records gives the same frame as objects."""
+        records = [t.to_dict() for t in transactions]
+        assert encode_records(records) == encode_transactions(transactions)
+    
+    def test_multiple_frames_and_meta(self, transactions):
+        """Test a stream of frames decodes in order with its metadata."""
+        stream = (
+            encode_transactions(transactions[:1], {'index': 0, 'file': 'a.csv'})
+            + encode_transactions([], {'index': 1, 'status': 'error'})
+            + encode_transactions(transactions[1:], {'index': 2})
+        )
+        frames = list(iter_frames(stream))
+        
+        assert [meta for meta, _ in frames] == [
+            {'index': 0, 'file': 'a.csv'}, {'index': 1, 'status': 'error'}, {'index': 2}
+        ]
+        assert frames[1][1]['date'] == []
+        assert decode_transactions(stream) == transactions
+    
+    def test_rejects_garbage(self):
+        """Test non-frame input raises ValueError."""
+        with pytest.raises(ValueError):
+            decode_transactions(b'[{"date": "2024-01-01"}]')
+        with pytest.raises(ValueError):
+            decode_transactions(encode_transactions([])[:-1] + b'LDGC')
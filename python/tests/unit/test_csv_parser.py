@@ -56,6 +56,21 @@ class TestCSVParser:
         assert len(df) == 2
         assert len(df.columns) == 5
     
+    def test_parse_chunks(self, tmp_path):
+        """Test chunked parsing yields bounded chunks with stable columns."""
+        csv_file = tmp_path / "big.csv"
+        rows = [f"2024-01-{d:02d},Txn {d},{d},,{1000 - d}" for d in range(1, 11)]
+        rows.insert(4, ",,,,")
+        csv_file.write_text("Date,Description,Debit,Credit,Balance\n" + "\n".join(rows))
+        
+        parser = CSVParser(str(csv_file))
+        chunks = list(parser.parse_chunks(chunksize=4))
+        
+        assert [len(c) for c in chunks] == [4, 3, 3]
+        assert all(list(c.columns) == list(chunks[0].columns) for c in chunks)
+        assert 'Credit' in chunks[0].columns  # empty columns kept in chunks
+        assert pd.concat(chunks)['Description'].tolist() == parser.parse()['Description'].tolist()
+    
     def test_validate_empty_csv(self, tmp_path):
         """Test validation fails for empty CSV."""
         csv_file = tmp_path / "empty.csv"
@@ -101,3 +116,228 @@ class TestCSVParser:
         assert info['num_columns'] == 3
         assert info['detected_delimiter'] == ','
         assert info['is_valid'] == True
+
+
+class TestCSVPreamble:
+    """Test cases for statements with account details above the table."""
+    
+    @pytest.fixture
+    def csv_file(self, tmp_path):
+        csv_file = tmp_path / "preamble.csv"
+        csv_file.write_text(
+            "State Bank of India\n"
+            "Account Name,RAVI KUMAR\n"
+            "Account Number,'00000012345\n"
+            "\n"
+            "Txn Date,Description,Ref No,Debit,Credit,Balance\n"
+            "01/04/2024,UPI/SWIGGY,R1,250.50,,8749.50\n"
+            "02/04/2024,SALARY,,,1000.00,9749.50\n"
+        )
+        return csv_file
+    
+    def test_parse_skips_preamble(self, csv_file):
+        """Test the table is read from the located header row."""
+        parser = CSVParser(str(csv_file))
+        df = parser.parse()
+        
+        assert list(df.columns) == ['Txn Date', 'Description', 'Ref No', 'Debit', 'Credit', 'Balance']
+        assert len(df) == 2
+        assert parser.header.row == 4
+        assert parser.preamble.startswith('State Bank of India')
+    
+    def test_parse_chunks_skips_preamble(self, csv_file):
+        """Test chunked reads start at the header too."""
+        chunks = list(CSVParser(str(csv_file)).parse_chunks(chunksize=1))
+        
+        assert [len(c) for c in chunks] == [1, 1]
+        assert chunks[0].columns[0] == 'Txn Date'
+    
+    def test_get_info_reports_preamble(self, csv_file):
+        """Test get_info exposes the header row and preamble text."""
+        info = CSVParser(str(csv_file)).get_info()
+        
+        assert info['header_row'] == 4
+        assert 'RAVI KUMAR' in info['preamble']
+        assert info['column_mapping']['date'] == 'Txn Date'
+
+
+class TestEarlyDetection:
+    """Test cases for bounded probing and bank layouts."""
+    
+    def test_probe_text_leaves_out_transactions(self, tmp_path):
+        """Test the probe covers the preamble and header, not the rows."""
+        csv_file = tmp_path / "probe.csv"
+        csv_file.write_text(
+            "Axis Bank Ltd\n"
+            "Tran Date,PARTICULARS,CHQNO,DR,CR,BAL\n"
+            + "01-04-2024,NEFT HDFC Bank,1,10.00,,90.00\n" * 3
+        )
+        parser = CSVParser(str(csv_file))
+        
+        assert parser.probe_text() == "Axis Bank Ltd\nTran Date,PARTICULARS,CHQNO,DR,CR,BAL"
+    
+    def test_probe_text_without_header(self, tmp_path):
+        """Test unrecognized files probe their first lines."""
+        csv_file = tmp_path / "probe.csv"
+        csv_file.write_text("Kotak Mahindra Bank\ncol1,col2\n" + "a,b\n" * 100)
+        
+        lines = CSVParser(str(csv_file)).probe_text().splitlines()
+        
+        assert lines[0] == "Kotak Mahindra Bank"
+        assert len(lines) == 30
+    
+    def test_layout_locates_bank_header(self, tmp_path):
+        """Test a bank layout finds a header the generic keywords miss."""
+        from adapters.layout import BankLayout
+        layout = BankLayout.from_dict({
+            'bank': 'TEST',
+            'columns': {'date': ['Posted On'], 'description': ['Txn Info'], 'amount': ['Value']},
+        })
+        csv_file = tmp_path / "layout.csv"
+        csv_file.write_text(
+            "Test Bank\n"
+            "Account,123\n"
+            "Posted On;Txn Info;Value\n"
+            "01/04/2024;UPI;-10.00\n"
+        )
+        parser = CSVParser(str(csv_file))
+        assert not parser.header.found
+        
+        parser.use_layout(layout)
+        df = parser.parse()
+        
+        assert parser.header.row == 2
+        assert parser.detect_delimiter() == ';'
+        assert list(df.columns) == ['Posted On', 'Txn Info', 'Value']
+        assert len(df) == 1
+
+
+class TestCSVSession:
+    """Test cases for the shared parse session."""
+    
+    @pytest.fixture
+    def csv_file(self, tmp_path):
+        csv_file = tmp_path / "session.csv"
+        csv_file.write_text("Date;Description;Amount\n2024-01-01;Test;100\n2024-01-02;Test2;200")
+        return csv_file
+    
+    def test_get_info_reads_file_once(self, csv_file, monkeypatch):
+        """Test sniffing, parsing, detection and validation share one read."""
+        import parsers.csv_parser as csv_parser
+        reads = []
+        read_csv = csv_parser.pd.read_csv
+        monkeypatch.setattr(csv_parser.pd, 'read_csv', lambda *a, **k: reads.append(a) or read_csv(*a, **k))
+        maps = []
+        mmap_cls = csv_parser.mmap.mmap
+        monkeypatch.setattr(csv_parser.mmap, 'mmap', lambda *a, **k: maps.append(a) or mmap_cls(*a, **k))
+        
+        parser = CSVParser(str(csv_file))
+        info = parser.get_info()
+        parser.detect_columns()
+        parser.validate_structure()
+        
+        assert info['detected_delimiter'] == ';'
+        assert info['num_rows'] == 2
+        assert len(reads) == 1
+        assert len(maps) == 1
+    
+    def test_changed_file_is_reread(self, csv_file):
+        """Test the session notices the file changing on disk."""
+        parser = CSVParser(str(csv_file))
+        assert len(parser.parse()) == 2
+        
+        csv_file.write_text("Date,Description,Amount\n2024-01-01,Test,100")
+        
+        assert parser.detect_delimiter() == ','
+        assert len(parser.parse()) == 1
+    
+    def test_empty_file(self, tmp_path):
+        """Test sniffing an empty file falls back to comma."""
+        csv_file = tmp_path / "empty.csv"
+        csv_file.write_bytes(b"")
+        
+        parser = CSVParser(str(csv_file))
+        
+        assert parser.detect_delimiter() == ','
+        with pytest.raises(RuntimeError):
+            parser.parse()
+
+
+class TestCSVEngines:
+    """Test cases for the optional pyarrow engine."""
+    
+    @pytest.fixture
+    def csv_file(self, tmp_path):
+        csv_file = tmp_path / "engines.csv"
+        csv_file.write_text(
+            "Txn Date,Description,Ref No,Debit,Credit,Balance,Branch\n"
+            "01/04/2024,UPI/SWIGGY,R1,\"1,250.50\",,\"8,749.50\",12\n"
+            "02/04/2024,UPI/SWIGGY,,,100.00,\"8,849.50\",12\n"
+            ",,,,,,\n"
+        )
+        return csv_file
+    
+    def test_unknown_engine(self, csv_file):
+        with pytest.raises(ValueError, match="Unknown CSV engine"):
+            CSVParser(str(csv_file), engine='python')
+    
+    def test_falls_back_without_pyarrow(self, csv_file, monkeypatch):
+        """Test the C engine is used when pyarrow cannot be imported."""
+        import parsers.arrow_csv as arrow_csv
+        monkeypatch.setattr(arrow_csv, '_pyarrow', False)
+        
+        parser = CSVParser(str(csv_file), engine='pyarrow')
+        
+        assert parser.engine_used == 'c'
+        assert len(parser.parse()) == 2
+    
+    def test_pyarrow_matches_c_engine(self, csv_file):
+        """Test both engines give the same transactions."""
+        pytest.importorskip("pyarrow")
+        from adapters.std_adapter import StandardAdapter
+        
+        arrow = CSVParser(str(csv_file), engine='pyarrow')
+        df = arrow.parse()
+        
+        assert arrow.engine_used == 'pyarrow'
+        assert df['Debit'].dtype == object
+        assert isinstance(df['Description'].dtype, pd.CategoricalDtype)
+        assert StandardAdapter(df).process() == StandardAdapter(CSVParser(str(csv_file)).parse()).process()
+    
+    def test_engines_agree_on_numeric_references_and_padded_headers(self, tmp_path):
+        """Test both engines keep references as text under padded labels."""
+        pytest.importorskip("pyarrow")
+        from adapters.std_adapter import StandardAdapter
+        csv_file = tmp_path / "padded.csv"
+        csv_file.write_text(
+            "ACCOUNT STATEMENT\n"
+            " Date , Description , Ref No , Debit , Credit , Balance \n"
+            "01/04/2024,UPI/SWIGGY,12345,250.50,,8749.50\n"
+            "02/04/2024,NEFT IN,999,,100,8849.50\n"
+        )
+        
+        arrow = CSVParser(str(csv_file), engine='pyarrow')
+        c = CSVParser(str(csv_file), engine='c')
+        
+        assert arrow.engine_used == 'pyarrow'
+        assert isinstance(arrow.parse()[' Ref No '].dtype, pd.CategoricalDtype)
+        assert arrow.parse()[' Ref No '].tolist() == c.parse()[' Ref No '].tolist() == ['12345', '999']
+        assert StandardAdapter(arrow.parse()).process() == StandardAdapter(c.parse()).process()
+    
+    def test_pyarrow_ragged_rows_fall_back(self, tmp_path):
+        """Test a short footer row pyarrow rejects is read with the C engine."""
+        pytest.importorskip("pyarrow")
+        csv_file = tmp_path / "ragged.csv"
+        csv_file.write_text(
+            "Date,Description,Debit,Credit,Balance\n"
+            "01/04/2024,NEFT IN,,500.00,1500.00\n"
+            "Total,,500.00\n"
+        )
+        
+        arrow = CSVParser(str(csv_file), engine='pyarrow')
+        df = arrow.parse()
+        
+        assert arrow.engine_used == 'c'
+        assert arrow.get_info()['engine'] == 'c'
+        pd.testing.assert_frame_equal(df, CSVParser(str(csv_file), engine='c').parse())
+        assert df['Date'].tolist() == ['01/04/2024', 'Total']
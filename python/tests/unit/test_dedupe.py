@@ -0,0 +1,141 @@
+"""Unit tests for duplicate transaction detection."""
+
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from adapters.dedupe import DuplicateIndex, transaction_fingerprint
+from cache.history_index import HistoryIndex
+
+
+def record(day, description, debit=0.0, credit=0.0, balance=0.0, ref=None):
+    return {
+        'date': f'2024-03-{day:02d}T00:00:00', 'description': description,
+        'debit': debit, 'credit': credit, 'balance': balance,
+        'reference_no': ref, 'value_date': None,
+    }
+
+
+def result(file, records):
+    return {'file': file, 'status': 'success', 'transaction_count': len(records),
+            'transactions': records}
+
+
+MARCH = [
+    record(30, 'UPI/SWIGGY', debit=250, balance=9750),
+    record(31, 'NEFT ACME', credit=5000, balance=14750),
+]
+
+
+class TestFingerprint:
+    """Test cases for transaction_fingerprint."""
+
+    def test_normalizes_text_and_amounts(self):
+        """Test spacing, case and float noise do not change the key."""
+        a = record(1, 'upi/swiggy  ', debit=250.0, balance=9750.004)
+        b = record(1, ' UPI/SWIGGY', debit=250, balance=9750)
+
+        assert transaction_fingerprint(a) == transaction_fingerprint(b)
+
+    def test_reference_preferred_over_description(self):
+        """Test the reference decides when present."""
+        a = record(1, 'NEFT-ACME CORP', credit=10, balance=10, ref='N123')
+        b = record(1, 'NEFT ACME', credit=10, balance=10, ref='N123')
+
+        assert transaction_fingerprint(a) == transaction_fingerprint(b)
+
+    def test_balance_separates_same_day_repeats(self):
+        """Test two identical payments on one day stay distinct."""
+        a = record(1, 'TEA', debit=20, balance=980)
+        b = record(1, 'TEA', debit=20, balance=960)
+
+        assert transaction_fingerprint(a) != transaction_fingerprint(b)
+
+
+class TestDuplicateIndex:
+    """Test cases for DuplicateIndex."""
+
+    def test_flag_overlap(self):
+        """Test the later file's overlapping rows point at the first file."""
+        index = DuplicateIndex('flag')
+        first = result('march.csv', [dict(r) for r in MARCH])
+        second = result('q1.csv', [dict(MARCH[1]), record(31, 'ATM', debit=100, balance=14650)])
+
+        assert index.apply(first, '0') == 0
+        assert index.apply(second, '1') == 1
+
+        assert second['transactions'][0]['duplicate_of'] == {'file': 'march.csv', 'index': 1}
+        assert 'duplicate_of' not in second['transactions'][1]
+        assert second['transaction_count'] == 2
+
+    def test_drop_overlap(self):
+        """Test drop mode removes duplicates and fixes the count."""
+        index = DuplicateIndex('drop')
+        index.apply(result('march.csv', [dict(r) for r in MARCH]), '0')
+        second = result('q1.csv', [dict(r) for r in MARCH])
+
+        index.apply(second, '1')
+
+        assert second['transactions'] == []
+        assert second['transaction_count'] == 0
+        assert second['duplicate_count'] == 2
+
+    def test_repeats_within_one_file_kept(self):
+        """Test a file never duplicates itself."""
+        index = DuplicateIndex('drop')
+        rows = [record(1, 'TEA', debit=20), record(1, 'TEA', debit=20)]
+
+        assert index.apply(result('a.csv', rows), '0') == 0
+        assert len(rows) == 2
+
+    def test_errors_ignored(self):
+        """Test failed results pass through untouched."""
+        failed = {'file': 'x.pdf', 'status': 'error', 'message': 'boom'}
+
+        assert DuplicateIndex().apply(failed, '0') == 0
+        assert 'duplicate_count' not in failed
+
+    def test_unknown_mode(self):
+        with pytest.raises(ValueError):
+            DuplicateIndex('merge')
+
+
+class TestHistoryIndex:
+    """Test cases for the persisted history index."""
+
+    def test_duplicates_across_runs(self, tmp_path):
+        """Test a later run sees transactions recorded by an earlier one."""
+        history = HistoryIndex(str(tmp_path))
+        DuplicateIndex('flag', history).apply(result('march.csv', [dict(r) for r in MARCH]), '0', 'digest-a')
+        assert len(history) == 2
+
+        second = result('q1.csv', [dict(r) for r in MARCH])
+        assert DuplicateIndex('flag', history).apply(second, '0', 'digest-b') == 2
+        assert second['transactions'][0]['duplicate_of'] == {'file': 'march.csv', 'index': 0}
+        history.close()
+
+    def test_reprocessing_same_file_is_not_duplicate(self, tmp_path):
+        """Test entries from the same file content are ignored."""
+        history = HistoryIndex(str(tmp_path))
+        DuplicateIndex('flag', history).apply(result('march.csv', [dict(r) for r in MARCH]), '0', 'digest-a')
+
+        again = result('march.csv', [dict(r) for r in MARCH])
+
+        assert DuplicateIndex('flag', history).apply(again, '0', 'digest-a') == 0
+        history.close()
+
+    def test_lookup_batches(self, tmp_path):
+        """Test lookups larger than SQLite's parameter limit."""
+        history = HistoryIndex(str(tmp_path))
+        entries = [(i.to_bytes(16, 'big'), 'src', 'f.csv', i) for i in range(1500)]
+        history.add(entries)
+
+        hits = history.lookup([e[0] for e in entries])
+
+        assert len(hits) == 1500
+        assert history.lookup([e[0] for e in entries], exclude_source='src') == {}
+        history.clear()
+        assert len(history) == 0
+        history.close()
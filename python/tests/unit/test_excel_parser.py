@@ -102,3 +102,205 @@ class TestExcelParser:
         assert info['num_rows'] == 2
         assert info['is_valid'] == True
         assert 'Date' in info['columns']
+
+    def test_parse_skips_preamble(self, tmp_path):
+        """Test preamble rows above the header are skipped and exposed."""
+        file_path = tmp_path / "preamble.xlsx"
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet['A1'] = 'HDFC BANK'
+        sheet['A3'] = 'Account No'
+        sheet['B3'] = '50100012345'
+        sheet.append(['Date', 'Narration', 'Withdrawal Amt.', 'Deposit Amt.', 'Closing Balance'])
+        sheet.append(['01/04/24', 'UPI', '100', None, '900'])
+        workbook.save(file_path)
+        
+        parser = ExcelParser(str(file_path))
+        df = parser.parse()
+        
+        assert list(df.columns) == ['Date', 'Narration', 'Withdrawal Amt.', 'Closing Balance']
+        assert len(df) == 1
+        assert parser.locate_header().row == 3
+        assert parser.preamble == 'HDFC BANK\nAccount No 50100012345'
+    
+    def test_parse_chunks(self, sample_xlsx):
+        """Test streamed chunks match the whole-sheet parse."""
+        parser = ExcelParser(str(sample_xlsx))
+        chunks = list(parser.parse_chunks(chunksize=1))
+        
+        assert [len(c) for c in chunks] == [1, 1]
+        streamed = pd.concat(chunks).dropna(axis=1, how='all')
+        expected = parser.parse()
+        assert list(streamed.columns) == list(expected.columns)
+        assert streamed.fillna('').values.tolist() == expected.fillna('').values.tolist()
+    
+    def test_parse_chunks_skips_preamble_and_blank_rows(self, tmp_path):
+        """Test streaming starts at the located header and drops empty rows."""
+        file_path = tmp_path / "stream.xlsx"
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet['A1'] = 'ICICI Bank'
+        sheet.append(['Transaction Date', 'Particulars', 'Debit', 'Credit', 'Balance'])
+        sheet.append(['01/04/2024', 'NEFT', 1500.0, None, 98500.25])
+        sheet.append([None, None, None, None, None])
+        sheet.append(['02/04/2024', 'UPI', None, 20, 98520.25])
+        workbook.save(file_path)
+        
+        chunks = list(ExcelParser(str(file_path)).parse_chunks())
+        
+        assert len(chunks) == 1
+        assert list(chunks[0].columns) == ['Transaction Date', 'Particulars', 'Debit', 'Credit', 'Balance']
+        assert chunks[0]['Debit'].tolist() == ['1500', None]
+        assert chunks[0]['Balance'].tolist() == ['98500.25', '98520.25']
+
+
+class TestExcelSession:
+    """Test cases for the shared workbook and multi-sheet parsing."""
+    
+    @pytest.fixture
+    def monthly_xlsx(self, tmp_path):
+        """Workbook with a summary sheet and one sheet per month."""
+        file_path = tmp_path / "monthly.xlsx"
+        workbook = openpyxl.Workbook()
+        summary = workbook.active
+        summary.title = 'Summary'
+        summary.append(['Account', '50100012345'])
+        for month in ('Jan', 'Feb', 'Mar'):
+            sheet = workbook.create_sheet(month)
+            sheet.append(['Date', 'Narration', 'Withdrawal Amt.', 'Closing Balance'])
+            sheet.append([f'01-{month}-24', f'{month} rent', '100', '900'])
+            sheet.append([f'02-{month}-24', f'{month} food', '50', '850'])
+        workbook.save(file_path)
+        return file_path
+    
+    def test_get_info_opens_workbook_once(self, monthly_xlsx, monkeypatch):
+        """Test sheet listing, header location and parsing share one open."""
+        import parsers.excel_parser as excel_parser
+        opens = []
+        excel_file = excel_parser.pd.ExcelFile
+        monkeypatch.setattr(excel_parser.pd, 'ExcelFile', lambda *a, **k: opens.append(a) or excel_file(*a, **k))
+        
+        with ExcelParser(str(monthly_xlsx)) as parser:
+            parser.get_info()
+            parser.parse_all_sheets()
+        
+        assert len(opens) == 1
+    
+    def test_transaction_sheets(self, monthly_xlsx):
+        """Test summary sheets are not treated as transaction tables."""
+        with ExcelParser(str(monthly_xlsx)) as parser:
+            assert parser.transaction_sheets() == ['Jan', 'Feb', 'Mar']
+    
+    def test_parse_all_sheets_in_order(self, monthly_xlsx):
+        """Test transaction sheets are concatenated in workbook order."""
+        with ExcelParser(str(monthly_xlsx)) as parser:
+            df = parser.parse_all_sheets(max_workers=3)
+        
+        assert list(df.columns) == ['Date', 'Narration', 'Withdrawal Amt.', 'Closing Balance']
+        assert df['Narration'].tolist() == [
+            'Jan rent', 'Jan food', 'Feb rent', 'Feb food', 'Mar rent', 'Mar food'
+        ]
+    
+    def test_parse_all_sheets_single_sheet(self, tmp_path):
+        """Test a one-sheet workbook parses like parse()."""
+        file_path = tmp_path / "single.xlsx"
+        pd.DataFrame({'Date': ['2024-01-01'], 'Description': ['A'], 'Debit': ['1']}).to_excel(file_path, index=False)
+        
+        parser = ExcelParser(str(file_path))
+        
+        assert parser.parse_all_sheets().equals(parser.parse())
+
+
+class TestExcelEngines:
+    """Test cases for engine selection."""
+    
+    @pytest.fixture
+    def sample_xlsx(self, tmp_path):
+        file_path = tmp_path / "engines.xlsx"
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.append(['KOTAK MAHINDRA BANK'])
+        sheet.append(['Date', 'Description', 'Debit', 'Credit', 'Balance'])
+        sheet.append(['01/04/2024', 'UPI', 100.0, None, 1000.5])
+        sheet.append(['02/04/2024', 'NEFT', None, '2,000.00', 3000.5])
+        workbook.save(file_path)
+        return file_path
+    
+    def test_unknown_engine(self, sample_xlsx):
+        with pytest.raises(ValueError, match="Unknown Excel engine"):
+            ExcelParser(str(sample_xlsx), engine='xlsxwriter')
+    
+    def test_falls_back_without_calamine(self, sample_xlsx, monkeypatch):
+        """Test calamine and auto use openpyxl when calamine is missing."""
+        import parsers.excel_parser as excel_parser
+        monkeypatch.setattr(excel_parser, 'calamine_available', lambda: False)
+        
+        for engine in ('calamine', 'auto'):
+            parser = ExcelParser(str(sample_xlsx), engine=engine)
+            assert parser.engine_used == 'openpyxl'
+            assert len(parser.parse()) == 2
+    
+    def test_calamine_needs_pandas_2_2(self, monkeypatch):
+        """Test pandas releases without the calamine engine fall back."""
+        import parsers.excel_parser as excel_parser
+        monkeypatch.setattr(excel_parser.pd, '__version__', '2.1.4')
+        
+        assert not excel_parser.calamine_available()
+    
+    @pytest.mark.parametrize('engine', ['openpyxl', 'calamine'])
+    def test_parse_all_sheets_threaded(self, tmp_path, engine):
+        """Test worker threads can share one workbook under either engine."""
+        if engine == 'calamine':
+            pytest.importorskip('python_calamine')
+        file_path = tmp_path / "threaded.xlsx"
+        workbook = openpyxl.Workbook()
+        workbook.remove(workbook.active)
+        for month in range(1, 13):
+            sheet = workbook.create_sheet(f'M{month:02d}')
+            sheet.append(['Date', 'Narration', 'Withdrawal Amt.', 'Closing Balance'])
+            for day in range(1, 201):
+                date = f'{day % 28 + 1:02d}/{month:02d}/24'
+                sheet.append([date, f'M{month} row {day}', '10', '900'])
+        workbook.save(file_path)
+        
+        with ExcelParser(str(file_path), engine=engine) as parser:
+            assert parser.engine_used == engine
+            df = parser.parse_all_sheets(max_workers=4)
+        
+        assert len(df) == 12 * 200
+        assert df['Narration'].iloc[[0, -1]].tolist() == ['M1 row 1', 'M12 row 200']
+    
+    def test_calamine_matches_openpyxl(self, sample_xlsx):
+        """Test both engines produce the same frame and preamble."""
+        pytest.importorskip('python_calamine')
+        
+        fast = ExcelParser(str(sample_xlsx), engine='calamine')
+        slow = ExcelParser(str(sample_xlsx), engine='openpyxl')
+        
+        assert fast.get_info()['engine'] == 'calamine'
+        pd.testing.assert_frame_equal(fast.parse(), slow.parse())
+        assert fast.preamble == slow.preamble == 'KOTAK MAHINDRA BANK'
+    
+    def test_calamine_streams_through_openpyxl(self, sample_xlsx):
+        """Test parse_chunks still works when parsing with calamine."""
+        pytest.importorskip('python_calamine')
+        
+        with ExcelParser(str(sample_xlsx), engine='calamine') as parser:
+            chunks = list(parser.parse_chunks())
+        
+        assert chunks[0]['Description'].tolist() == ['UPI', 'NEFT']
+    
+    def test_probe_text(self, tmp_path):
+        """Test the first sheet's preamble and header are probed."""
+        file_path = tmp_path / "probe.xlsx"
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.append(['Bank of Baroda'])
+        sheet.append(['TRAN DATE', 'NARRATION', 'WITHDRAWAL(DR)', 'DEPOSIT(CR)', 'BALANCE(INR)'])
+        sheet.append(['01/04/2024', 'NEFT ICICI Bank', '10', None, '90'])
+        workbook.save(file_path)
+        
+        with ExcelParser(str(file_path)) as parser:
+            text = parser.probe_text()
+        
+        assert text == 'Bank of Baroda\nTRAN DATE,NARRATION,WITHDRAWAL(DR),DEPOSIT(CR),BALANCE(INR)'
@@ -0,0 +1,87 @@
+"""Unit tests for the header locator."""
+
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from parsers.header_locator import HeaderLocator
+
+
+class TestHeaderLocator:
+    """Test cases for HeaderLocator class."""
+    
+    def test_header_on_first_line(self):
+        """Test a plain export is located at row 0 with no preamble."""
+        location = HeaderLocator.locate_text("Date,Description,Debit,Credit,Balance\n2024-01-01,A,1,,2\n")
+        
+        assert location.found
+        assert location.row == 0
+        assert location.delimiter == ','
+        assert location.text == ''
+    
+    def test_preamble_lines_are_skipped(self):
+        """Test the header is found below account details and blank lines."""
+        prefix = (
+            "STATE BANK OF INDIA\n"
+            "Account Name,RAVI KUMAR\n"
+            "\n"
+            "Period,01/04/2024 to 30/04/2024\n"
+            "Txn Date;Description;Ref No;Debit;Credit;Balance\n"
+            "01/04/2024;UPI;R1;10;;90\n"
+        )
+        location = HeaderLocator.locate_text(prefix)
+        
+        assert location.row == 4
+        assert location.delimiter == ';'
+        assert location.columns[0] == 'Txn Date'
+        assert location.preamble == [
+            'STATE BANK OF INDIA', 'Account Name,RAVI KUMAR', 'Period,01/04/2024 to 30/04/2024'
+        ]
+    
+    def test_cut_last_line_is_ignored(self):
+        """Test a header cut off at the end of an incomplete prefix is not used."""
+        location = HeaderLocator.locate_text("Bank\nDate,Description,Deb", complete=False)
+        
+        assert not location.found
+        assert location.row == 0
+    
+    def test_no_header(self):
+        """Test unrecognized files fall back to row 0."""
+        location = HeaderLocator.locate_text("col1,col2,col3\nval1,val2,val3")
+        
+        assert not location.found
+        assert location.delimiter is None
+    
+    def test_locate_rows(self):
+        """Test locating the header among sheet rows with missing cells."""
+        rows = [
+            ['HDFC BANK', None, None],
+            [None, None, None],
+            ['Date', 'Narration', 'Withdrawal Amt.'],
+            ['01/04/24', 'a', '1'],
+        ]
+        location = HeaderLocator.locate(rows)
+        
+        assert location.row == 2
+        assert location.preamble == ['HDFC BANK']
+    
+    def test_scan_is_bounded(self):
+        """Test rows past MAX_ROWS are not scanned."""
+        rows = [['x']] * HeaderLocator.MAX_ROWS + [['Date', 'Description', 'Amount']]
+        
+        assert not HeaderLocator.locate(rows).found
+
+    def test_fallback_only_when_no_generic_header(self):
+        """Test a bank-specific header test is used only as a fallback."""
+        prefix = "Bank\nPosted On,Txn Info,Value\n01/04/2024,A,1\n"
+        known = lambda cells: cells[:1] == ['Posted On']
+        
+        assert not HeaderLocator.locate_text(prefix).found
+        location = HeaderLocator.locate_text(prefix, fallback=known)
+        assert location.row == 1
+        assert location.preamble == ['Bank']
+        
+        generic = "Posted On,x\nDate,Description,Amount\n"
+        assert HeaderLocator.locate_text(generic, fallback=known).row == 1
@@ -0,0 +1,54 @@
+"""Unit tests for merging statements of one account."""
+
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from adapters.merge import merge_transactions, sorted_run
+
+
+def rows(*dates, tag=''):
+    return [{'date': f'2024-{d}T00:00:00', 'description': f'{tag}{i}'} for i, d in enumerate(dates)]
+
+
+class TestSortedRun:
+    """Test cases for sorted_run."""
+
+    def test_ascending_unchanged(self):
+        records = rows('01-01', '01-01', '01-05')
+        assert sorted_run(records) is records
+
+    def test_descending_reversed(self):
+        """Test newest-first statements are flipped."""
+        records = rows('01-05', '01-03', '01-01')
+        assert [r['date'][:10] for r in sorted_run(records)] == ['2024-01-01', '2024-01-03', '2024-01-05']
+
+    def test_unsorted_stable(self):
+        """Test out-of-order rows are sorted, keeping same-day order."""
+        records = rows('01-03', '01-01', '01-03', '01-02')
+        assert [r['description'] for r in sorted_run(records)] == ['1', '3', '0', '2']
+
+
+class TestMergeTransactions:
+    """Test cases for merge_transactions."""
+
+    def test_interleaves_files(self):
+        """Test files are merged into one chronological stream."""
+        jan = rows('01-01', '01-15', '01-31', tag='jan')
+        q1 = rows('03-31', '02-15', '01-20', tag='q1')  # newest first
+
+        merged = list(merge_transactions([jan, q1]))
+
+        assert [r['description'] for r in merged] == ['jan0', 'jan1', 'q12', 'jan2', 'q11', 'q10']
+
+    def test_ties_keep_file_order(self):
+        """Test same-day rows from earlier files come first."""
+        merged = list(merge_transactions([rows('01-01', tag='a'), rows('01-01', tag='b')]))
+
+        assert [r['description'] for r in merged] == ['a0', 'b0']
+
+    def test_empty(self):
+        assert list(merge_transactions([])) == []
+        assert list(merge_transactions([[], rows('01-01')])) == rows('01-01')
@@ -37,6 +37,22 @@ class TestPDFReader:
         reader = PDFReader(str(pdf_file), password="test123")
         assert reader.password == "test123"
 
+    
+    def test_probe_text_reads_metadata_and_first_page(self, tmp_path):
+        """Test the probe includes the document producer."""
+        import PyPDF2
+        pdf_file = tmp_path / "statement.pdf"
+        writer = PyPDF2.PdfWriter()
+        writer.add_blank_page(width=200, height=200)
+        writer.add_blank_page(width=200, height=200)
+        writer.add_metadata({'/Producer': 'ICICI Bank Statement Service'})
+        with open(pdf_file, 'wb') as f:
+            writer.write(f)
+        
+        text = PDFReader(str(pdf_file)).probe_text()
+        
+        assert 'ICICI Bank Statement Service' in text
+
 
 # Note: Additional tests require sample PDF files
 # These will be added in integration tests with actual bank statement PDFs
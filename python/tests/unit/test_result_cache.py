@@ -0,0 +1,68 @@
+"""Unit tests for the processed-result cache."""
+
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from cache.result_cache import ResultCache
+
+
+class TestResultCache:
+    """Test cases for ResultCache."""
+    
+    def test_round_trip(self, tmp_path):
+        """Test a stored result is returned for the same content key."""
+        statement = tmp_path / "a.csv"
+        statement.write_text("Date,Amount\n2024-01-01,10")
+        cache = ResultCache(str(tmp_path / "cache"))
+        
+        key = cache.key_for(str(statement))
+        assert cache.get(key) is None
+        
+        cache.put(key, {'status': 'success', 'transactions': [{'debit': 10.0}]})
+        assert cache.get(key) == {'status': 'success', 'transactions': [{'debit': 10.0}]}
+    
+    def test_key_follows_content(self, tmp_path):
+        """Test editing a file changes its key."""
+        statement = tmp_path / "a.csv"
+        statement.write_text("Date,Amount\n2024-01-01,10")
+        cache = ResultCache(str(tmp_path / "cache"))
+        
+        before = cache.key_for(str(statement))
+        statement.write_text("Date,Amount\n2024-01-01,11")
+        assert cache.key_for(str(statement)) != before
+
+    def test_key_follows_engine_settings(self, tmp_path, monkeypatch):
+        """Test choosing another reader engine changes the key."""
+        statement = tmp_path / "a.csv"
+        statement.write_text("Date,Amount\n2024-01-01,10")
+        cache = ResultCache(str(tmp_path / "cache"))
+        monkeypatch.delenv('CSV_ENGINE', raising=False)
+        monkeypatch.delenv('EXCEL_ENGINE', raising=False)
+
+        default = cache.key_for(str(statement))
+        monkeypatch.setenv('CSV_ENGINE', 'auto')
+        assert cache.key_for(str(statement)) == default
+        monkeypatch.setenv('CSV_ENGINE', 'c')
+        assert cache.key_for(str(statement)) != default
+        monkeypatch.setenv('CSV_ENGINE', 'auto')
+        monkeypatch.setenv('EXCEL_ENGINE', 'calamine')
+        assert cache.key_for(str(statement)) != default
+
+    def test_lru_eviction(self, tmp_path):
+        """Test least recently used entries are evicted over the size budget."""
+        cache = ResultCache(str(tmp_path / "cache"), max_bytes=10**9)
+        payload = {'blob': 'x' * 100}
+        for key in ('a', 'b', 'c'):
+            cache.put(key, payload)
+        size = cache._conn.execute("SELECT size FROM results WHERE key = 'a'").fetchone()[0]
+        
+        cache.get('a')  # 'b' is now least recently used
+        cache.max_bytes = size * 3
+        cache.put('d', payload)
+        
+        assert cache.get('b') is None
+        assert cache.get('a') == payload
+        assert cache.get('d') == payload
@@ -1,6 +1,7 @@
 """Unit tests for Tally XML Exporter."""
 
 import pytest
+import io
 from datetime import datetime
 from pathlib import Path
 import sys
@@ -94,3 +95,16 @@ class TestTallyXMLExporter:
         assert len(vouchers) == 2
         assert vouchers[0].get("VCHTYPE") == "Payment"
         assert vouchers[1].get("VCHTYPE") == "Receipt"
+    
+    def test_streamed_xml_matches_generate(self):
+        """Test iter_xml/write produce the same document from a lazy stream."""
+        txns = [
+            Transaction(datetime(2024, 1, 1), "Fish & Chips <card>", 100, 0, 100, "R1"),
+            Transaction(datetime(2024, 1, 2), "T2", 0, 200, 300)
+        ]
+        out = io.StringIO()
+        
+        TallyXMLExporter(iter(txns)).write(out)
+        
+        assert out.getvalue() == TallyXMLExporter(txns).generate_xml()
+        assert "".join(TallyXMLExporter([]).iter_xml()) == TallyXMLExporter([]).generate_xml()